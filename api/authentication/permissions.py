@@ -61,6 +61,6 @@ class IsAdminOrNotificationDeletionByOwner(permissions.IsAdminUser):
         """
         return (
             request.method == "DELETE"
-            and obj.user == request.user
+            and obj.user_id == request.user.pk
             or request.user.is_superuser
         )
@@ -4,6 +4,7 @@ from rest_framework import serializers
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
 from authentication.models import Notification, Role, User
+from common.serializers import SparseFieldsetSerializerMixin
 from forum.models import Question
 
 
@@ -77,13 +78,25 @@ class UserChangeSerializer(serializers.ModelSerializer[User]):
         return instance
 
 
-class UserSerializer(serializers.ModelSerializer[User]):
-    """Handles user retrieving."""
+class UserRoleSerializer(serializers.ModelSerializer[Role]):
+    """Handles retrieving of user's role."""
+
+    class Meta:
+        model = Role
+        fields = ["id", "title"]
+
+
+class UserSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer[User]):
+    """Handles user retrieving.
+
+    Role is nested, so querysets of users must select it.
+    """
+
+    role = UserRoleSerializer(read_only=True)
 
     class Meta:
         model = User
         fields = ["id", "username", "email", "date_created", "profile_image", "role"]
-        depth = 1
 
 
 class RoleBaseSerializer(serializers.ModelSerializer[Role]):
@@ -94,7 +107,7 @@ class RoleBaseSerializer(serializers.ModelSerializer[Role]):
         fields = ["title"]
 
 
-class RoleSerializer(serializers.ModelSerializer[Role]):
+class RoleSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer[Role]):
     """Handles role retrieving."""
 
     users = UserSerializer(many=True)
@@ -121,7 +134,10 @@ class NotificationBaseSerializer(serializers.ModelSerializer[Notification]):
         fields = ["title", "user_id", "question_id"]
 
 
-class NotificationSerializer(serializers.ModelSerializer[Notification]):
+class NotificationSerializer(
+    SparseFieldsetSerializerMixin,
+    serializers.ModelSerializer[Notification],
+):
     """Handles notification retrieving."""
 
     user_id = serializers.PrimaryKeyRelatedField(read_only=True)
@@ -4,6 +4,7 @@ from typing import Any
 from django.core.exceptions import ValidationError
 from django.core.validators import validate_email
 from django.db.models import QuerySet
+from django.http import HttpResponseBase
 from rest_framework import permissions, viewsets
 from rest_framework.decorators import action
 from rest_framework.generics import get_object_or_404
@@ -18,6 +19,9 @@ from api.authentication.permissions import (
 )
 from authentication.models import Notification, Role, User
 from common import mixins as common_mixins
+from common.budgets import query_budget
+from common.fastpath import ValuesListMixin
+from common.streaming import StreamingListMixin
 
 
 class TokenObtainView(TokenObtainPairView):
@@ -26,7 +30,9 @@ class TokenObtainView(TokenObtainPairView):
     serializer_class = auth_serializers.TokenObtainSerializer
 
 
+@query_budget(list=4, retrieve=3)
 class RoleViewSet(
+    common_mixins.SparseFieldsetMixin,
     common_mixins.MultipleSerializersMixinSet,
     viewsets.ModelViewSet,
 ):
@@ -53,7 +59,10 @@ class RoleViewSet(
         return Role.objects.all().prefetch_related("users")
 
 
+@query_budget(list=3, retrieve=2, me=1)
 class UserViewSet(
+    ValuesListMixin,
+    common_mixins.SparseFieldsetMixin,
     common_mixins.MultipleSerializersMixinSet,
     viewsets.ModelViewSet,
 ):
@@ -126,7 +135,11 @@ class UserViewSet(
         return Response(serializer.data)
 
 
+@query_budget(list=3, retrieve=3)
 class NotificationViewSet(
+    ValuesListMixin,
+    StreamingListMixin,
+    common_mixins.SparseFieldsetMixin,
     common_mixins.MultipleSerializersMixinSet,
     viewsets.ModelViewSet,
 ):
@@ -145,17 +158,19 @@ class NotificationViewSet(
             "partial_update": auth_serializers.NotificationBaseSerializer,
         }
 
-    def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> Response:
-        """Returns all user's notifications.
+    def retrieve(
+        self,
+        request: Request,
+        *args: Any,
+        **kwargs: Any,
+    ) -> HttpResponseBase:
+        """Returns all user's notifications, newest first.
 
         :param request: Current request.
         :param args: Args.
         :param kwargs: Kwargs.
         :return: Response with notifications data.
         """
-        user: User = get_object_or_404(
-            User.objects.all().prefetch_related("notifications"),
-            pk=kwargs.get("pk"),
-        )
-        serializer = self.get_serializer(user.notifications.all(), many=True)
-        return Response(serializer.data)
+        user: User = get_object_or_404(User.objects.all(), pk=kwargs.get("pk"))
+        notifications = self.prune_queryset(user.notifications.order_by("-pk"))
+        return self.get_streaming_response(notifications)
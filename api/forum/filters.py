@@ -44,7 +44,26 @@ class QuestionFilter(django_filters.FilterSet):
     by_title = django_filters.CharFilter(field_name="title", lookup_expr="icontains")
     order_by_date = OrderingCharFilter(field_name="date_created")
     order_by_views = OrderingBooleanFilter(field_name="views")
+    order_by_activity = OrderingCharFilter(field_name="last_activity_at")
+    order_by_comments = OrderingBooleanFilter(field_name="comment_count")
+    order_by_hot = OrderingBooleanFilter(field_name="hot_score")
+    unanswered = django_filters.BooleanFilter(method="filter_unanswered")
 
     class Meta:
         model = Question
         fields = ["title", "date_created", "order_by_views"]
+
+    def filter_unanswered(
+        self,
+        qs: QuerySet[Question],
+        name: str,
+        value: bool,
+    ) -> QuerySet[Question]:
+        """Leaves questions without answer or, if value is False, answered ones.
+
+        :param qs: Queryset.
+        :param name: Name of filter.
+        :param value: Boolean value. True, False or None.
+        :return: Filtered queryset.
+        """
+        return qs.filter(has_answer=not value)
@@ -42,7 +42,7 @@ class HasAccessToObjectOrReadOnly(permissions.IsAuthenticatedOrReadOnly):
         return (
             request.method in permissions.SAFE_METHODS
             or request.user.is_superuser
-            or obj.author == request.user
+            or obj.author_id == request.user.pk
         )
 
 
@@ -68,7 +68,9 @@ class HasAccessToUpdateCertainCommentField(permissions.BasePermission):
         if request.user.is_superuser or request.method not in {"PATCH", "PUT"}:
             return True
 
-        if "content" in request.data and request.user != obj.author:
+        if "content" in request.data and request.user.pk != obj.author_id:
             return False
         # Only author of question can change field "is_answer"
-        return "is_answer" not in request.data or request.user == obj.question.author
+        return (
+            "is_answer" not in request.data or request.user.pk == obj.question.author_id
+        )
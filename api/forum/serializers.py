@@ -1,11 +1,14 @@
 from typing import Any
 
+from django.conf import settings
 from rest_framework import serializers
 from rest_framework.request import Request
 
 from api.forum import utils
 from authentication.models import User
 from common.exceptions import UnprocessableEntity
+from common.serializers import SparseFieldsetSerializerMixin
+from forum.duplicates import find_duplicate_ids
 from forum.models import Comment, Question, Tag
 
 
@@ -23,6 +26,22 @@ class QuestionCreationSerializer(serializers.ModelSerializer[Question]):
         model = Question
         fields = ["title", "content", "tags", "author_id"]
 
+    def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
+        """Finds existing questions with similar text.
+
+        Their ids are kept in `possible_duplicates`, question is created anyway.
+
+        :param attrs: Validated question data.
+        :return: The same data.
+        """
+        self.possible_duplicates: list[int] = []
+        if settings.DUPLICATE_QUESTIONS["ENABLED"]:
+            self.possible_duplicates = find_duplicate_ids(
+                attrs["title"],
+                attrs["content"],
+            )
+        return attrs
+
     def create(self, validated_data: dict[str, Any]) -> Question:
         """Creates new question.
 
@@ -82,15 +101,32 @@ class QuestionChangeSerializer(serializers.ModelSerializer[Question]):
         return instance
 
 
-class QuestionSerializer(serializers.ModelSerializer[Question]):
+class QuestionTagSerializer(serializers.ModelSerializer[Tag]):
+    """Handles retrieving of tags nested in questions."""
+
+    class Meta:
+        model = Tag
+        fields = ["id", "title"]
+
+
+class QuestionSerializer(
+    SparseFieldsetSerializerMixin,
+    serializers.ModelSerializer[Question],
+):
     """Handles question retrieving."""
 
     author_id = serializers.PrimaryKeyRelatedField(read_only=True)
+    tags = QuestionTagSerializer(many=True, read_only=True)
 
     class Meta:
         model = Question
-        exclude = ["author"]
-        depth = 1
+        exclude = ["author", "hot_score", "updated_at"]
+        read_only_fields = [
+            "comment_count",
+            "answer_count",
+            "has_answer",
+            "last_activity_at",
+        ]
 
 
 class TagBaseSerializer(serializers.ModelSerializer[Tag]):
@@ -101,7 +137,7 @@ class TagBaseSerializer(serializers.ModelSerializer[Tag]):
         fields = ["title"]
 
 
-class TagSerializer(serializers.ModelSerializer[Tag]):
+class TagSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer[Tag]):
     """Handles tag retrieving."""
 
     questions = QuestionSerializer(many=True)
@@ -111,6 +147,14 @@ class TagSerializer(serializers.ModelSerializer[Tag]):
         fields = ["id", "title", "questions"]
 
 
+class TrendingTagSerializer(serializers.Serializer[dict[str, Any]]):
+    """Handles trending tags retrieving."""
+
+    id = serializers.IntegerField(source="tag_id")
+    title = serializers.CharField(source="tag__title")
+    count = serializers.IntegerField(source="total")
+
+
 class CommentCreationSerializer(serializers.ModelSerializer[Comment]):
     """Handles comment creation."""
 
@@ -145,7 +189,7 @@ class CommentCreationSerializer(serializers.ModelSerializer[Comment]):
             validated_data["author"] = request.user.id
 
         comment = Comment.objects.create(**validated_data)
-        if request.user != comment.question.author:
+        if request.user.pk != comment.question.author_id:
             utils.create_notification(comment)
 
         return comment
@@ -159,7 +203,10 @@ class CommentChangeSerializer(serializers.ModelSerializer[Comment]):
         fields = ["content", "is_answer"]
 
 
-class CommentSerializer(serializers.ModelSerializer[Comment]):
+class CommentSerializer(
+    SparseFieldsetSerializerMixin,
+    serializers.ModelSerializer[Comment],
+):
     """Handles comment retrieving."""
 
     question_id = serializers.PrimaryKeyRelatedField(read_only=True)
@@ -167,4 +214,4 @@ class CommentSerializer(serializers.ModelSerializer[Comment]):
 
     class Meta:
         model = Comment
-        exclude = ["question", "author"]
+        exclude = ["question", "author", "updated_at"]
@@ -0,0 +1,89 @@
+from typing import Any
+
+from django.conf import settings
+from django.http import QueryDict
+
+from api.forum.serializers import QuestionSerializer
+from common.fastpath import prefetch_ordered
+from common.snapshot import Snapshot
+from forum.models import Question, Tag
+
+SNAPSHOT_QUERY_PARAMS = {"limit", "skip"}
+
+
+def build_questions_page(ordering: str) -> list[dict[str, Any]]:
+    """Returns serialized questions of the first page.
+
+    :param ordering: Ordering of questions.
+    :return: List of serialized questions.
+    """
+    size: int = settings.FRONT_PAGE_SNAPSHOT["SIZE"]
+    questions = Question.objects.order_by(ordering).prefetch_related(
+        prefetch_ordered("tags", Tag),
+    )[:size]
+    return QuestionSerializer(questions, many=True).data
+
+
+front_page_snapshots = {
+    ("order_by_date", "desc"): Snapshot(
+        lambda: build_questions_page("-date_created"),
+        (Question, Tag),
+    ),
+    ("order_by_views", "true"): Snapshot(
+        lambda: build_questions_page("-views"),
+        (Question, Tag),
+    ),
+}
+
+
+def get_front_page(query_params: QueryDict) -> tuple[bytes, bool] | None:
+    """Returns rendered first page of questions if it can be taken from snapshot.
+
+    Only requests with one of the common orderings, a limit not greater than
+    snapshot size and zero skip are served from snapshots.
+
+    :param query_params: Query parameters of request.
+    :return: Rendered JSON array of questions and whether it is up to date or None.
+    """
+    found = _find_front_page_snapshot(query_params)
+    return found[0].render(found[1]) if found else None
+
+
+async def aget_front_page(query_params: QueryDict) -> tuple[bytes, bool] | None:
+    """Async counterpart of `get_front_page`.
+
+    :param query_params: Query parameters of request.
+    :return: Rendered JSON array of questions and whether it is up to date or None.
+    """
+    found = _find_front_page_snapshot(query_params)
+    return await found[0].arender(found[1]) if found else None
+
+
+def _find_front_page_snapshot(query_params: QueryDict) -> tuple[Snapshot, int] | None:
+    if not settings.FRONT_PAGE_SNAPSHOT["ENABLED"]:
+        return None
+
+    ordering_params = query_params.keys() - SNAPSHOT_QUERY_PARAMS
+    if len(ordering_params) != 1:
+        return None
+    ordering_param = ordering_params.pop()
+    # Compared exactly, `OrderingCharFilter` rejects e.g. "DESC".
+    snapshot = front_page_snapshots.get(
+        (ordering_param, query_params[ordering_param]),
+    )
+    limit = _get_front_page_limit(query_params)
+    if not snapshot or limit is None:
+        return None
+    return snapshot, limit
+
+
+def _get_front_page_limit(query_params: QueryDict) -> int | None:
+    if query_params.get("skip", "0") != "0":
+        return None
+    try:
+        limit = int(query_params["limit"])
+    except (KeyError, ValueError):
+        return None
+    if not 0 < limit <= settings.FRONT_PAGE_SNAPSHOT["SIZE"]:
+        return None
+    return limit
@@ -1,5 +1,5 @@
 from authentication.models import Notification
-from forum.models import Tag, Comment
+from forum.models import Comment, Tag
 
 
 def get_db_tags(tags_titles: set[str]) -> tuple[Tag, ...]:
@@ -31,6 +31,6 @@ def create_notification(comment: Comment) -> Notification:
     question_title = comment.question.title
     return Notification.objects.create(
         title=f'User {username} commented your question: "{question_title}".',
-        user=comment.question.author,
+        user_id=comment.question.author_id,
         question=comment.question,
     )
@@ -1,6 +1,9 @@
 from typing import Any
 
+from django.conf import settings
 from django.db.models import QuerySet
+from django.http import HttpResponse, HttpResponseBase
+from django.utils.cache import patch_cache_control
 from django_filters import rest_framework as filters
 from rest_framework import permissions, viewsets
 from rest_framework.decorators import action
@@ -14,13 +17,29 @@ from api.forum.permissions import (
     HasAccessToObjectOrReadOnly,
     HasAccessToUpdateCertainCommentField,
 )
+from api.forum.snapshots import aget_front_page, get_front_page
 from common import mixins as common_mixins
+from common.async_views import AsyncReadMixin, aget_object_or_404
+from common.budgets import query_budget
+from common.cache import CachedResponseMixin
+from common.conditional import ConditionalGetMixin
 from common.exceptions import UnprocessableEntity
+from common.fastpath import ValuesListMixin, prefetch_ordered
+from common.ndjson import NDJSONExportMixin
 from common.permissions import IsAdminUserOrReadOnly
+from common.singleflight import SingleFlightMixin
+from common.streaming import StreamingListMixin
+from forum.exporters import export_comments, export_questions
 from forum.models import Comment, Question, Tag
+from forum.related import get_related_question_ids
+from forum.trending import get_trending_tags
 
 
+@query_budget(list=5, retrieve=4, trending=2)
 class TagViewSet(
+    CachedResponseMixin,
+    StreamingListMixin,
+    common_mixins.SparseFieldsetMixin,
     common_mixins.MultipleSerializersMixinSet,
     viewsets.ModelViewSet,
 ):
@@ -28,6 +47,7 @@ class TagViewSet(
 
     queryset = Tag.objects.all()
     permission_classes = [IsAdminUserOrReadOnly]
+    cache_dependencies = (Tag, Question)
 
     def __init__(self, **kwargs: Any):
         super().__init__(**kwargs)
@@ -37,6 +57,7 @@ class TagViewSet(
             "retrieve": forum_serializers.TagSerializer,
             "update": forum_serializers.TagBaseSerializer,
             "partial_update": forum_serializers.TagBaseSerializer,
+            "trending": forum_serializers.TrendingTagSerializer,
         }
 
     def get_queryset(self) -> QuerySet[Tag]:
@@ -46,6 +67,19 @@ class TagViewSet(
         """
         return Tag.objects.all().prefetch_related("questions__tags")
 
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> HttpResponseBase:
+        """Returns tags, streaming long lists if pagination was not requested.
+
+        :param request: Current request.
+        :param args: Args.
+        :param kwargs: Kwargs.
+        :return: Response with tags.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.paginator.get_limit(request) is None and self.should_stream(queryset):
+            return self.get_streaming_response(queryset)
+        return super().list(request, *args, **kwargs)
+
     def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> Response:
         """Returns tag by id or by its title.
 
@@ -63,8 +97,48 @@ class TagViewSet(
             return Response(serializer.data)
         return super().retrieve(request, *args, **kwargs)
 
+    @action(
+        detail=False,
+        methods=["GET"],
+        url_path="trending",
+        name="trending",
+        url_name="trending",
+    )
+    def trending(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """Returns tags of most questions tagged during window.
+
+        Window is given by `window` query parameter, e.g. '24h' or '7d', number
+        of tags by `limit`.
+
+        :param request: Current request.
+        :param args: Args.
+        :param kwargs: Kwargs.
+        :return: Response with tags and their counts, most tagged first.
+        :raises UnprocessableEntity: if window or limit is invalid.
+        """
+        config = settings.TRENDING_TAGS
+        hours = config["WINDOWS"].get(request.query_params.get("window", "24h"))
+        try:
+            limit = int(request.query_params.get("limit", config["DEFAULT_LIMIT"]))
+        except ValueError as err:
+            raise UnprocessableEntity from err
+        if hours is None or not 0 < limit <= config["MAX_LIMIT"]:
+            raise UnprocessableEntity
 
+        serializer = self.get_serializer(get_trending_tags(hours, limit), many=True)
+        return Response(serializer.data)
+
+
+@query_budget(list=6, retrieve=5, questions_by_user=3, export=4, related=7)
 class QuestionViewSet(
+    CachedResponseMixin,
+    SingleFlightMixin,
+    ConditionalGetMixin,
+    ValuesListMixin,
+    AsyncReadMixin,
+    StreamingListMixin,
+    NDJSONExportMixin,
+    common_mixins.SparseFieldsetMixin,
     common_mixins.MultipleSerializersMixinSet,
     viewsets.ModelViewSet,
 ):
@@ -77,6 +151,13 @@ class QuestionViewSet(
     ]
     filter_backends = [filters.DjangoFilterBackend]
     filterset_class = QuestionFilter
+    cached_actions = ("list", "retrieve", "related")
+    cache_dependencies = (Question, Tag)
+    conditional_dependencies = (Tag,)
+    single_flight_actions = ("retrieve",)
+    async_actions = ("list", "retrieve")
+    exporters = (export_questions,)
+    export_filename = "questions.ndjson"
 
     def __init__(self, **kwargs: Any):
         super().__init__(**kwargs)
@@ -94,12 +175,73 @@ class QuestionViewSet(
         """
         return None if self.action == "questions_by_user" else super().paginator
 
+    def perform_create(
+        self,
+        serializer: forum_serializers.QuestionCreationSerializer,
+    ) -> Question:
+        """Creates question remembering its possible duplicates.
+
+        :param serializer: Question creation serializer.
+        :return: Question instance.
+        """
+        self.possible_duplicates = serializer.possible_duplicates
+        return super().perform_create(serializer)
+
+    def get_success_headers(self, data: Any) -> dict[str, str]:
+        """Returns headers of created question response.
+
+        Ids of questions with similar text are listed in `X-Possible-Duplicates`.
+
+        :param data: Serialized question.
+        :return: Headers.
+        """
+        headers = super().get_success_headers(data)
+        if getattr(self, "possible_duplicates", None):
+            headers["X-Possible-Duplicates"] = ", ".join(
+                str(question_id) for question_id in self.possible_duplicates
+            )
+        return headers
+
     def get_queryset(self) -> QuerySet[Question]:
         """Returns queryset of questions prefetching their tags.
 
         :return: Queryset of questions with prefetched tags.
         """
-        return Question.objects.all().prefetch_related("tags")
+        return Question.objects.all().prefetch_related(prefetch_ordered("tags", Tag))
+
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> HttpResponse:
+        """Returns questions, taking the first page from snapshot if possible.
+
+        :param request: Current request.
+        :param args: Args.
+        :param kwargs: Kwargs.
+        :return: Response with questions.
+        """
+        front_page = get_front_page(request.query_params)
+        if front_page is None:
+            return super().list(request, *args, **kwargs)
+        return self._get_front_page_response(*front_page)
+
+    async def alist(self, request: Request, *args: Any, **kwargs: Any) -> HttpResponse:
+        """Async counterpart of `list`.
+
+        :param request: Current request.
+        :param args: Args.
+        :param kwargs: Kwargs.
+        :return: Response with questions.
+        """
+        front_page = await aget_front_page(request.query_params)
+        if front_page is None:
+            return await super().alist(request, *args, **kwargs)
+        return self._get_front_page_response(*front_page)
+
+    def _get_front_page_response(self, content: bytes, is_fresh: bool) -> HttpResponse:
+        response = HttpResponse(content, content_type="application/json")
+        if not is_fresh:
+            # Stale copy must not be validated or cached with current versions.
+            self.conditional_validators = None
+            patch_cache_control(response, no_cache=True)
+        return response
 
     @action(
         detail=True,
@@ -148,8 +290,8 @@ class QuestionViewSet(
         user_id: str,
         *args,
         **kwargs,
-    ) -> Response:
-        """Returns all user's questions.
+    ) -> HttpResponseBase:
+        """Returns all user's questions, newest first.
 
         :param request: Current request.
         :param user_id: User's ID.
@@ -157,12 +299,58 @@ class QuestionViewSet(
         :param kwargs: Kwargs.
         :return: Response with user's questions.
         """
-        questions = Question.objects.filter(author_id=user_id).prefetch_related("tags")
-        serializer = self.get_serializer(questions, many=True)
+        questions = self.prune_queryset(
+            Question.objects.filter(author_id=user_id)
+            .order_by("-date_created")
+            .prefetch_related(prefetch_ordered("tags", Tag)),
+        )
+        return self.get_streaming_response(questions)
+
+    @action(
+        detail=True,
+        methods=["GET"],
+        url_path="related",
+        name="related",
+        url_name="related",
+    )
+    def related(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """Returns questions sharing the most weighted tags with question.
+
+        Number of questions is given by `limit` query parameter.
+
+        :param request: Current request.
+        :param args: Args.
+        :param kwargs: Kwargs.
+        :return: Response with related questions, most related first.
+        :raises UnprocessableEntity: if limit is invalid.
+        """
+        config = settings.RELATED_QUESTIONS
+        try:
+            limit = int(request.query_params.get("limit", config["DEFAULT_LIMIT"]))
+        except ValueError as err:
+            raise UnprocessableEntity from err
+        if not 0 < limit <= config["MAX_LIMIT"]:
+            raise UnprocessableEntity
+
+        question: Question = self.get_object()
+        ids = get_related_question_ids(question.pk, limit)
+        questions = self.prune_queryset(self.get_queryset().filter(pk__in=ids))
+        serializer = self.get_serializer(
+            sorted(questions, key=lambda related: ids.index(related.pk)),
+            many=True,
+        )
         return Response(serializer.data)
 
 
+@query_budget(list=3, retrieve=4, export=3)
 class CommentViewSet(
+    CachedResponseMixin,
+    SingleFlightMixin,
+    ConditionalGetMixin,
+    ValuesListMixin,
+    AsyncReadMixin,
+    NDJSONExportMixin,
+    common_mixins.SparseFieldsetMixin,
     common_mixins.MultipleSerializersMixinSet,
     viewsets.ModelViewSet,
 ):
@@ -175,6 +363,13 @@ class CommentViewSet(
         HasAccessToObjectOrReadOnly,
         HasAccessToUpdateCertainCommentField,
     ]
+    cached_actions = ("retrieve",)
+    cache_dependencies = (Comment, Question)
+    conditional_actions = ("retrieve",)
+    single_flight_actions = ("retrieve",)
+    async_actions = ("retrieve",)
+    exporters = (export_comments,)
+    export_filename = "comments.ndjson"
 
     def __init__(self, **kwargs: Any):
         super().__init__(**kwargs)
@@ -184,8 +379,17 @@ class CommentViewSet(
             "partial_update": forum_serializers.CommentChangeSerializer,
         }
 
+    def get_queryset(self) -> QuerySet[Comment]:
+        """Returns queryset of comments selecting their questions.
+
+        Question is used by permissions of comment.
+
+        :return: Queryset of comments with selected questions.
+        """
+        return Comment.objects.all().select_related("question")
+
     def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> Response:
-        """Returns all comments by question id.
+        """Returns all comments by question id in order of creation.
 
         :param request: Current request.
         :param args: Args.
@@ -193,6 +397,24 @@ class CommentViewSet(
         :return: Response with all question's comments.
         """
         question = get_object_or_404(Question.objects.all(), pk=kwargs.get("pk"))
-        comments = question.comments.all()
+        comments = self.prune_queryset(
+            Comment.objects.filter(question=question).order_by("date_created"),
+        )
         serializer = self.get_serializer(comments, many=True)
         return Response(serializer.data)
+
+    async def aretrieve(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """Async counterpart of `retrieve`.
+
+        :param request: Current request.
+        :param args: Args.
+        :param kwargs: Kwargs.
+        :return: Response with all question's comments.
+        """
+        question = await aget_object_or_404(Question.objects.all(), pk=kwargs.get("pk"))
+        plan = self.get_async_values_plan()
+        comments = plan.values(
+            Comment.objects.filter(question=question).order_by("date_created"),
+        )
+        rows = [row async for row in comments.aiterator()]
+        return Response(await plan.arepresent(rows))
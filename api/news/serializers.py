@@ -1,5 +1,6 @@
 from rest_framework import serializers
 
+from common.serializers import SparseFieldsetSerializerMixin
 from news.models import Article
 
 
@@ -11,9 +12,12 @@ class ArticleBaseSerializer(serializers.ModelSerializer[Article]):
         fields = ["title", "content"]
 
 
-class ArticleSerializer(serializers.ModelSerializer[Article]):
+class ArticleSerializer(
+    SparseFieldsetSerializerMixin,
+    serializers.ModelSerializer[Article],
+):
     """Article serializer to handle returning an object."""
 
     class Meta:
         model = Article
-        fields = "__all__"
+        exclude = ["updated_at"]
@@ -12,11 +12,25 @@ from api.news.permissions import IsUpdatingRatingOrIsAdminUserOrReadOnly
 from api.news.types import UpdateAction
 from authentication.models import User
 from common import mixins as common_mixins
+from common.async_views import AsyncReadMixin
+from common.budgets import query_budget
+from common.cache import CachedResponseMixin
+from common.conditional import ConditionalGetMixin
 from common.exceptions import UnprocessableEntity
+from common.fastpath import ValuesListMixin, prefetch_ordered
+from common.ndjson import NDJSONExportMixin
+from news.exporters import export_articles
 from news.models import Article
 
 
+@query_budget(list=6, retrieve=5, export=4)
 class ArticleViewSet(
+    CachedResponseMixin,
+    ConditionalGetMixin,
+    ValuesListMixin,
+    AsyncReadMixin,
+    NDJSONExportMixin,
+    common_mixins.SparseFieldsetMixin,
     common_mixins.MultipleSerializersMixinSet,
     viewsets.ModelViewSet,
 ):
@@ -28,6 +42,10 @@ class ArticleViewSet(
         permissions.IsAuthenticatedOrReadOnly,
         IsUpdatingRatingOrIsAdminUserOrReadOnly,
     ]
+    cache_dependencies = (Article,)
+    async_actions = ("list",)
+    exporters = (export_articles,)
+    export_filename = "articles.ndjson"
 
     def __init__(self, **kwargs: Any):
         super().__init__(**kwargs)
@@ -37,6 +55,16 @@ class ArticleViewSet(
             "partial_update": news_serializers.ArticleBaseSerializer,
         }
 
+    def get_queryset(self) -> QuerySet[Article]:
+        """Returns queryset of articles prefetching their rating.
+
+        :return: Queryset of articles with prefetched likes and dislikes.
+        """
+        return Article.objects.all().prefetch_related(
+            prefetch_ordered("likes", User),
+            prefetch_ordered("dislikes", User),
+        )
+
     @action(
         detail=True,
         methods=["PATCH"],
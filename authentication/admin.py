@@ -77,6 +77,7 @@ class UserAdmin(BaseUserAdmin):
     add_form = UserCreationForm
 
     list_display = ("username", "email", "date_created", "role")
+    list_select_related = ("role",)
     list_filter = ("username", "email", "date_created", "role")
     fieldsets = (
         (None, {"fields": ("username", "password", "date_created")}),
@@ -98,7 +99,15 @@ class UserAdmin(BaseUserAdmin):
     filter_horizontal = ()
 
 
+class NotificationAdmin(admin.ModelAdmin):
+    """Notification model renderer in admin panel."""
+
+    list_display = ("title", "user", "question")
+    list_select_related = ("user", "question")
+    raw_id_fields = ("user", "question")
+
+
 admin.site.register(User, UserAdmin)
 admin.site.unregister(Group)
 admin.site.register(Role)
-admin.site.register(Notification)
+admin.site.register(Notification, NotificationAdmin)
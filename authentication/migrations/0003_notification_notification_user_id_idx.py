@@ -0,0 +1,17 @@
+# Generated by Django 4.1.13 on 2026-10-19 14:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentication", "0002_notification"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(fields=["user", "-id"], name="notification_user_id_idx"),
+        ),
+    ]
@@ -117,6 +117,11 @@ class User(AbstractBaseUser):
 class Notification(models.Model):
     """Model for database table 'notification'."""
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "-id"], name="notification_user_id_idx"),
+        ]
+
     title = models.CharField(max_length=256)
     user = models.ForeignKey(
         "authentication.User",
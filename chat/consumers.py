@@ -1,14 +1,23 @@
 import json
+from typing import Any
 
 from asgiref.sync import async_to_sync
 from channels.generic.websocket import WebsocketConsumer
 from django.contrib.auth.models import AnonymousUser
 
+from common.metrics import (
+    CHANNEL_LAYER_SEND_DURATION,
+    WEBSOCKET_CONNECTIONS,
+    WEBSOCKET_MESSAGES,
+)
+
 
 class ChatConsumer(WebsocketConsumer):
     """Websocket chat consumer."""
 
     DEFAULT_GROUP = "chat"
+    METRICS_NAME = "chat"
+    is_accepted = False
 
     def connect(self):
         """Executes on websocket connection."""
@@ -17,10 +26,9 @@ class ChatConsumer(WebsocketConsumer):
             self.close()
             return
         self.accept()
-        async_to_sync(self.channel_layer.group_add)(
-            self.DEFAULT_GROUP,
-            self.channel_name,
-        )
+        self.is_accepted = True
+        WEBSOCKET_CONNECTIONS.labels(self.METRICS_NAME).inc()
+        self.call_channel_layer("group_add", self.DEFAULT_GROUP, self.channel_name)
 
         response = {
             "user": current_user.username,
@@ -31,10 +39,7 @@ class ChatConsumer(WebsocketConsumer):
             "type": "chat.message",
             "message": response,
         }
-        async_to_sync(self.channel_layer.group_send)(
-            self.DEFAULT_GROUP,
-            message_data,
-        )
+        self.call_channel_layer("group_send", self.DEFAULT_GROUP, message_data)
 
     def receive(self, text_data: str | None = None, bytes_data: bytes | None = None):
         """Executes on message receive.
@@ -42,13 +47,14 @@ class ChatConsumer(WebsocketConsumer):
         :param text_data: Text data from message.
         :param bytes_data: Bytes data from message.
         """
+        WEBSOCKET_MESSAGES.labels(self.METRICS_NAME, "in").inc()
         data = text_data or bytes_data.decode("utf-8")
         data = json.loads(data)
         message_data = {
             "type": "chat.message",
             "message": data,
         }
-        async_to_sync(self.channel_layer.group_send)(self.DEFAULT_GROUP, message_data)
+        self.call_channel_layer("group_send", self.DEFAULT_GROUP, message_data)
 
     def chat_message(self, event: dict):
         """Executes on event type 'chat.message'.
@@ -57,12 +63,15 @@ class ChatConsumer(WebsocketConsumer):
         """
         message = json.dumps(event.get("message"))
         self.send(message)
+        WEBSOCKET_MESSAGES.labels(self.METRICS_NAME, "out").inc()
 
     def disconnect(self, code: int):
         """Executes on websocket disconnect.
 
         :param code: Status code.
         """
+        if self.is_accepted:
+            WEBSOCKET_CONNECTIONS.labels(self.METRICS_NAME).dec()
         current_user = self.scope.get("user")
         response = {
             "user": current_user.username,
@@ -73,8 +82,18 @@ class ChatConsumer(WebsocketConsumer):
             "type": "chat.message",
             "message": response,
         }
-        async_to_sync(self.channel_layer.group_send)(self.DEFAULT_GROUP, message_data)
-        async_to_sync(self.channel_layer.group_discard)(
+        self.call_channel_layer("group_send", self.DEFAULT_GROUP, message_data)
+        self.call_channel_layer(
+            "group_discard",
             self.DEFAULT_GROUP,
             self.channel_name,
         )
+
+    def call_channel_layer(self, method: str, *args: Any) -> None:
+        """Calls async method of channel layer measuring its duration.
+
+        :param method: Name of channel layer method.
+        :param args: Args of method.
+        """
+        with CHANNEL_LAYER_SEND_DURATION.labels(method).time():
+            async_to_sync(getattr(self.channel_layer, method))(*args)
@@ -0,0 +1,41 @@
+from django.apps import AppConfig
+from django.core.signals import request_started
+from django.db.backends.signals import connection_created
+
+
+class CommonConfig(AppConfig):
+    """Common app configuration."""
+
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "common"
+
+    def ready(self) -> None:
+        """Instruments database connections."""
+        from common.metrics import (
+            count_opened_connection,
+            count_reused_connections,
+            install_query_metrics,
+        )
+        from common.slow_queries import install_slow_query_recorder
+        from common.timing import install_query_timer
+
+        connection_created.connect(
+            install_query_timer,
+            dispatch_uid="common.timing.install_query_timer",
+        )
+        connection_created.connect(
+            install_query_metrics,
+            dispatch_uid="common.metrics.install_query_metrics",
+        )
+        connection_created.connect(
+            install_slow_query_recorder,
+            dispatch_uid="common.slow_queries.install_slow_query_recorder",
+        )
+        connection_created.connect(
+            count_opened_connection,
+            dispatch_uid="common.metrics.count_opened_connection",
+        )
+        request_started.connect(
+            count_reused_connections,
+            dispatch_uid="common.metrics.count_reused_connections",
+        )
@@ -0,0 +1,271 @@
+import asyncio
+import functools
+import time
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from types import TracebackType
+from typing import Any, Awaitable, Callable, MutableMapping, Type
+
+import asgiref
+import django
+from asgiref.sync import SyncToAsync, ThreadSensitiveContext, sync_to_async
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.handlers.asgi import ASGIHandler
+from django.http import HttpResponseBase
+
+Receive = Callable[[], Awaitable[dict[str, Any]]]
+Send = Callable[[dict[str, Any]], Awaitable[None]]
+
+_EXHAUSTED = object()
+
+
+def check_asgiref_internals() -> None:
+    """Checks that asgiref has internals `PooledThreadSensitiveContext` relies on.
+
+    :raises ImproperlyConfigured: if installed asgiref version lacks them.
+    """
+    executors = getattr(SyncToAsync, "context_to_thread_executor", None)
+    if not isinstance(executors, MutableMapping) or not hasattr(
+        ThreadSensitiveContext(),
+        "token",
+    ):
+        raise ImproperlyConfigured(
+            f"asgiref {asgiref.__version__} is not supported by common.asgi, "
+            "install the version required by pyproject.toml.",
+        )
+
+
+class ExecutorPool:
+    """Bounded pool of single thread executors running sync code of requests.
+
+    Django connections belong to threads, so threads kept between requests
+    keep their persistent connections and the size of the pool limits the
+    number of connections of a worker.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.created = 0
+        self._idle: asyncio.Queue[ThreadPoolExecutor] | None = None
+
+    async def acquire(self) -> ThreadPoolExecutor:
+        """Returns idle executor, creates it or waits for one to be released.
+
+        :return: Executor with a single thread.
+        """
+        # Imported here, this module is imported before Django is set up.
+        from common.metrics import ASGI_THREAD_WAIT, ASGI_THREADS_BUSY, is_enabled
+
+        if self._idle is None:
+            self._idle = asyncio.Queue()
+        started_at = time.perf_counter()
+        if self._idle.empty() and self.created < self.size:
+            self.created += 1
+            executor = ThreadPoolExecutor(
+                max_workers=1,
+                thread_name_prefix=f"asgi-{self.created}",
+            )
+        else:
+            executor = await self._idle.get()
+        if is_enabled():
+            ASGI_THREAD_WAIT.observe(time.perf_counter() - started_at)
+            ASGI_THREADS_BUSY.inc()
+        return executor
+
+    def release(self, executor: ThreadPoolExecutor) -> None:
+        """Returns executor to the pool.
+
+        :param executor: Executor returned by `acquire`.
+        """
+        from common.metrics import ASGI_THREADS_BUSY, is_enabled
+
+        if is_enabled():
+            ASGI_THREADS_BUSY.dec()
+        self._idle.put_nowait(executor)
+
+
+class PooledExecutor(Executor):
+    """Executor taking a thread from the pool when sync code is first submitted.
+
+    The thread is kept until `release`, since sync calls of a request may share
+    state of its thread, e.g. server-side cursors read by `aiterator`. Requests
+    waiting for their body or finished without sync code don't hold a thread.
+    Must be used from the event loop, like `loop.run_in_executor` does.
+    """
+
+    def __init__(self, pool: ExecutorPool):
+        self.pool = pool
+        self._acquiring: asyncio.Future[ThreadPoolExecutor] | None = None
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        """Runs callable in the thread of executor, taking it first if needed.
+
+        :param fn: Callable.
+        :param args: Args.
+        :param kwargs: Kwargs.
+        :return: Future of result.
+        """
+        if self._acquiring is None:
+            self._acquiring = asyncio.ensure_future(self.pool.acquire())
+        future: Future = Future()
+        call = functools.partial(fn, *args, **kwargs)
+        asyncio.ensure_future(self._submit(self._acquiring, future, call))
+        return future
+
+    def release(self) -> None:
+        """Returns thread to the pool if it was taken."""
+        acquiring, self._acquiring = self._acquiring, None
+        if acquiring is None:
+            return
+        if not acquiring.done():
+            acquiring.cancel()
+        elif not acquiring.cancelled() and acquiring.exception() is None:
+            self.pool.release(acquiring.result())
+
+    @staticmethod
+    async def _submit(
+        acquiring: "asyncio.Future[ThreadPoolExecutor]",
+        future: Future,
+        call: Callable[[], Any],
+    ) -> None:
+        try:
+            executor = await asyncio.shield(acquiring)
+        except (Exception, asyncio.CancelledError) as err:
+            if future.set_running_or_notify_cancel():
+                future.set_exception(err)
+            return
+        if future.set_running_or_notify_cancel():
+            executor.submit(call).add_done_callback(
+                lambda done: _copy_outcome(done, future),
+            )
+
+
+def _copy_outcome(source: Future, target: Future) -> None:
+    error = source.exception()
+    if error is not None:
+        target.set_exception(error)
+    else:
+        target.set_result(source.result())
+
+
+class PooledThreadSensitiveContext(ThreadSensitiveContext):
+    """Thread sensitive context running sync code in a thread from the pool.
+
+    Default context creates a new thread for every request and shuts it down
+    afterwards, along with connections it opened. The thread is taken from the
+    pool when sync code of the request first runs.
+    """
+
+    def __init__(self, pool: ExecutorPool):
+        super().__init__()
+        self.pool = pool
+        self.executor: PooledExecutor | None = None
+
+    async def __aenter__(self) -> "PooledThreadSensitiveContext":
+        """Enters context and registers executor taking a thread from the pool.
+
+        :return: Context.
+        """
+        await super().__aenter__()
+        if self.token:
+            self.executor = PooledExecutor(self.pool)
+            SyncToAsync.context_to_thread_executor[self] = self.executor
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Returns executor to the pool and leaves context.
+
+        :param exc_type: Exception type.
+        :param exc_value: Exception.
+        :param traceback: Traceback.
+        """
+        if self.executor is not None:
+            # Removed before the default context shuts it down.
+            SyncToAsync.context_to_thread_executor.pop(self, None)
+            self.executor.release()
+            self.executor = None
+        await super().__aexit__(exc_type, exc_value, traceback)
+
+
+class StreamingASGIHandler(ASGIHandler):
+    """ASGI handler reading streaming responses in the sync thread.
+
+    Default handler iterates streaming responses in the event loop, so their
+    iterators can't use the database. Sync code of requests runs in a bounded
+    pool of threads which keep their database connections.
+    """
+
+    def __init__(self) -> None:
+        check_asgiref_internals()
+        super().__init__()
+        self.executors = ExecutorPool(settings.DATABASE_CONNECTIONS["THREADS"])
+
+    async def __call__(
+        self, scope: dict[str, Any], receive: Receive, send: Send
+    ) -> None:
+        """Handles request in a thread from the pool.
+
+        :param scope: ASGI scope.
+        :param receive: ASGI receive callable.
+        :param send: ASGI send callable.
+        """
+        if scope["type"] != "http":
+            # Default handler rejects other connections.
+            return await super().__call__(scope, receive, send)
+        async with PooledThreadSensitiveContext(self.executors):
+            await self.handle(scope, receive, send)
+
+    async def send_response(self, response: HttpResponseBase, send: Send) -> None:
+        """Encodes and sends a response out over ASGI.
+
+        :param response: Response.
+        :param send: ASGI send callable.
+        """
+        if not response.streaming:
+            return await super().send_response(response, send)
+
+        await send(
+            {
+                "type": "http.response.start",
+                "status": response.status_code,
+                "headers": self._get_response_headers(response),
+            },
+        )
+        read_next = sync_to_async(next, thread_sensitive=True)
+        iterator = iter(response)
+        while (part := await read_next(iterator, _EXHAUSTED)) is not _EXHAUSTED:
+            for chunk, _ in self.chunk_bytes(part):
+                await send(
+                    {"type": "http.response.body", "body": chunk, "more_body": True},
+                )
+        await send({"type": "http.response.body"})
+        await sync_to_async(response.close, thread_sensitive=True)()
+
+    @staticmethod
+    def _get_response_headers(response: HttpResponseBase) -> list[tuple[bytes, bytes]]:
+        headers = [
+            (
+                header.encode("ascii") if isinstance(header, str) else header,
+                value.encode("latin1") if isinstance(value, str) else value,
+            )
+            for header, value in response.items()
+        ]
+        headers.extend(
+            (b"Set-Cookie", cookie.output(header="").encode("ascii").strip())
+            for cookie in response.cookies.values()
+        )
+        return headers
+
+
+def get_asgi_application() -> StreamingASGIHandler:
+    """Returns ASGI application like `django.core.asgi.get_asgi_application` does.
+
+    :return: ASGI handler.
+    """
+    django.setup(set_prefix=False)
+    return StreamingASGIHandler()
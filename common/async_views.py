@@ -0,0 +1,244 @@
+from functools import wraps
+from typing import TYPE_CHECKING, Any, Callable
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import QuerySet
+from django.http import Http404, HttpRequest, HttpResponse, HttpResponseBase
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.viewsets import ModelViewSet
+
+from common.fastpath import ValuesPlan
+
+Base = ModelViewSet if TYPE_CHECKING else object
+
+
+class AsyncUnsupported(Exception):
+    """Request can't be handled asynchronously and is passed to sync view."""
+
+
+async def aget_object_or_404(queryset: QuerySet[Any], **filter_kwargs: Any) -> Any:
+    """Async counterpart of DRF `get_object_or_404`.
+
+    :param queryset: Queryset.
+    :param filter_kwargs: Lookups of object.
+    :return: Object.
+    :raises Http404: if object does not exist or lookups are invalid.
+    """
+    try:
+        return await queryset.aget(**filter_kwargs)
+    except (queryset.model.DoesNotExist, TypeError, ValueError, ValidationError) as err:
+        raise Http404 from err
+
+
+def _to_plain_response(response: HttpResponseBase) -> HttpResponseBase:
+    # Django renders deferred responses of async views in a thread.
+    if not hasattr(response, "render"):
+        return response
+    response.render()
+    plain = HttpResponse(response.content, status=response.status_code)
+    for header, value in response.items():
+        plain[header] = value
+    return plain
+
+
+class AsyncReadMixin(Base):
+    """Serves GET requests of `async_actions` with async ORM in the event loop.
+
+    Views of other actions and methods, and requests which can't be handled
+    asynchronously, are run by the sync view in a thread. Async actions are
+    named after sync ones with `a` prefix, e.g. `alist`, and read values()
+    rows with `ValuesPlan`, so the mixin must be used with ValuesListMixin.
+    Other mixins take part in async handling with `adispatch` and `ainitial`
+    counterparts of `dispatch` and `initial`. Object permissions are not
+    checked, async actions must be readable by everyone passing view
+    permissions.
+    """
+
+    async_actions: tuple[str, ...] = ()
+
+    @classmethod
+    def as_view(cls, actions: dict[str, str] | None = None, **initkwargs: Any) -> Any:
+        """Returns async view if any of actions can be served asynchronously.
+
+        :param actions: Actions by HTTP methods.
+        :param initkwargs: Kwargs of viewset.
+        :return: View function.
+        """
+        view = super().as_view(actions, **initkwargs)
+        if not settings.ASYNC_READS["ENABLED"] or (
+            actions.get("get") not in cls.async_actions
+        ):
+            return view
+
+        async def async_view(
+            request: HttpRequest,
+            *args: Any,
+            **kwargs: Any,
+        ) -> HttpResponseBase:
+            if request.method == "GET":
+                try:
+                    return await cls._ahandle(view, request, *args, **kwargs)
+                except AsyncUnsupported:
+                    pass
+            return await sync_to_async(view)(request, *args, **kwargs)
+
+        return wraps(view)(async_view)
+
+    @classmethod
+    async def _ahandle(
+        cls,
+        view: Callable[..., HttpResponseBase],
+        request: HttpRequest,
+        *args: Any,
+        **kwargs: Any,
+    ) -> HttpResponseBase:
+        # Sets viewset up like the view function of ViewSetMixin does.
+        self = cls(**view.initkwargs)
+        actions: dict[str, str] = view.actions
+        if "get" in actions and "head" not in actions:
+            actions["head"] = actions["get"]
+        self.action_map = actions
+        for method, action in actions.items():
+            setattr(self, method, getattr(self, action))
+        self.request = request
+        self.args = args
+        self.kwargs = kwargs
+        return _to_plain_response(await self.adispatch(request, *args, **kwargs))
+
+    async def adispatch(
+        self,
+        request: HttpRequest,
+        *args: Any,
+        **kwargs: Any,
+    ) -> HttpResponseBase:
+        """Async counterpart of `dispatch`.
+
+        :param request: Current request.
+        :param args: Args.
+        :param kwargs: Kwargs.
+        :return: Response.
+        :raises AsyncUnsupported: if request must be handled by sync view.
+        """
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await self.ainitial(request, *args, **kwargs)
+            handler = getattr(self, f"a{self.action}")
+            response = await handler(request, *args, **kwargs)
+        except AsyncUnsupported:
+            raise
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def ainitial(self, request: Request, *args: Any, **kwargs: Any) -> None:
+        """Async counterpart of `initial`.
+
+        :param request: Current request.
+        :param args: Args.
+        :param kwargs: Kwargs.
+        :raises AsyncUnsupported: if requests are throttled.
+        """
+        if self.get_throttles():
+            raise AsyncUnsupported
+        self.format_kwarg = self.get_format_suffix(**kwargs)
+        neg = self.perform_content_negotiation(request)
+        request.accepted_renderer, request.accepted_media_type = neg
+        version, scheme = self.determine_version(request, *args, **kwargs)
+        request.version, request.versioning_scheme = version, scheme
+        await self.aperform_authentication(request)
+        self.check_permissions(request)
+
+    async def aperform_authentication(self, request: Request) -> None:
+        """Authenticates request like `Request._authenticate` does.
+
+        :param request: Current request.
+        :raises AsyncUnsupported: if authenticator can't authenticate
+         asynchronously.
+        """
+        for authenticator in request.authenticators:
+            aauthenticate = getattr(authenticator, "aauthenticate", None)
+            if aauthenticate is None:
+                raise AsyncUnsupported
+            try:
+                user_auth_tuple = await aauthenticate(request)
+            except exceptions.APIException:
+                request._not_authenticated()
+                raise
+            if user_auth_tuple is not None:
+                request._authenticator = authenticator
+                request.user, request.auth = user_auth_tuple
+                return
+        request._not_authenticated()
+
+    def get_async_values_plan(self) -> ValuesPlan:
+        """Returns values plan of current serializer.
+
+        :return: Plan.
+        :raises AsyncUnsupported: if serializer can't be projected.
+        """
+        plan = self.get_values_plan()
+        if plan is None:
+            raise AsyncUnsupported
+        return plan
+
+    async def apaginate_queryset(self, queryset: QuerySet[Any]) -> list[Any] | None:
+        """Async counterpart of `paginate_queryset`.
+
+        :param queryset: Queryset.
+        :return: Objects of page or None if pagination was not requested.
+        :raises AsyncUnsupported: if paginator can't paginate asynchronously.
+        """
+        if self.paginator is None:
+            return None
+        if not hasattr(self.paginator, "apaginate_queryset"):
+            raise AsyncUnsupported
+        return await self.paginator.apaginate_queryset(
+            queryset,
+            self.request,
+            view=self,
+        )
+
+    async def alist(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """Async counterpart of `list` of ValuesListMixin.
+
+        :param request: Current request.
+        :param args: Args.
+        :param kwargs: Kwargs.
+        :return: Response with list of objects.
+        """
+        plan = self.get_async_values_plan()
+        queryset = plan.values(self.filter_queryset(self.get_queryset()))
+        page = await self.apaginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(await plan.arepresent(page))
+        rows = [row async for row in queryset.aiterator()]
+        return Response(await plan.arepresent(rows))
+
+    async def aretrieve(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """Async counterpart of `retrieve` reading object with values plan.
+
+        :param request: Current request.
+        :param args: Args.
+        :param kwargs: Kwargs.
+        :return: Response with object.
+        """
+        plan = self.get_async_values_plan()
+        queryset = plan.values(self.filter_queryset(self.get_queryset()))
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        row = await aget_object_or_404(
+            queryset,
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]},
+        )
+        (data,) = await plan.arepresent([row])
+        return Response(data)
@@ -0,0 +1,81 @@
+from django.db.models import QuerySet
+from django.utils.translation import gettext_lazy as _
+from rest_framework.request import Request
+from rest_framework_simplejwt import authentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+
+from authentication.models import User
+from common.timing import measure_timing
+
+
+class JWTAuthentication(authentication.JWTAuthentication):
+    """JWT authentication fetching user together with their role.
+
+    Role is used by permissions on almost every request.
+    """
+
+    def authenticate(self, request: Request) -> tuple[User, Token] | None:
+        """Authenticates request measuring time of authentication.
+
+        :param request: Current request.
+        :return: User and token or None if request has no token.
+        """
+        with measure_timing("auth"):
+            return super().authenticate(request)
+
+    async def aauthenticate(self, request: Request) -> tuple[User, Token] | None:
+        """Async counterpart of `authenticate` fetching user with async ORM.
+
+        :param request: Current request.
+        :return: User and token or None if request has no token.
+        """
+        with measure_timing("auth"):
+            header = self.get_header(request)
+            if header is None:
+                return None
+            raw_token = self.get_raw_token(header)
+            if raw_token is None:
+                return None
+            validated_token = self.get_validated_token(raw_token)
+            return await self.aget_user(validated_token), validated_token
+
+    def get_user(self, validated_token: Token) -> User:
+        """Returns user of token with selected role.
+
+        :param validated_token: Validated token.
+        :return: User instance.
+        :raises InvalidToken: if token does not contain user id.
+        :raises AuthenticationFailed: if user does not exist or is inactive.
+        """
+        return self._check_user(self._get_users(validated_token).first())
+
+    async def aget_user(self, validated_token: Token) -> User:
+        """Async counterpart of `get_user`.
+
+        :param validated_token: Validated token.
+        :return: User instance.
+        :raises InvalidToken: if token does not contain user id.
+        :raises AuthenticationFailed: if user does not exist or is inactive.
+        """
+        return self._check_user(await self._get_users(validated_token).afirst())
+
+    def _get_users(self, validated_token: Token) -> QuerySet[User]:
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as err:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification"),
+            ) from err
+        return self.user_model.objects.select_related("role").filter(
+            **{api_settings.USER_ID_FIELD: user_id},
+        )
+
+    @staticmethod
+    def _check_user(user: User | None) -> User:
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
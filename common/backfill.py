@@ -0,0 +1,184 @@
+import random
+import time
+from typing import Any, Callable, Type
+
+from django.db import transaction
+from django.db.models import Max, Min, Model, QuerySet
+from django.utils import timezone
+
+from common.models import BackfillCheckpoint
+from common.versions import bump_model_version
+
+# Registered backfills by names.
+backfills: dict[str, "Backfill"] = {}
+
+
+class Backfill:
+    """Fills columns of existing rows with values computed by the database.
+
+    Values are given as expressions for `QuerySet.update`, e.g. subqueries
+    counting related rows, so a batch is filled with a single UPDATE.
+    Backfills computing values in Python override `fill` and `find_mismatches`
+    instead.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        model: Type[Model],
+        get_expressions: Callable[[], dict[str, Any]] | None = None,
+    ):
+        self.name = name
+        self.model = model
+        self.get_expressions = get_expressions
+
+    def get_queryset(self) -> QuerySet[Any]:
+        """Returns all rows of model.
+
+        :return: Queryset.
+        """
+        return self.model._base_manager.all()
+
+    def fill(self, start: int, end: int) -> int:
+        """Fills rows with primary keys in range (start, end].
+
+        :param start: Primary key before the range.
+        :param end: Last primary key of the range.
+        :return: Number of updated rows.
+        """
+        return (
+            self.get_queryset()
+            .filter(pk__gt=start, pk__lte=end)
+            .update(**self.get_expressions())
+        )
+
+    def find_mismatches(self, pks: list[int]) -> list[int]:
+        """Recomputes values of rows and compares them with stored ones.
+
+        :param pks: Primary keys of checked rows.
+        :return: Primary keys of rows with outdated values.
+        """
+        expressions = self.get_expressions()
+        expected = {f"expected_{name}": value for name, value in expressions.items()}
+        rows = (
+            self.get_queryset()
+            .filter(pk__in=pks)
+            .annotate(**expected)
+            .values("pk", *expressions, *expected)
+        )
+        return [
+            row["pk"]
+            for row in rows
+            if any(row[name] != row[f"expected_{name}"] for name in expressions)
+        ]
+
+
+def register_backfill(backfill: Backfill) -> Backfill:
+    """Makes backfill available to `backfill` command.
+
+    :param backfill: Backfill.
+    :return: The same backfill.
+    """
+    backfills[backfill.name] = backfill
+    return backfill
+
+
+class BackfillRunner:
+    """Runs backfill in batches of primary key ranges with a pause after each.
+
+    Every batch is filled in its own transaction together with the checkpoint,
+    so the run can be stopped at any time and resumed. Short transactions
+    don't hold row locks for long. Rows created after the run started are
+    skipped, they must be filled by the code creating them.
+    """
+
+    def __init__(
+        self,
+        backfill: Backfill,
+        batch_size: int,
+        sleep: float,
+        progress: Callable[[BackfillCheckpoint], None],
+    ):
+        self.backfill = backfill
+        self.batch_size = batch_size
+        self.sleep = sleep
+        self.progress = progress
+
+    def get_checkpoint(self) -> BackfillCheckpoint:
+        """Returns checkpoint of backfill, creating it if necessary.
+
+        :return: Checkpoint.
+        """
+        checkpoint, _ = BackfillCheckpoint.objects.get_or_create(
+            name=self.backfill.name,
+        )
+        return checkpoint
+
+    def run(self, resume: bool) -> BackfillCheckpoint:
+        """Fills all rows created before the run, batch by batch.
+
+        :param resume: Continue from checkpoint instead of the first row.
+        :return: Checkpoint of completed run.
+        """
+        checkpoint = self.get_checkpoint()
+        if not resume or checkpoint.completed_at is not None:
+            checkpoint.last_pk = 0
+            checkpoint.rows = 0
+            checkpoint.started_at = timezone.now()
+            checkpoint.completed_at = None
+            checkpoint.save()
+
+        last_pk = self.backfill.get_queryset().aggregate(last=Max("pk"))["last"] or 0
+        while checkpoint.last_pk < last_pk:
+            end = self._get_batch_end(checkpoint.last_pk, last_pk)
+            with transaction.atomic():
+                checkpoint.rows += self.backfill.fill(checkpoint.last_pk, end)
+                checkpoint.last_pk = end
+                checkpoint.save(update_fields=["last_pk", "rows", "updated_at"])
+            # Cached responses must not keep values replaced by the batch.
+            bump_model_version(self.backfill.model)
+            self.progress(checkpoint)
+            if self.sleep:
+                time.sleep(self.sleep)
+
+        checkpoint.completed_at = timezone.now()
+        checkpoint.save(update_fields=["completed_at", "updated_at"])
+        return checkpoint
+
+    def verify(self, size: int) -> tuple[list[int], list[int]]:
+        """Recomputes values of random rows and compares them with stored ones.
+
+        :param size: Max number of checked rows.
+        :return: Primary keys of checked rows and of rows with outdated values.
+        """
+        pks = self.sample_pks(size)
+        return pks, self.backfill.find_mismatches(pks)
+
+    def sample_pks(self, size: int) -> list[int]:
+        """Returns primary keys of random rows.
+
+        Every row is found by index from a random point of primary key range,
+        so tables are not sorted randomly as a whole.
+
+        :param size: Max number of rows.
+        :return: Primary keys, less than size if the table is small.
+        """
+        queryset = self.backfill.get_queryset().order_by("pk")
+        bounds = queryset.aggregate(first=Min("pk"), last=Max("pk"))
+        if bounds["first"] is None:
+            return []
+        pks = set()
+        for _ in range(size):
+            point = random.randint(bounds["first"], bounds["last"])  # noqa: S311
+            pks.update(queryset.filter(pk__gte=point).values_list("pk", flat=True)[:1])
+        return sorted(pks)
+
+    def _get_batch_end(self, start: int, last_pk: int) -> int:
+        # Batches have `batch_size` rows even if primary keys have gaps.
+        end = (
+            self.backfill.get_queryset()
+            .filter(pk__gt=start)
+            .order_by("pk")
+            .values_list("pk", flat=True)[self.batch_size - 1 : self.batch_size]
+        )
+        return min([*end, last_pk])
@@ -0,0 +1,255 @@
+import math
+import re
+import time
+from typing import Any, Callable, Iterator, Type
+from urllib.parse import urlencode
+
+from django.db import connection
+from django.db.models import Model
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import NoReverseMatch, reverse
+from rest_framework.routers import BaseRouter
+from rest_framework.viewsets import ViewSetMixin
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.authentication.urls import router as authentication_router
+from api.forum.urls import router as forum_router
+from api.news.urls import router as news_router
+from authentication.models import User
+from common.seeding import Seeder
+from forum.models import Question
+
+ROUTERS = (authentication_router, forum_router, news_router)
+PAGE_QUERY = {"limit": "20", "skip": "0"}
+PERCENTILES = (50, 95, 99)
+NO_CACHE_SETTINGS = {
+    "RESPONSE_CACHE": {"ENABLED": False, "ALIAS": "default", "TIMEOUT": 0},
+    "FRONT_PAGE_SNAPSHOT": {"ENABLED": False, "SIZE": 0},
+    "SINGLE_FLIGHT": {"ENABLED": False, "TIMEOUT": 0},
+}
+
+Endpoint = tuple[str, str]
+Result = dict[str, Any]
+
+
+def _get_first(model: Type[Model], field: str) -> Any:
+    return model.objects.order_by("pk").values_list(field, flat=True).first()
+
+
+# Functions returning values of URL parameters, called with viewset's model.
+SAMPLE_KWARGS: dict[str, Callable[[Type[Model]], Any]] = {
+    "pk": lambda model: _get_first(model, "pk"),
+    "user_id": lambda model: _get_first(Question, "author_id"),
+}
+
+
+def _get_sample_kwargs(names: list[str], model: Type[Model]) -> dict[str, Any] | None:
+    kwargs = {}
+    for name in names:
+        sample = SAMPLE_KWARGS.get(name)
+        value = sample(model) if sample else None
+        if value is None:
+            return None
+        kwargs[name] = value
+    return kwargs
+
+
+def _get_viewset_endpoints(
+    viewset: Type[ViewSetMixin],
+    basename: str,
+) -> Iterator[tuple[str, list[str]]]:
+    if hasattr(viewset, "list"):
+        yield f"{basename}-list", []
+    if hasattr(viewset, "retrieve"):
+        yield f"{basename}-detail", ["pk"]
+    for extra_action in viewset.get_extra_actions():
+        if "get" not in extra_action.mapping:
+            continue
+        names = list(re.compile(extra_action.url_path).groupindex)
+        if extra_action.detail:
+            names.insert(0, "pk")
+        yield f"{basename}-{extra_action.url_name}", names
+
+
+def _reverse(name: str, kwarg_names: list[str], model: Type[Model]) -> str | None:
+    kwargs = _get_sample_kwargs(kwarg_names, model)
+    if kwargs is None:
+        return None
+    try:
+        return reverse(name, kwargs=kwargs)
+    except NoReverseMatch:
+        return None
+
+
+def _get_query_strings(name: str, unpaginated: bool) -> list[str]:
+    if not name.endswith("-list"):
+        return [""]
+    return [urlencode(PAGE_QUERY), *([""] if unpaginated else [])]
+
+
+def discover_endpoints(
+    routers: tuple[BaseRouter, ...] = ROUTERS,
+    unpaginated: bool = False,
+) -> list[Endpoint]:
+    """Returns GET endpoints of all viewsets registered in routers.
+
+    URL parameters are filled with ids of existing objects. List endpoints are
+    requested with `PAGE_QUERY` and, if requested, without pagination too.
+    Endpoints whose parameters can't be filled are skipped.
+
+    :param routers: Routers of API.
+    :param unpaginated: Whether to request lists without pagination.
+    :return: List of endpoint keys and paths.
+    """
+    endpoints = []
+    for router in routers:
+        for _, viewset, basename in router.registry:
+            for name, kwarg_names in _get_viewset_endpoints(viewset, basename):
+                path = _reverse(name, kwarg_names, viewset.queryset.model)
+                if path is None:
+                    continue
+                for query_string in _get_query_strings(name, unpaginated):
+                    key = f"{name}?{query_string}" if query_string else name
+                    endpoints.append((key, f"{path}?{query_string}".rstrip("?")))
+    return endpoints
+
+
+def get_auth_headers(user: User) -> dict[str, str]:
+    """Returns headers authenticating test client requests as user.
+
+    :param user: User.
+    :return: Extra request headers in WSGI format.
+    """
+    token = RefreshToken.for_user(user).access_token
+    return {"HTTP_AUTHORIZATION": f"Bearer {token}"}
+
+
+def read_content(response: Any) -> bytes:
+    """Returns content of response, consuming streaming content.
+
+    :param response: Response of test client.
+    :return: Content.
+    """
+    if response.streaming:
+        return b"".join(response.streaming_content)
+    return response.content
+
+
+def percentile(values: list[float], rank: int) -> float:
+    """Returns percentile of values using nearest-rank method.
+
+    :param values: Sorted values.
+    :param rank: Percentile rank from 1 to 100.
+    :return: Percentile.
+    """
+    return values[max(math.ceil(rank / 100 * len(values)) - 1, 0)]
+
+
+def measure(
+    client: Client,
+    path: str,
+    requests: int,
+    warmup: int,
+    headers: dict[str, str],
+) -> Result:
+    """Requests path several times and returns latency, queries and size.
+
+    :param client: Test client.
+    :param path: Requested path with query string.
+    :param requests: Number of measured requests.
+    :param warmup: Number of requests made before measuring.
+    :param headers: Extra request headers in WSGI format.
+    :return: Dict of measurements.
+    """
+    for _ in range(warmup):
+        read_content(client.get(path, **headers))
+
+    latencies, queries, sizes, statuses = [], [], [], set()
+    for _ in range(requests):
+        with CaptureQueriesContext(connection) as context:
+            started_at = time.perf_counter()
+            response = client.get(path, **headers)
+            size = len(read_content(response))
+            latencies.append((time.perf_counter() - started_at) * 1000)
+        queries.append(len(context))
+        sizes.append(size)
+        statuses.add(response.status_code)
+
+    latencies.sort()
+    return {
+        "path": path,
+        "status": sorted(statuses),
+        "requests": requests,
+        "latency_ms": {
+            "min": round(latencies[0], 3),
+            **{
+                f"p{rank}": round(percentile(latencies, rank), 3)
+                for rank in PERCENTILES
+            },
+            "max": round(latencies[-1], 3),
+            "mean": round(sum(latencies) / requests, 3),
+        },
+        "queries": {"min": min(queries), "max": max(queries)},
+        "bytes": max(sizes),
+    }
+
+
+def seed_budget_data(questions: int) -> None:
+    """Seeds data of size used to check query budgets.
+
+    :param questions: Number of questions, other numbers are derived from it.
+    """
+    Seeder(
+        users=max(questions // 5, 5),
+        tags=20,
+        questions=questions,
+        comments_per_question=3,
+        articles=questions,
+        likes_per_article=5,
+        seed=questions,
+    ).seed(lambda name, created: None)
+
+
+def count_endpoint_queries(client: Client) -> dict[str, tuple[str, int]]:
+    """Requests every GET endpoint as the first admin and counts its queries.
+
+    Every endpoint is requested once before counting.
+
+    :param client: Test client.
+    :return: Paths and max numbers of queries by endpoint keys.
+    """
+    admin = User.objects.filter(role__title="Admin").order_by("pk").first()
+    headers = get_auth_headers(admin)
+    counts = {}
+    for key, path in discover_endpoints():
+        result = measure(client, path, requests=1, warmup=1, headers=headers)
+        counts[key] = (path, result["queries"]["max"])
+    return counts
+
+
+def compare(
+    baseline: dict[str, Result],
+    results: dict[str, Result],
+    threshold: float,
+) -> Iterator[tuple[str, str, bool]]:
+    """Compares results with baseline ones.
+
+    :param baseline: Baseline results by endpoint keys.
+    :param results: Current results by endpoint keys.
+    :param threshold: Ratio of p95 latencies considered a regression.
+    :yield: Endpoint key, description of change and whether it is a regression.
+    """
+    for key, result in results.items():
+        old = baseline.get(key)
+        if old is None:
+            yield key, "new endpoint", False
+            continue
+        old_p95, new_p95 = old["latency_ms"]["p95"], result["latency_ms"]["p95"]
+        ratio = new_p95 / old_p95 if old_p95 else 1
+        old_queries, new_queries = old["queries"]["max"], result["queries"]["max"]
+        description = (
+            f"p95 {old_p95:.2f} -> {new_p95:.2f} ms ({ratio:.2f}x), "
+            f"queries {old_queries} -> {new_queries}"
+        )
+        yield key, description, ratio > threshold or new_queries > old_queries
@@ -0,0 +1,102 @@
+import re
+from collections import Counter
+from typing import Any, Callable, Type, TypeVar
+
+from django.http import HttpRequest
+from django.urls import resolve
+from rest_framework.views import APIView
+
+ViewSetType = TypeVar("ViewSetType", bound=Type[APIView])
+
+# Max number of queries of viewset actions, including fetching of request's user.
+query_budgets: dict[Type[APIView], dict[str, int]] = {}
+
+IN_LIST_REGEX = re.compile(r"IN \((?:%s, )*%s\)")
+NUMBER_REGEX = re.compile(r"\b\d+\b")
+
+
+def query_budget(**budgets: int) -> Callable[[ViewSetType], ViewSetType]:
+    """Declares max number of queries per action of decorated viewset.
+
+    Usage: `@query_budget(list=3, retrieve=4)`.
+
+    :param budgets: Max number of queries by action names.
+    :return: Class decorator.
+    """
+
+    def decorator(viewset: ViewSetType) -> ViewSetType:
+        query_budgets[viewset] = {**query_budgets.get(viewset, {}), **budgets}
+        return viewset
+
+    return decorator
+
+
+def get_query_budget(viewset: Type[APIView], action: str | None) -> int | None:
+    """Returns max number of queries of viewset action.
+
+    :param viewset: Viewset class.
+    :param action: Name of action.
+    :return: Number of queries or None if action has no budget.
+    """
+    return query_budgets.get(viewset, {}).get(action or "")
+
+
+def get_path_query_budget(path: str) -> int | None:
+    """Returns max number of queries of GET request of path.
+
+    :param path: Path, query string is ignored.
+    :return: Number of queries or None if action has no budget.
+    """
+    view: Any = resolve(path.split("?")[0]).func
+    actions: dict[str, str] = getattr(view, "actions", None) or {}
+    return get_query_budget(getattr(view, "cls", view), actions.get("get"))
+
+
+def breaks_query_budget(budget: int | None, counts: list[int | None]) -> bool:
+    """Returns whether queries of endpoint grow with data or exceed its budget.
+
+    :param budget: Max number of queries or None.
+    :param counts: Numbers of queries on increasing data, None if not measured.
+    :return: True if budget is broken.
+    """
+    known = [count for count in counts if count is not None]
+    return max(known) > known[0] or (budget is not None and max(known) > budget)
+
+
+def get_request_action(request: HttpRequest) -> tuple[Type[APIView] | None, str | None]:
+    """Returns viewset and action resolved for request.
+
+    :param request: Request with `resolver_match`.
+    :return: Viewset class and action name or Nones if view is not a viewset.
+    """
+    match = getattr(request, "resolver_match", None)
+    view: Any = match.func if match else None
+    actions: dict[str, str] | None = getattr(view, "actions", None)
+    if not actions:
+        return None, None
+    return view.cls, actions.get(request.method.lower())
+
+
+def get_sql_shape(sql: str) -> str:
+    """Returns SQL with lists of placeholders and numbers collapsed.
+
+    Queries differing only by parameters or by length of `IN` lists have the
+    same shape.
+
+    :param sql: SQL with placeholders.
+    :return: Shape of SQL.
+    """
+    return NUMBER_REGEX.sub("N", IN_LIST_REGEX.sub("IN (...)", sql))
+
+
+def get_repeated_shapes(queries: list[str], threshold: int) -> list[tuple[str, int]]:
+    """Returns shapes of SQL executed at least `threshold` times.
+
+    :param queries: Executed SQL.
+    :param threshold: Min number of executions.
+    :return: List of shapes and numbers of their executions.
+    """
+    shapes = Counter(get_sql_shape(sql) for sql in queries)
+    return [
+        (shape, count) for shape, count in shapes.most_common() if count >= threshold
+    ]
@@ -0,0 +1,189 @@
+import hashlib
+import time
+from typing import TYPE_CHECKING, Any, Iterable, Type
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.db.models import Model
+from django.http import HttpRequest, HttpResponse, HttpResponseBase
+from rest_framework.viewsets import ModelViewSet
+
+from common.conditional import get_not_modified_response
+from common.metrics import record_cache_lookup
+from common.replicas import replica_alias
+from common.versions import (
+    aget_last_modified,
+    aget_model_versions,
+    get_cache,
+    get_last_modified,
+    get_model_versions,
+)
+
+Base = ModelViewSet if TYPE_CHECKING else object
+
+RESPONSE_KEY_PREFIX = "rc:response:"
+CACHED_HEADERS = ("Content-Type", "Vary", "Allow", "ETag", "Last-Modified")
+
+
+def get_response_cache_key(
+    request: HttpRequest,
+    models: Iterable[Type[Model]],
+) -> str:
+    """Returns cache key of response built from path, query and model versions.
+
+    :param request: Current request.
+    :param models: Models the response depends on.
+    :return: Cache key.
+    """
+    return _build_response_cache_key(request, get_model_versions(models))
+
+
+async def aget_response_cache_key(
+    request: HttpRequest,
+    models: Iterable[Type[Model]],
+) -> str:
+    """Async counterpart of `get_response_cache_key`.
+
+    :param request: Current request.
+    :param models: Models the response depends on.
+    :return: Cache key.
+    """
+    return _build_response_cache_key(request, await aget_model_versions(models))
+
+
+def _build_response_cache_key(request: HttpRequest, versions: dict[str, int]) -> str:
+    query = urlencode(sorted(request.GET.lists()), doseq=True)
+    raw_key = "|".join(
+        [request.path, query, *(f"{key}={value}" for key, value in versions.items())],
+    )
+    return f"{RESPONSE_KEY_PREFIX}{hashlib.sha1(raw_key.encode()).hexdigest()}"
+
+
+class CachedResponseMixin(Base):
+    """Caches responses of anonymous GET requests.
+
+    Responses are invalidated by version counters of models listed in
+    `cache_dependencies`, so the models must be tracked with `track_model_versions`.
+    Replicas may lag behind writes counted by versions, so responses missing in
+    cache are read from the default database for `REPLICA_ROUTING["STICKY_SECONDS"]`
+    after the latest change of dependencies.
+    """
+
+    cached_actions: tuple[str, ...] = ("list", "retrieve")
+    cache_dependencies: tuple[Type[Model], ...] = ()
+
+    def dispatch(self, request: HttpRequest, *args: Any, **kwargs: Any) -> Any:
+        """Returns cached response if there is one, otherwise caches new response.
+
+        :param request: Current request.
+        :param args: Args.
+        :param kwargs: Kwargs.
+        :return: Cached or new response.
+        """
+        if not self._is_response_cacheable(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        cache = get_cache()
+        key = get_response_cache_key(request, self.cache_dependencies)
+        cached: dict[str, Any] | None = cache.get(key)
+        record_cache_lookup("response", "miss" if cached is None else "hit")
+        if cached is not None:
+            return self._get_cached_response(request, cached)
+
+        self._read_primary_after_write()
+        response = super().dispatch(request, *args, **kwargs)
+        if self._is_response_storable(response):
+            cache.set(
+                key,
+                self._get_cached(response),
+                timeout=settings.RESPONSE_CACHE["TIMEOUT"],
+            )
+        return response
+
+    async def adispatch(self, request: HttpRequest, *args: Any, **kwargs: Any) -> Any:
+        """Async counterpart of `dispatch`.
+
+        :param request: Current request.
+        :param args: Args.
+        :param kwargs: Kwargs.
+        :return: Cached or new response.
+        """
+        if not self._is_response_cacheable(request):
+            return await super().adispatch(request, *args, **kwargs)
+
+        cache = get_cache()
+        key = await aget_response_cache_key(request, self.cache_dependencies)
+        cached: dict[str, Any] | None = await cache.aget(key)
+        record_cache_lookup("response", "miss" if cached is None else "hit")
+        if cached is not None:
+            return self._get_cached_response(request, cached)
+
+        await self._aread_primary_after_write()
+        response = await super().adispatch(request, *args, **kwargs)
+        if self._is_response_storable(response):
+            await cache.aset(
+                key,
+                self._get_cached(response),
+                timeout=settings.RESPONSE_CACHE["TIMEOUT"],
+            )
+        return response
+
+    def _read_primary_after_write(self) -> None:
+        if replica_alias.get() is None or not self.cache_dependencies:
+            return
+        elapsed = time.time() - get_last_modified(self.cache_dependencies)
+        if elapsed < settings.REPLICA_ROUTING["STICKY_SECONDS"]:
+            replica_alias.set(None)
+
+    async def _aread_primary_after_write(self) -> None:
+        if replica_alias.get() is None or not self.cache_dependencies:
+            return
+        elapsed = time.time() - await aget_last_modified(self.cache_dependencies)
+        if elapsed < settings.REPLICA_ROUTING["STICKY_SECONDS"]:
+            replica_alias.set(None)
+
+    @staticmethod
+    def _get_cached_response(
+        request: HttpRequest,
+        cached: dict[str, Any],
+    ) -> HttpResponseBase:
+        not_modified = get_not_modified_response(
+            request,
+            cached["headers"].get("ETag"),
+            cached["headers"].get("Last-Modified"),
+        )
+        if not_modified is not None:
+            return not_modified
+        response = HttpResponse(cached["content"])
+        for header, value in cached["headers"].items():
+            response[header] = value
+        return response
+
+    @staticmethod
+    def _get_cached(response: HttpResponseBase) -> dict[str, Any]:
+        if hasattr(response, "render"):
+            response.render()
+        return {
+            "content": response.content,
+            "headers": {
+                header: response[header]
+                for header in CACHED_HEADERS
+                if response.has_header(header)
+            },
+        }
+
+    def _is_response_storable(self, response: HttpResponseBase) -> bool:
+        return (
+            response.status_code == 200
+            and not response.streaming
+            and "no-cache" not in response.get("Cache-Control", "")
+        )
+
+    def _is_response_cacheable(self, request: HttpRequest) -> bool:
+        action = self.action_map.get(request.method.lower())
+        return (
+            settings.RESPONSE_CACHE["ENABLED"]
+            and request.method == "GET"
+            and action in self.cached_actions
+            and not request.META.get("HTTP_AUTHORIZATION")
+        )
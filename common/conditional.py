@@ -0,0 +1,188 @@
+import hashlib
+from typing import TYPE_CHECKING, Any, Type
+
+from django.db.models import Model
+from django.http import HttpRequest, HttpResponseBase
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+from rest_framework.request import Request
+from rest_framework.viewsets import ModelViewSet
+
+from common.versions import (
+    aget_last_modified,
+    aget_model_versions,
+    get_last_modified,
+    get_model_versions,
+)
+
+Base = ModelViewSet if TYPE_CHECKING else object
+
+Validators = tuple[str, float]
+
+
+class ConditionalResponse(Exception):
+    """Interrupts request handling to return a conditional response."""
+
+    def __init__(self, response: HttpResponseBase):
+        super().__init__()
+        self.response = response
+
+
+def get_not_modified_response(
+    request: HttpRequest,
+    etag: str | None,
+    last_modified: str | None,
+) -> HttpResponseBase | None:
+    """Returns 304 or 412 response if request's preconditions allow it.
+
+    :param request: Current request.
+    :param etag: Quoted ETag of current response.
+    :param last_modified: HTTP date of last modification.
+    :return: Conditional response or None if full response must be returned.
+    """
+    response = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=parse_http_date_safe(last_modified) if last_modified else None,
+    )
+    if response is not None and response.status_code == 304:
+        if etag:
+            response["ETag"] = etag
+        if last_modified:
+            response["Last-Modified"] = last_modified
+    return response
+
+
+class ConditionalGetMixin(Base):
+    """Adds ETag and Last-Modified headers and answers conditional GET requests.
+
+    Validators are built from version counters and times of the latest change of
+    the queryset's model and `conditional_dependencies`, so no query is run and
+    the response does not have to be serialized. The models must be tracked with
+    `track_model_versions`.
+    """
+
+    conditional_actions: tuple[str, ...] = ("list", "retrieve")
+    conditional_dependencies: tuple[Type[Model], ...] = ()
+
+    def get_conditional_models(self) -> list[Type[Model]]:
+        """Returns models the response of current action depends on.
+
+        :return: Model of queryset and `conditional_dependencies`.
+        """
+        return [self.get_queryset().model, *self.conditional_dependencies]
+
+    def get_conditional_validators(self) -> Validators:
+        """Returns ETag and last modification time of current response.
+
+        :return: Quoted ETag and Unix timestamp.
+        """
+        models = self.get_conditional_models()
+        return self._build_validators(
+            get_model_versions(models),
+            get_last_modified(models),
+        )
+
+    async def aget_conditional_validators(self) -> Validators:
+        """Async counterpart of `get_conditional_validators`.
+
+        :return: Quoted ETag and Unix timestamp.
+        """
+        models = self.get_conditional_models()
+        return self._build_validators(
+            await aget_model_versions(models),
+            await aget_last_modified(models),
+        )
+
+    def _build_validators(
+        self,
+        versions: dict[str, int],
+        last_modified: float,
+    ) -> Validators:
+        raw_etag = "|".join(
+            [
+                self.request.get_full_path(),
+                *(f"{label}={version}" for label, version in versions.items()),
+            ],
+        )
+        etag = quote_etag(hashlib.sha1(raw_etag.encode()).hexdigest())
+        return etag, last_modified
+
+    def initial(self, request: Request, *args: Any, **kwargs: Any) -> None:
+        """Interrupts request if client's copy of response is still valid.
+
+        :param request: Current request.
+        :param args: Args.
+        :param kwargs: Kwargs.
+        :raises ConditionalResponse: if response was not modified.
+        """
+        super().initial(request, *args, **kwargs)
+        self.conditional_validators: Validators | None = None
+        if self._is_conditional(request):
+            self.conditional_validators = self.get_conditional_validators()
+            self._check_preconditions(request)
+
+    async def ainitial(self, request: Request, *args: Any, **kwargs: Any) -> None:
+        """Async counterpart of `initial`.
+
+        :param request: Current request.
+        :param args: Args.
+        :param kwargs: Kwargs.
+        :raises ConditionalResponse: if response was not modified.
+        """
+        await super().ainitial(request, *args, **kwargs)
+        self.conditional_validators = None
+        if self._is_conditional(request):
+            self.conditional_validators = await self.aget_conditional_validators()
+            self._check_preconditions(request)
+
+    def _is_conditional(self, request: Request) -> bool:
+        return (
+            request.method in {"GET", "HEAD"}
+            and self.action in self.conditional_actions
+        )
+
+    def _check_preconditions(self, request: Request) -> None:
+        if not self.conditional_validators:
+            return
+        etag, last_modified = self.conditional_validators
+        response = get_not_modified_response(
+            request,
+            etag,
+            http_date(int(last_modified)),
+        )
+        if response is not None:
+            raise ConditionalResponse(response)
+
+    def handle_exception(self, exc: Exception) -> HttpResponseBase:
+        """Returns conditional response instead of handling it as an error.
+
+        :param exc: Raised exception.
+        :return: Response.
+        """
+        if isinstance(exc, ConditionalResponse):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(
+        self,
+        request: Request,
+        response: HttpResponseBase,
+        *args: Any,
+        **kwargs: Any,
+    ) -> HttpResponseBase:
+        """Adds ETag and Last-Modified headers to successful response.
+
+        :param request: Current request.
+        :param response: Response.
+        :param args: Args.
+        :param kwargs: Kwargs.
+        :return: Response with validators.
+        """
+        response = super().finalize_response(request, response, *args, **kwargs)
+        validators: Validators | None = getattr(self, "conditional_validators", None)
+        if validators and response.status_code == 200:
+            etag, last_modified = validators
+            response["ETag"] = etag
+            response["Last-Modified"] = http_date(int(last_modified))
+        return response
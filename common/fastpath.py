@@ -0,0 +1,366 @@
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any, Iterable, Type
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.db.models import Model, Prefetch, QuerySet
+from rest_framework import relations, serializers
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.viewsets import ModelViewSet
+
+from common.timing import measure_timing
+
+Base = ModelViewSet if TYPE_CHECKING else object
+
+Row = dict[str, Any]
+
+ID_BATCH_SIZE = 500
+
+
+def _represent(field: serializers.Field | None, value: Any) -> Any:
+    if value is None or field is None:
+        return value
+    return field.to_representation(value)
+
+
+def _readable_fields(serializer: serializers.Serializer) -> list[serializers.Field]:
+    return [field for field in serializer.fields.values() if not field.write_only]
+
+
+class ColumnPart:
+    """Serializer field backed by a single column."""
+
+    def __init__(self, name: str, lookup: str, field: serializers.Field | None):
+        self.name = name
+        self.lookup = lookup
+        self.field = field
+
+    @property
+    def lookups(self) -> list[str]:
+        """Returns lookups of values() query.
+
+        :return: List of lookups.
+        """
+        return [self.lookup]
+
+    def represent(self, row: Row, related: dict[str, dict[Any, Any]]) -> Any:
+        """Returns representation of column value.
+
+        :param row: Row returned by values() query.
+        :param related: Fetched values of many relations.
+        :return: Representation of field.
+        """
+        return _represent(self.field, row[self.lookup])
+
+
+class ForeignKeyPart:
+    """Nested serializer of a foreign key, built from joined columns."""
+
+    def __init__(self, name: str, key_lookup: str, columns: list[ColumnPart]):
+        self.name = name
+        self.key_lookup = key_lookup
+        self.columns = columns
+
+    @property
+    def lookups(self) -> list[str]:
+        """Returns lookups of values() query.
+
+        :return: List of lookups.
+        """
+        return [self.key_lookup, *(column.lookup for column in self.columns)]
+
+    def represent(self, row: Row, related: dict[str, dict[Any, Any]]) -> Any:
+        """Returns representation of related object.
+
+        :param row: Row returned by values() query.
+        :param related: Fetched values of many relations.
+        :return: Dict of related object's fields or None.
+        """
+        if row[self.key_lookup] is None:
+            return None
+        return {column.name: column.represent(row, related) for column in self.columns}
+
+
+class ManyToManyPart:
+    """Many-to-many field fetched from its through table by one query per page.
+
+    Related objects are ordered by primary key, serializers must read them
+    prefetched with `prefetch_ordered`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        model_field: Any,
+        columns: list[ColumnPart] | None,
+    ):
+        self.name = name
+        self.through: Type[Model] = model_field.remote_field.through
+        self.source = model_field.m2m_field_name()
+        self.target = model_field.m2m_reverse_field_name()
+        self.columns = columns
+        self.ordering = self.through._meta.get_field(self.target).attname
+
+    @property
+    def lookups(self) -> list[str]:
+        """Returns lookups of values() query.
+
+        :return: Empty list, related objects are fetched with separate query.
+        """
+        return []
+
+    def fetch(self, ids: list[Any]) -> dict[Any, list[Any]]:
+        """Returns represented related objects grouped by id of source object.
+
+        :param ids: IDs of source objects.
+        :return: Dict of source ids and lists of related objects.
+        """
+        grouped: dict[Any, list[Any]] = defaultdict(list)
+        for start in range(0, len(ids), ID_BATCH_SIZE):
+            for row in self._get_rows(ids[start : start + ID_BATCH_SIZE]):
+                source_id, *values = row.values()
+                grouped[source_id].append(self._represent_related(values))
+        return grouped
+
+    async def afetch(self, ids: list[Any]) -> dict[Any, list[Any]]:
+        """Async counterpart of `fetch` reading rows with `aiterator`.
+
+        :param ids: IDs of source objects.
+        :return: Dict of source ids and lists of related objects.
+        """
+        grouped: dict[Any, list[Any]] = defaultdict(list)
+        for start in range(0, len(ids), ID_BATCH_SIZE):
+            rows = self._get_rows(ids[start : start + ID_BATCH_SIZE])
+            async for row in rows.aiterator():
+                source_id, *values = row.values()
+                grouped[source_id].append(self._represent_related(values))
+        return grouped
+
+    def represent(self, row: Row, related: dict[str, dict[Any, Any]]) -> Any:
+        """Returns list of related objects.
+
+        :param row: Row returned by values() query.
+        :param related: Fetched values of many relations.
+        :return: List of related objects or their primary keys.
+        """
+        return related[self.name].get(row["pk"], [])
+
+    def _get_rows(self, ids: list[Any]) -> QuerySet[Any]:
+        lookups = (
+            [f"{self.target}__{column.lookup}" for column in self.columns]
+            if self.columns is not None
+            else [self.target]
+        )
+        return (
+            self.through.objects.filter(**{f"{self.source}__in": ids}).order_by(
+                self.ordering,
+            )
+            # Not values_list(), its aiterator() fails with several fields in
+            # Django 4.1.
+            .values(self.source, *lookups)
+        )
+
+    def _represent_related(self, values: list[Any]) -> Any:
+        if self.columns is None:
+            return values[0]
+        return {
+            column.name: _represent(column.field, value)
+            for column, value in zip(self.columns, values)
+        }
+
+
+Part = ColumnPart | ForeignKeyPart | ManyToManyPart
+
+
+def prefetch_ordered(lookup: str, model: Type[Model]) -> Prefetch:
+    """Returns prefetch of many-to-many relation ordered like `ManyToManyPart`.
+
+    Serializers of prefetched objects then return the same data as values plans.
+
+    :param lookup: Prefetch lookup.
+    :param model: Related model.
+    :return: Prefetch ordered by primary key.
+    """
+    return Prefetch(lookup, queryset=model.objects.order_by("pk"))
+
+
+def _get_model_field(model: Type[Model], field: serializers.Field) -> Any:
+    if field.source == "*" or "." in field.source:
+        return None
+    try:
+        return model._meta.get_field(field.source)
+    except FieldDoesNotExist:
+        return None
+
+
+def _build_columns(
+    model: Type[Model],
+    serializer: serializers.Serializer,
+) -> list[ColumnPart] | None:
+    columns = []
+    for field in _readable_fields(serializer):
+        model_field = _get_model_field(model, field)
+        if model_field is None or model_field.is_relation:
+            return None
+        columns.append(ColumnPart(field.field_name, model_field.attname, field))
+    return columns
+
+
+def _build_foreign_key_part(model_field: Any, field: serializers.Field) -> Part | None:
+    if isinstance(field, relations.PrimaryKeyRelatedField):
+        if field.pk_field is not None:
+            return None
+        return ColumnPart(field.field_name, model_field.attname, None)
+    if not isinstance(field, serializers.ModelSerializer):
+        return None
+    columns = _build_columns(model_field.related_model, field)
+    if columns is None:
+        return None
+    for column in columns:
+        column.lookup = f"{model_field.name}__{column.lookup}"
+    return ForeignKeyPart(field.field_name, model_field.attname, columns)
+
+
+def _build_many_to_many_part(
+    model_field: models.ManyToManyField,
+    field: serializers.Field,
+) -> Part | None:
+    if isinstance(field, relations.ManyRelatedField) and isinstance(
+        field.child_relation,
+        relations.PrimaryKeyRelatedField,
+    ):
+        return ManyToManyPart(field.field_name, model_field, None)
+    if not isinstance(field, serializers.ListSerializer) or not isinstance(
+        field.child,
+        serializers.ModelSerializer,
+    ):
+        return None
+    columns = _build_columns(model_field.related_model, field.child)
+    if columns is None:
+        return None
+    return ManyToManyPart(field.field_name, model_field, columns)
+
+
+def _build_part(model: Type[Model], field: serializers.Field) -> Part | None:
+    model_field = _get_model_field(model, field)
+    if model_field is None or isinstance(field, serializers.SerializerMethodField):
+        return None
+    if not model_field.is_relation:
+        return ColumnPart(field.field_name, model_field.attname, field)
+    if model_field.many_to_one:
+        return _build_foreign_key_part(model_field, field)
+    if isinstance(model_field, models.ManyToManyField):
+        return _build_many_to_many_part(model_field, field)
+    return None
+
+
+class ValuesPlan:
+    """Projection of serializer fields onto values() queries.
+
+    Produces the same data as the serializer without creating model instances.
+    """
+
+    def __init__(self, parts: list[Part]):
+        self.parts = parts
+        self.relations = [part for part in parts if isinstance(part, ManyToManyPart)]
+
+    @classmethod
+    def build(cls, serializer: serializers.ModelSerializer) -> "ValuesPlan | None":
+        """Returns plan of serializer if all its fields can be projected.
+
+        :param serializer: Model serializer.
+        :return: Plan or None.
+        """
+        model = serializer.Meta.model
+        parts = []
+        for field in _readable_fields(serializer):
+            part = _build_part(model, field)
+            if part is None:
+                return None
+            parts.append(part)
+        return cls(parts)
+
+    def values(self, queryset: QuerySet[Any]) -> QuerySet[Any]:
+        """Returns values() queryset with columns of plan.
+
+        :param queryset: Queryset of serializer's model.
+        :return: Values queryset.
+        """
+        lookups = dict.fromkeys(["pk"])
+        for part in self.parts:
+            lookups.update(dict.fromkeys(part.lookups))
+        return queryset.prefetch_related(None).values(*lookups)
+
+    def represent(self, rows: Iterable[Row]) -> list[dict[str, Any]]:
+        """Returns representation of rows equal to the serializer's one.
+
+        :param rows: Rows returned by values() query.
+        :return: List of represented objects.
+        """
+        rows = list(rows)
+        ids = [row["pk"] for row in rows]
+        related = {relation.name: relation.fetch(ids) for relation in self.relations}
+        return self._represent_rows(rows, related)
+
+    async def arepresent(self, rows: list[Row]) -> list[dict[str, Any]]:
+        """Async counterpart of `represent` fetching many relations with `aiterator`.
+
+        :param rows: Rows returned by values() query.
+        :return: List of represented objects.
+        """
+        ids = [row["pk"] for row in rows]
+        related = {
+            relation.name: await relation.afetch(ids) for relation in self.relations
+        }
+        return self._represent_rows(rows, related)
+
+    def _represent_rows(
+        self,
+        rows: list[Row],
+        related: dict[str, dict[Any, Any]],
+    ) -> list[dict[str, Any]]:
+        with measure_timing("serialize"):
+            return [
+                {part.name: part.represent(row, related) for part in self.parts}
+                for row in rows
+            ]
+
+
+class ValuesListMixin(Base):
+    """Serves `list` action from values() queries instead of model serializers.
+
+    Falls back to the default implementation if any serializer field cannot be
+    projected onto a values() query.
+    """
+
+    def get_values_plan(self) -> ValuesPlan | None:
+        """Returns values plan of current serializer.
+
+        :return: Plan or None if fast path can't be used.
+        """
+        if not settings.FAST_LIST["ENABLED"]:
+            return None
+        serializer = self.get_serializer()
+        if not isinstance(serializer, serializers.ModelSerializer):
+            return None
+        return ValuesPlan.build(serializer)
+
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """Returns list of objects represented from values() rows.
+
+        :param request: Current request.
+        :param args: Args.
+        :param kwargs: Kwargs.
+        :return: Response with list of objects.
+        """
+        plan = self.get_values_plan()
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = plan.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(plan.represent(page))
+        return Response(plan.represent(queryset))
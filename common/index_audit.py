@@ -0,0 +1,119 @@
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+from django.db import DatabaseError, connection
+
+from common.slow_queries import explain
+
+Query = tuple[str, Any]
+
+# Extra query parameters of list endpoints requested besides pagination.
+AUDITED_QUERY_PARAMS: dict[str, list[dict[str, str]]] = {
+    "question-list": [
+        {"order_by_date": "desc"},
+        {"order_by_date": "asc"},
+        {"order_by_views": "true"},
+        {"order_by_activity": "desc"},
+        {"order_by_comments": "true"},
+        {"order_by_hot": "true"},
+        {"unanswered": "true"},
+    ],
+}
+
+
+@contextmanager
+def capture_queries() -> Iterator[list[Query]]:
+    """Collects SQL and parameters of queries executed in block.
+
+    :yield: List filled with queries.
+    """
+    queries: list[Query] = []
+
+    def record(
+        execute: Callable[..., Any],
+        sql: str,
+        params: Any,
+        many: bool,
+        context: dict[str, Any],
+    ) -> Any:
+        if not many:
+            queries.append((sql, params))
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(record):
+        yield queries
+
+
+class PlanAuditor:
+    """Finds full table scans and sorts without index in query plans.
+
+    Tables with less than `min_rows` rows are ignored, databases scan them
+    regardless of indexes.
+    """
+
+    def __init__(self, min_rows: int):
+        self.min_rows = min_rows
+        self.row_counts: dict[str, int | None] = {}
+
+    def audit(self, sql: str, params: Any) -> list[str]:
+        """Returns problems of query plan.
+
+        :param sql: SQL of query.
+        :param params: Parameters of query.
+        :return: Descriptions of problems.
+        """
+        plan = explain(connection, sql, params)
+        if plan is None:
+            return []
+        if connection.vendor == "postgresql":
+            problems = self._audit_postgres(plan[0][0][0]["Plan"])
+        else:
+            problems = self._audit_sqlite(plan, sql)
+        return list(dict.fromkeys(problems))
+
+    def _audit_postgres(
+        self,
+        node: dict[str, Any],
+        parent: dict[str, Any] | None = None,
+    ) -> Iterator[str]:
+        node_type = node["Node Type"]
+        if node_type == "Seq Scan" and self._is_big(node["Relation Name"]):
+            if "Filter" in node:
+                yield f"sequential scan of {node['Relation Name']} with filter"
+            elif parent is not None and parent["Node Type"] == "Sort":
+                yield f"sequential scan and sort of {node['Relation Name']}"
+        for child in node.get("Plans", ()):
+            yield from self._audit_postgres(child, node)
+
+    def _audit_sqlite(self, plan: list[list[Any]], sql: str) -> Iterator[str]:
+        scanned = []
+        for *_, detail in plan:
+            words = detail.split()
+            is_scan = words[0] == "SCAN" and "USING" not in words
+            if is_scan and self._is_big(words[1]):
+                scanned.append(words[1])
+                # Scan without filter is just reading rows in primary key order.
+                if " WHERE " in sql:
+                    yield f"full scan of {words[1]}"
+            # Sorting rows found with an index is cheap.
+            elif detail.startswith("USE TEMP B-TREE FOR ORDER BY") and scanned:
+                yield f"sort of {scanned[0]} without index"
+
+    def _is_big(self, table: str) -> bool:
+        if table not in self.row_counts:
+            self.row_counts[table] = self._count_rows(table)
+        rows = self.row_counts[table]
+        return rows is None or rows >= self.min_rows
+
+    @staticmethod
+    def _count_rows(table: str) -> int | None:
+        try:
+            sql = (
+                f"SELECT COUNT(*) FROM {connection.ops.quote_name(table)}"  # noqa: S608
+            )
+            with connection.cursor() as cursor:
+                cursor.execute(sql)
+                return cursor.fetchone()[0]
+        except DatabaseError:
+            # Plan refers to the table by an alias.
+            return None
@@ -0,0 +1,118 @@
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from common.backfill import BackfillRunner, backfills
+from common.models import BackfillCheckpoint
+
+
+class Command(BaseCommand):
+    """Fills new denormalized columns of existing rows."""
+
+    help = (
+        "Runs registered backfill in batches of primary key ranges, each in its "
+        "own short transaction, saving progress to resume after interruption, "
+        "and checks a sample of rows against recomputed values."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Adds command arguments.
+
+        :param parser: Argument parser.
+        """
+        parser.add_argument(
+            "name",
+            nargs="?",
+            help="Name of backfill, omit to list backfills and their progress.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of rows updated in one transaction.",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0.1,
+            help="Seconds to wait after every batch to let other queries run.",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Continue unfinished run from its checkpoint.",
+        )
+        parser.add_argument(
+            "--verify",
+            type=int,
+            default=100,
+            help="Number of random rows checked after the run, 0 to skip.",
+        )
+        parser.add_argument(
+            "--verify-only",
+            action="store_true",
+            help="Only check random rows without filling anything.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Runs backfill and verifies its results.
+
+        :param args: Args.
+        :param options: Options.
+        :raises CommandError: if backfill does not exist or rows are outdated.
+        """
+        if options["name"] is None:
+            self._list()
+            return
+        backfill = backfills.get(options["name"])
+        if backfill is None:
+            raise CommandError(
+                f"Unknown backfill '{options['name']}', "
+                f"choose one of: {', '.join(sorted(backfills))}.",
+            )
+        if options["batch_size"] < 1:
+            raise CommandError("Batch size must be positive.")
+
+        started_at = time.monotonic()
+        runner = BackfillRunner(
+            backfill,
+            batch_size=options["batch_size"],
+            sleep=options["sleep"],
+            progress=lambda checkpoint: self._report(checkpoint, started_at),
+        )
+        if not options["verify_only"]:
+            runner.run(resume=options["resume"])
+            self.stderr.write(self.style.SUCCESS("Backfill finished."))
+        if options["verify"] or options["verify_only"]:
+            self._verify(runner, options["verify"] or 100)
+
+    def _verify(self, runner: BackfillRunner, size: int) -> None:
+        pks, mismatches = runner.verify(size)
+        if mismatches:
+            raise CommandError(
+                f"{len(mismatches)} of {len(pks)} sampled rows are outdated, "
+                f"e.g. pk {', '.join(map(str, mismatches[:10]))}.",
+            )
+        self.stderr.write(self.style.SUCCESS(f"{len(pks)} sampled rows match."))
+
+    def _list(self) -> None:
+        checkpoints = BackfillCheckpoint.objects.in_bulk(
+            backfills,
+            field_name="name",
+        )
+        for name in sorted(backfills):
+            checkpoint = checkpoints.get(name)
+            if checkpoint is None:
+                status = "never run"
+            elif checkpoint.completed_at is not None:
+                status = f"completed at {checkpoint.completed_at:%Y-%m-%d %H:%M}"
+            else:
+                status = f"stopped after pk {checkpoint.last_pk}"
+            self.stdout.write(f"{name}: {status}")
+
+    def _report(self, checkpoint: BackfillCheckpoint, started_at: float) -> None:
+        elapsed = time.monotonic() - started_at
+        self.stderr.write(
+            f"{checkpoint.rows} rows up to pk {checkpoint.last_pk}, {elapsed:.1f}s",
+        )
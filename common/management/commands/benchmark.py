@@ -0,0 +1,186 @@
+import json
+import logging
+import platform
+import subprocess
+import sys
+from typing import Any
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection
+from django.test import Client, override_settings
+from django.utils import timezone
+
+from authentication.models import User
+from common.benchmark import (
+    NO_CACHE_SETTINGS,
+    compare,
+    discover_endpoints,
+    get_auth_headers,
+    measure,
+)
+from forum.models import Comment, Question, Tag
+from news.models import Article
+
+COUNTED_MODELS = (User, Tag, Question, Comment, Article)
+
+
+class Command(BaseCommand):
+    """Benchmarks GET endpoints of the REST API."""
+
+    help = (
+        "Requests every GET route of api/*/urls.py with the test client and "
+        "reports latency percentiles, queries per request and response size "
+        "as JSON."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Adds command arguments.
+
+        :param parser: Argument parser.
+        """
+        parser.add_argument("--requests", type=int, default=50)
+        parser.add_argument("--warmup", type=int, default=5)
+        parser.add_argument(
+            "--user",
+            help="Username of user to authenticate requests with.",
+        )
+        parser.add_argument(
+            "--no-cache",
+            action="store_true",
+            help="Disable response cache, snapshots and request coalescing.",
+        )
+        parser.add_argument(
+            "--unpaginated",
+            action="store_true",
+            help="Benchmark list endpoints without pagination too.",
+        )
+        parser.add_argument(
+            "--filter",
+            default="",
+            help="Benchmark only endpoints which key contains this string.",
+        )
+        parser.add_argument(
+            "--output",
+            "-o",
+            default="-",
+            help="File to write JSON results to, '-' for stdout.",
+        )
+        parser.add_argument(
+            "--compare",
+            help="File with results of previous run to compare with.",
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=1.2,
+            help="Ratio of p95 latencies considered a regression.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Benchmarks endpoints and writes results.
+
+        :param args: Args.
+        :param options: Options.
+        :raises CommandError: if the user does not exist or there are regressions.
+        """
+        client = Client(HTTP_HOST=settings.ALLOWED_HOSTS[0])
+        headers = self._get_headers(options["user"])
+        endpoints = [
+            (key, path)
+            for key, path in discover_endpoints(unpaginated=options["unpaginated"])
+            if options["filter"] in key
+        ]
+
+        results = {}
+        # Client errors of endpoints requiring authentication are expected.
+        logging.getLogger("django.request").setLevel(logging.ERROR)
+        with override_settings(**(NO_CACHE_SETTINGS if options["no_cache"] else {})):
+            for key, path in endpoints:
+                results[key] = measure(
+                    client,
+                    path,
+                    options["requests"],
+                    options["warmup"],
+                    headers,
+                )
+                latency = results[key]["latency_ms"]
+                self.stderr.write(
+                    f"{key}: p50 {latency['p50']:.2f} ms, p95 {latency['p95']:.2f} "
+                    f"ms, {results[key]['queries']['max']} queries, "
+                    f"{results[key]['bytes']} bytes",
+                )
+
+        report = {"meta": self._get_meta(options), "results": results}
+        content = json.dumps(report, indent=2)
+        if options["output"] == "-":
+            self.stdout.write(content)
+        else:
+            with open(options["output"], "w") as output:
+                output.write(content)
+
+        if options["compare"]:
+            self._compare(options["compare"], results, options["threshold"])
+
+    @staticmethod
+    def _get_headers(username: str | None) -> dict[str, str]:
+        if not username:
+            return {}
+        user = User.objects.filter(username=username).first()
+        if user is None:
+            raise CommandError(f"User '{username}' does not exist.")
+        return get_auth_headers(user)
+
+    @staticmethod
+    def _get_meta(options: dict[str, Any]) -> dict[str, Any]:
+        try:
+            commit = subprocess.run(
+                ["git", "rev-parse", "HEAD"],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = None
+        return {
+            "commit": commit,
+            "created_at": timezone.now().isoformat(),
+            "python": sys.version.split()[0],
+            "django": django.get_version(),
+            "platform": platform.platform(),
+            "database": connection.vendor,
+            "rows": {
+                model._meta.label_lower: model.objects.count()
+                for model in COUNTED_MODELS
+            },
+            "options": {
+                name: options[name]
+                for name in (
+                    "requests",
+                    "warmup",
+                    "user",
+                    "no_cache",
+                    "unpaginated",
+                    "filter",
+                )
+            },
+        }
+
+    def _compare(
+        self,
+        baseline_path: str,
+        results: dict[str, Any],
+        threshold: float,
+    ) -> None:
+        with open(baseline_path) as baseline_file:
+            baseline = json.load(baseline_file)["results"]
+        regressions = 0
+        for key, description, is_regression in compare(baseline, results, threshold):
+            if is_regression:
+                regressions += 1
+                self.stderr.write(self.style.ERROR(f"REGRESSION {key}: {description}"))
+            else:
+                self.stderr.write(f"{key}: {description}")
+        if regressions:
+            raise CommandError(f"{regressions} endpoints regressed.")
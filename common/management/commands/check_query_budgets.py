@@ -0,0 +1,78 @@
+from typing import Any
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.test import Client, override_settings
+from django.test.runner import DiscoverRunner
+
+from common.benchmark import NO_CACHE_SETTINGS, count_endpoint_queries, seed_budget_data
+from common.budgets import breaks_query_budget, get_path_query_budget
+
+
+class Command(BaseCommand):
+    """Checks query budgets of API endpoints."""
+
+    help = (
+        "Seeds a test database at several sizes, requests every GET endpoint as "
+        "an admin and fails if any endpoint exceeds its query budget or makes "
+        "more queries on bigger data."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Adds command arguments.
+
+        :param parser: Argument parser.
+        """
+        parser.add_argument(
+            "--sizes",
+            nargs="+",
+            type=int,
+            default=[30, 300],
+            help="Numbers of seeded questions, from smaller to bigger.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Measures queries of endpoints in a test database.
+
+        :param args: Args.
+        :param options: Options.
+        :raises CommandError: if any endpoint breaks its budget.
+        """
+        runner = DiscoverRunner(verbosity=0, interactive=False)
+        runner.setup_test_environment()
+        old_config = runner.setup_databases()
+        try:
+            # Exports make one query per chunk by design, keep them in one chunk.
+            with override_settings(**NO_CACHE_SETTINGS, STREAMING_CHUNK_SIZE=10**6):
+                counts = [self._count_queries(size) for size in options["sizes"]]
+        finally:
+            runner.teardown_databases(old_config)
+            runner.teardown_test_environment()
+
+        failures = 0
+        for key, path in counts[-1]["paths"].items():
+            sizes = [size_counts["queries"].get(key) for size_counts in counts]
+            failures += self._check(key, path, sizes)
+        if failures:
+            raise CommandError(f"{failures} endpoints broke their query budgets.")
+
+    def _count_queries(self, size: int) -> dict[str, dict[str, Any]]:
+        call_command("flush", interactive=False, verbosity=0)
+        seed_budget_data(size)
+
+        counts: dict[str, dict[str, Any]] = {"queries": {}, "paths": {}}
+        for key, (path, queries) in count_endpoint_queries(Client()).items():
+            counts["queries"][key] = queries
+            counts["paths"][key] = path
+        return counts
+
+    def _check(self, key: str, path: str, sizes: list[int | None]) -> int:
+        budget = get_path_query_budget(path)
+        counts = " -> ".join(str(count) for count in sizes)
+        message = f"{key}: {counts} queries, budget {budget}"
+
+        if breaks_query_budget(budget, sizes):
+            self.stdout.write(self.style.ERROR(f"FAIL {message}"))
+            return 1
+        self.stdout.write(f"OK {message}")
+        return 0
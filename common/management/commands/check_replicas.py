@@ -0,0 +1,118 @@
+from contextlib import ExitStack
+from typing import Any, Callable
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import Client, override_settings
+from django.test.runner import DiscoverRunner
+from django.urls import reverse
+
+from authentication.models import User
+from common.benchmark import NO_CACHE_SETTINGS, get_auth_headers, read_content
+from common.replicas import get_replica_aliases, is_replica
+from common.seeding import Seeder
+from forum.models import Question
+
+
+class Command(BaseCommand):
+    """Checks that requests read from replicas or the default database."""
+
+    help = (
+        "Seeds a test database, makes reads, a write and reads after the write "
+        "with the test client and fails if any of them is served by the wrong "
+        "database. Requires DATABASE_REPLICA_URLS, e.g. "
+        "DATABASE_URL=sqlite:///db.sqlite3 "
+        "DATABASE_REPLICA_URLS=sqlite:///replica.sqlite3. Replicas mirror the "
+        "default test database."
+    )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Runs scenario in a test database.
+
+        :param args: Args.
+        :param options: Options.
+        :raises CommandError: if there are no replicas or routing is wrong.
+        """
+        if not get_replica_aliases():
+            raise CommandError("No replicas, set DATABASE_REPLICA_URLS.")
+
+        runner = DiscoverRunner(verbosity=0, interactive=False)
+        runner.setup_test_environment()
+        old_config = runner.setup_databases()
+        try:
+            with override_settings(**NO_CACHE_SETTINGS):
+                failures = self._run_scenario()
+        finally:
+            runner.teardown_databases(old_config)
+            runner.teardown_test_environment()
+        if failures:
+            raise CommandError(f"{failures} requests were routed wrong.")
+
+    def _run_scenario(self) -> int:
+        Seeder(
+            users=5,
+            tags=5,
+            questions=20,
+            comments_per_question=2,
+            articles=5,
+            likes_per_article=2,
+            seed=0,
+        ).seed(lambda name, created: None)
+        admin = User.objects.filter(role__title="Admin").order_by("pk").first()
+        headers = get_auth_headers(admin)
+        client = Client()
+        author_id = Question.objects.values_list("author_id", flat=True).first()
+        # Requests made one after another by the same client with the database
+        # expected to serve all their queries.
+        scenario = [
+            ("list", "get", reverse("question-list"), None, "replica"),
+            (
+                "streamed list",
+                "get",
+                reverse("question-by_user", kwargs={"user_id": author_id}),
+                None,
+                "replica",
+            ),
+            ("write", "post", reverse("tag-list"), {"title": "check"}, "default"),
+            ("read after write", "get", reverse("question-list"), None, "default"),
+        ]
+
+        failures = 0
+        for name, method, path, data, expected in scenario:
+            aliases: set[str] = set()
+            with self._record_aliases(aliases):
+                response = getattr(client, method)(path, data, **headers)
+                read_content(response)
+            failures += self._check(name, response.status_code, aliases, expected)
+        return failures
+
+    @staticmethod
+    def _record_aliases(aliases: set[str]) -> ExitStack:
+        stack = ExitStack()
+        for connection in connections.all():
+
+            def record(
+                execute: Callable[..., Any],
+                sql: str,
+                params: Any,
+                many: bool,
+                context: dict[str, Any],
+                alias: str = connection.alias,
+            ) -> Any:
+                aliases.add(alias)
+                return execute(sql, params, many, context)
+
+            stack.enter_context(connection.execute_wrapper(record))
+        return stack
+
+    def _check(self, name: str, status: int, aliases: set[str], expected: str) -> int:
+        if expected == "replica":
+            is_routed = bool(aliases) and all(is_replica(alias) for alias in aliases)
+        else:
+            is_routed = aliases == {DEFAULT_DB_ALIAS}
+        message = f"{name}: status {status}, queries on {', '.join(sorted(aliases))}"
+        if status >= 400 or not is_routed:
+            self.stdout.write(self.style.ERROR(f"FAIL {message}, expected {expected}"))
+            return 1
+        self.stdout.write(f"OK {message}")
+        return 0
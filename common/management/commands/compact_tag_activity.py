@@ -0,0 +1,42 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from forum.trending import compact_tag_activity, rebuild_tag_activity
+
+
+class Command(BaseCommand):
+    """Compacts buckets of tag activity used by trending tags."""
+
+    help = (
+        "Merges hourly buckets of tag activity older than hourly retention into "
+        "daily ones and deletes buckets older than the longest trending window. "
+        "Meant to be run periodically, e.g. hourly by cron."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Adds command arguments.
+
+        :param parser: Argument parser.
+        """
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Recount buckets from tags of recent questions before compacting.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Compacts buckets, rebuilding them first if requested.
+
+        :param args: Args.
+        :param options: Options.
+        """
+        if options["rebuild"]:
+            taggings = rebuild_tag_activity()
+            self.stdout.write(f"Counted {taggings} taggings.")
+        merged, expired = compact_tag_activity()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Merged {merged} hourly buckets, deleted {expired} expired ones.",
+            ),
+        )
@@ -0,0 +1,77 @@
+import sys
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+
+from common.ndjson import Exporter, render_ndjson
+from forum.exporters import export_comments, export_questions, export_tags
+from news.exporters import export_articles
+
+EXPORTERS: dict[str, Exporter] = {
+    "tags": export_tags,
+    "questions": export_questions,
+    "comments": export_comments,
+    "articles": export_articles,
+}
+
+
+class Command(BaseCommand):
+    """Exports forum and news data as newline delimited JSON."""
+
+    help = "Streams tags, questions, comments and articles as NDJSON."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Adds command arguments.
+
+        :param parser: Argument parser.
+        """
+        parser.add_argument(
+            "--output",
+            "-o",
+            default="-",
+            help="File to write records to, '-' for stdout.",
+        )
+        parser.add_argument(
+            "--only",
+            nargs="+",
+            choices=EXPORTERS,
+            default=list(EXPORTERS),
+            help="Types of records to export.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=settings.STREAMING_CHUNK_SIZE,
+            help="Number of rows fetched from database at once.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Writes records of requested types one per line.
+
+        Records are written in order of `EXPORTERS`, so tags come before
+        questions and questions before their comments.
+
+        :param args: Args.
+        :param options: Options.
+        """
+        output = (
+            sys.stdout.buffer
+            if options["output"] == "-"
+            else open(options["output"], "wb")
+        )
+        counts = dict.fromkeys(options["only"], 0)
+        try:
+            for name, exporter in EXPORTERS.items():
+                if name not in counts:
+                    continue
+                for line in render_ndjson(exporter(options["chunk_size"])):
+                    output.write(line)
+                    counts[name] += 1
+        finally:
+            output.flush()
+            if output is not sys.stdout.buffer:
+                output.close()
+
+        summary = ", ".join(f"{count} {name}" for name, count in counts.items())
+        self.stderr.write(f"Exported {summary}.")
@@ -0,0 +1,125 @@
+import sys
+import time
+from itertools import islice
+from pathlib import Path
+from typing import IO, Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from common.ndjson import parse_ndjson
+from common.streaming import iter_chunks
+from forum.importers import ForumImporter, reset_sequences
+from forum.related import rebuild_tag_cooccurrence
+from forum.trending import rebuild_tag_activity
+
+
+class Command(BaseCommand):
+    """Imports forum data from newline delimited JSON."""
+
+    help = (
+        "Bulk imports tags, questions and comments from NDJSON written by "
+        "export_forum. Every chunk of lines is imported in its own transaction."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Adds command arguments.
+
+        :param parser: Argument parser.
+        """
+        parser.add_argument("input", help="File to read records from, '-' for stdin.")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of lines imported in one transaction.",
+        )
+        parser.add_argument(
+            "--default-author",
+            help="Username of author of records whose author does not exist.",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help="File storing number of imported lines, defaults to "
+            "'<input>.checkpoint'. Required when reading from stdin to resume.",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Skip lines imported before according to checkpoint.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Imports records chunk by chunk, saving checkpoint after each one.
+
+        :param args: Args.
+        :param options: Options.
+        :raises CommandError: if a record can't be imported.
+        """
+        checkpoint = self._get_checkpoint_path(options)
+        done = self._read_checkpoint(checkpoint) if options["resume"] else 0
+        importer = ForumImporter(default_author=options["default_author"])
+        chunk_size: int = options["chunk_size"]
+
+        started_at = time.monotonic()
+        with self._open(options["input"]) as stream:
+            lines = islice(stream, done, None)
+            for chunk in iter_chunks(lines, chunk_size):
+                try:
+                    importer.import_records(list(parse_ndjson(chunk, start=done + 1)))
+                except ValueError as exc:
+                    raise CommandError(
+                        f"{exc} Lines before {done + 1} are imported, "
+                        "fix the input and run again with --resume.",
+                    ) from exc
+                done += len(chunk)
+                if checkpoint:
+                    checkpoint.write_text(str(done))
+                self._report(importer, done, started_at)
+
+        reset_sequences()
+        # Bulk inserts send no signals counting activity and pairs of tags.
+        rebuild_tag_activity()
+        rebuild_tag_cooccurrence()
+        if checkpoint:
+            checkpoint.unlink(missing_ok=True)
+        self.stderr.write(self.style.SUCCESS("Import finished."))
+
+    @staticmethod
+    def _get_checkpoint_path(options: dict[str, Any]) -> Path | None:
+        if options["checkpoint"]:
+            return Path(options["checkpoint"])
+        if options["input"] == "-":
+            return None
+        return Path(f"{options['input']}.checkpoint")
+
+    @staticmethod
+    def _read_checkpoint(checkpoint: Path | None) -> int:
+        if checkpoint is None or not checkpoint.exists():
+            return 0
+        return int(checkpoint.read_text())
+
+    @staticmethod
+    def _open(path: str) -> IO[bytes]:
+        if path == "-":
+            return sys.stdin.buffer
+        try:
+            return open(path, "rb")
+        except OSError as exc:
+            raise CommandError(exc) from exc
+
+    def _report(
+        self,
+        importer: ForumImporter,
+        lines: int,
+        started_at: float,
+    ) -> None:
+        elapsed = time.monotonic() - started_at
+        counts = ", ".join(
+            f"{importer.counts[name]} {name}"
+            for name in ("tags", "questions", "comments", "skipped")
+        )
+        message = (
+            f"{lines} lines: {counts} in {elapsed:.1f}s "
+            f"({importer.counts.total() / max(elapsed, 1e-6):.0f} records/s)"
+        )
+        self.stderr.write(message)
@@ -0,0 +1,123 @@
+import logging
+from typing import Any
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from authentication.models import User
+from common.benchmark import (
+    NO_CACHE_SETTINGS,
+    PAGE_QUERY,
+    discover_endpoints,
+    get_auth_headers,
+    read_content,
+)
+from common.budgets import get_sql_shape
+from common.index_audit import AUDITED_QUERY_PARAMS, PlanAuditor, Query, capture_queries
+
+
+class Command(BaseCommand):
+    """Reports query plans of API endpoints which don't use indexes."""
+
+    help = (
+        "Requests every GET endpoint with the test client, runs EXPLAIN for "
+        "each distinct query and reports full table scans and sorts which "
+        "could use an index. Run it against a database with realistic data, "
+        "e.g. one filled by the seed command."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Adds command arguments.
+
+        :param parser: Argument parser.
+        """
+        parser.add_argument(
+            "--user",
+            help="Username of user to authenticate requests with, defaults to "
+            "the first admin.",
+        )
+        parser.add_argument(
+            "--min-rows",
+            type=int,
+            default=1000,
+            help="Ignore scans of tables with less rows.",
+        )
+        parser.add_argument(
+            "--fail",
+            action="store_true",
+            help="Exit with error if any problem is found.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Replays queries of endpoints and audits their plans.
+
+        :param args: Args.
+        :param options: Options.
+        :raises CommandError: if the user does not exist or, with --fail,
+         if problems are found.
+        """
+        client = Client(HTTP_HOST=settings.ALLOWED_HOSTS[0])
+        headers = get_auth_headers(self._get_user(options["user"]))
+        auditor = PlanAuditor(min_rows=options["min_rows"])
+        audited: dict[str, list[str]] = {}
+
+        # Client errors of endpoints requiring authentication are expected.
+        logging.getLogger("django.request").setLevel(logging.ERROR)
+        with override_settings(**NO_CACHE_SETTINGS):
+            for key, path in self._get_endpoints():
+                with capture_queries() as queries:
+                    read_content(client.get(path, **headers))
+                self._audit_queries(auditor, audited, key, queries)
+
+        problematic = sum(bool(problems) for problems in audited.values())
+        if not problematic:
+            self.stderr.write(
+                self.style.SUCCESS(f"No problems found ({connection.vendor})."),
+            )
+        elif options["fail"]:
+            raise CommandError(f"{problematic} queries don't use indexes.")
+
+    @staticmethod
+    def _get_user(username: str | None) -> User:
+        users = User.objects.all()
+        if username:
+            user = users.filter(username=username).first()
+        else:
+            user = users.filter(role__title="Admin").order_by("pk").first()
+        if user is None:
+            raise CommandError("User does not exist.")
+        return user
+
+    @staticmethod
+    def _get_endpoints() -> list[tuple[str, str]]:
+        endpoints = discover_endpoints()
+        for name, params_list in AUDITED_QUERY_PARAMS.items():
+            for params in params_list:
+                query_string = urlencode({**PAGE_QUERY, **params})
+                endpoints.append(
+                    (f"{name}?{query_string}", f"{reverse(name)}?{query_string}"),
+                )
+        return endpoints
+
+    def _audit_queries(
+        self,
+        auditor: PlanAuditor,
+        audited: dict[str, list[str]],
+        key: str,
+        queries: list[Query],
+    ) -> None:
+        for sql, params in queries:
+            shape = get_sql_shape(sql)
+            if shape in audited:
+                continue
+            audited[shape] = auditor.audit(sql, params)
+            if audited[shape]:
+                self._report(key, shape, audited[shape])
+
+    def _report(self, key: str, shape: str, problems: list[str]) -> None:
+        self.stdout.write(self.style.WARNING(f"{key}: {', '.join(problems)}"))
+        self.stdout.write(f"    {shape}")
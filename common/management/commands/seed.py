@@ -0,0 +1,89 @@
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from common.seeding import Seeder
+
+
+class Command(BaseCommand):
+    """Generates synthetic data for benchmarking."""
+
+    help = (
+        "Bulk creates users, tags, questions with Zipf distributed tags and views, "
+        "comments, notifications, articles and their ratings."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Adds command arguments.
+
+        :param parser: Argument parser.
+        """
+        parser.add_argument("--questions", type=int, default=10000)
+        parser.add_argument(
+            "--users",
+            type=int,
+            help="Number of users, defaults to a tenth of questions.",
+        )
+        parser.add_argument("--tags", type=int, default=500)
+        parser.add_argument("--comments-per-question", type=float, default=3.0)
+        parser.add_argument("--articles", type=int, default=1000)
+        parser.add_argument("--likes-per-article", type=float, default=20.0)
+        parser.add_argument(
+            "--exponent",
+            type=float,
+            default=1.1,
+            help="Exponent of Zipf distribution of tags and authors.",
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=365,
+            help="Objects are created within this number of days before now.",
+        )
+        parser.add_argument(
+            "--password",
+            default="password",
+            help="Password of all created users.",
+        )
+        parser.add_argument("--seed", type=int, help="Seed of random generator.")
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Generates data and reports throughput after every batch.
+
+        :param args: Args.
+        :param options: Options.
+        :raises CommandError: if there would be no users to author objects.
+        """
+        users = options["users"] or max(options["questions"] // 10, 1)
+        if users < 1:
+            raise CommandError("At least one user must be created.")
+
+        seeder = Seeder(
+            users=users,
+            tags=options["tags"],
+            questions=options["questions"],
+            comments_per_question=options["comments_per_question"],
+            articles=options["articles"],
+            likes_per_article=options["likes_per_article"],
+            exponent=options["exponent"],
+            days=options["days"],
+            password=options["password"],
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+        )
+        started_at = time.monotonic()
+
+        def progress(name: str, created: int) -> None:
+            elapsed = time.monotonic() - started_at
+            total = seeder.counts[name]
+            self.stderr.write(f"{name}: {created}/{total} after {elapsed:.1f}s")
+
+        seeder.seed(progress)
+        self.stderr.write(
+            self.style.SUCCESS(
+                f"Seeded in {time.monotonic() - started_at:.1f}s, "
+                f"users share password '{options['password']}'.",
+            ),
+        )
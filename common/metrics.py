@@ -0,0 +1,302 @@
+import hmac
+import os
+import time
+from contextlib import nullcontext
+from typing import Any, Callable, ContextManager
+
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.db import connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.http import Http404, HttpRequest, HttpResponse, HttpResponseBase
+
+from common.budgets import get_request_action
+from common.timing import Timings
+
+try:
+    import prometheus_client
+    from prometheus_client import multiprocess
+except ImportError:  # pragma: no cover
+    prometheus_client = None
+
+MULTIPROCESS_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 50, 100)
+
+
+class NoopMetric:
+    """Metric used when prometheus_client is not installed."""
+
+    def labels(self, *args: Any, **kwargs: Any) -> "NoopMetric":
+        """Returns itself.
+
+        :param args: Label values.
+        :param kwargs: Label values by names.
+        :return: The same metric.
+        """
+        return self
+
+    def inc(self, amount: float = 1) -> None:
+        """Does nothing.
+
+        :param amount: Amount.
+        """
+
+    def dec(self, amount: float = 1) -> None:
+        """Does nothing.
+
+        :param amount: Amount.
+        """
+
+    def observe(self, amount: float) -> None:
+        """Does nothing.
+
+        :param amount: Observed value.
+        """
+
+    def time(self) -> ContextManager[None]:
+        """Returns context manager that does nothing.
+
+        :return: Context manager.
+        """
+        return nullcontext()
+
+
+def _create_metric(kind: str, name: str, documentation: str, **kwargs: Any) -> Any:
+    if prometheus_client is None:
+        return NoopMetric()
+    return getattr(prometheus_client, kind)(name, documentation, **kwargs)
+
+
+HTTP_REQUESTS = _create_metric(
+    "Counter",
+    "http_requests",
+    "Number of handled HTTP requests.",
+    labelnames=("route", "action", "method", "status"),
+)
+HTTP_REQUEST_DURATION = _create_metric(
+    "Histogram",
+    "http_request_duration_seconds",
+    "Duration of HTTP requests, without streaming of response content.",
+    labelnames=("route", "action", "method"),
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_REQUEST_QUERIES = _create_metric(
+    "Histogram",
+    "http_request_db_queries",
+    "Number of database queries made by HTTP request.",
+    labelnames=("route", "action", "method"),
+    buckets=QUERY_COUNT_BUCKETS,
+)
+DB_QUERIES = _create_metric(
+    "Counter",
+    "db_queries",
+    "Number of executed database queries.",
+    labelnames=("alias",),
+)
+DB_QUERY_DURATION = _create_metric(
+    "Histogram",
+    "db_query_duration_seconds",
+    "Duration of database queries.",
+    labelnames=("alias",),
+    buckets=QUERY_LATENCY_BUCKETS,
+)
+DB_CONNECTIONS_OPENED = _create_metric(
+    "Counter",
+    "db_connections_opened",
+    "Number of opened database connections.",
+    labelnames=("alias",),
+)
+DB_CONNECTIONS_REUSED = _create_metric(
+    "Counter",
+    "db_connections_reused",
+    "Number of requests which started with an open database connection.",
+    labelnames=("alias",),
+)
+ASGI_THREADS_BUSY = _create_metric(
+    "Gauge",
+    "asgi_threads_busy",
+    "Number of threads running sync code of ASGI requests.",
+    multiprocess_mode="livesum",
+)
+ASGI_THREAD_WAIT = _create_metric(
+    "Histogram",
+    "asgi_thread_wait_seconds",
+    "Time ASGI requests waited for a free thread.",
+    buckets=QUERY_LATENCY_BUCKETS,
+)
+WEBSOCKET_CONNECTIONS = _create_metric(
+    "Gauge",
+    "websocket_connections",
+    "Number of open websocket connections.",
+    labelnames=("consumer",),
+    multiprocess_mode="livesum",
+)
+WEBSOCKET_MESSAGES = _create_metric(
+    "Counter",
+    "websocket_messages",
+    "Number of websocket messages received from and sent to clients.",
+    labelnames=("consumer", "direction"),
+)
+CHANNEL_LAYER_SEND_DURATION = _create_metric(
+    "Histogram",
+    "channel_layer_send_duration_seconds",
+    "Duration of channel layer calls.",
+    labelnames=("method",),
+    buckets=QUERY_LATENCY_BUCKETS,
+)
+CACHE_REQUESTS = _create_metric(
+    "Counter",
+    "cache_requests",
+    "Number of cache lookups by result, e.g. hit or miss.",
+    labelnames=("cache", "result"),
+)
+
+
+def is_enabled() -> bool:
+    """Returns whether metrics are collected.
+
+    :return: True if metrics are enabled and prometheus_client is installed.
+    """
+    return prometheus_client is not None and settings.METRICS["ENABLED"]
+
+
+def observe_request(
+    request: HttpRequest,
+    response: HttpResponseBase,
+    timings: Timings,
+) -> None:
+    """Records duration and number of queries of request.
+
+    :param request: Handled request.
+    :param response: Its response.
+    :param timings: Timings of request.
+    """
+    if not is_enabled():
+        return
+    match = getattr(request, "resolver_match", None)
+    route = match.view_name if match else "unresolved"
+    _, action = get_request_action(request)
+    labels = (route, action or "", request.method)
+    HTTP_REQUESTS.labels(*labels, response.status_code).inc()
+    HTTP_REQUEST_DURATION.labels(*labels).observe(timings.total)
+    HTTP_REQUEST_QUERIES.labels(*labels).observe(timings.queries)
+
+
+def record_cache_lookup(cache: str, result: str) -> None:
+    """Counts cache lookup.
+
+    :param cache: Name of cache.
+    :param result: Result of lookup, e.g. 'hit' or 'miss'.
+    """
+    if is_enabled():
+        CACHE_REQUESTS.labels(cache, result).inc()
+
+
+def record_query(
+    execute: Callable[..., Any],
+    sql: str,
+    params: Any,
+    many: bool,
+    context: dict[str, Any],
+) -> Any:
+    """Execute wrapper counting queries and their durations.
+
+    :param execute: Function executing query.
+    :param sql: SQL.
+    :param params: Parameters of query.
+    :param many: Whether it is executemany.
+    :param context: Context of execution.
+    :return: Result of execution.
+    """
+    started_at = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        alias = context["connection"].alias
+        DB_QUERIES.labels(alias).inc()
+        DB_QUERY_DURATION.labels(alias).observe(time.perf_counter() - started_at)
+
+
+def install_query_metrics(connection: BaseDatabaseWrapper, **kwargs: Any) -> None:
+    """Adds `record_query` wrapper to new database connection.
+
+    Connected to `connection_created` signal.
+
+    :param connection: Database connection.
+    :param kwargs: Signal kwargs.
+    """
+    if is_enabled() and record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, record_query)
+
+
+def count_opened_connection(connection: BaseDatabaseWrapper, **kwargs: Any) -> None:
+    """Counts new database connection.
+
+    Connected to `connection_created` signal.
+
+    :param connection: Database connection.
+    :param kwargs: Signal kwargs.
+    """
+    if is_enabled():
+        DB_CONNECTIONS_OPENED.labels(connection.alias).inc()
+
+
+def count_reused_connections(**kwargs: Any) -> None:
+    """Counts database connections kept open since previous request.
+
+    Connected to `request_started` signal after `close_old_connections`, so
+    connections which are too old or broken are closed at this point.
+
+    :param kwargs: Signal kwargs.
+    """
+    if not is_enabled():
+        return
+    for connection in connections.all(initialized_only=True):
+        if connection.connection is not None:
+            DB_CONNECTIONS_REUSED.labels(connection.alias).inc()
+
+
+def can_read_metrics(request: HttpRequest) -> bool:
+    """Returns whether request may read metrics.
+
+    Metrics are served to staff users, to `INTERNAL_IPS` and to requests
+    authorized with `METRICS["TOKEN"]` bearer token.
+
+    :param request: Current request.
+    :return: True if access is allowed.
+    """
+    if request.META.get("REMOTE_ADDR") in settings.INTERNAL_IPS:
+        return True
+    if getattr(request, "user", None) is not None and request.user.is_staff:
+        return True
+    token = settings.METRICS["TOKEN"]
+    authorization = request.headers.get("Authorization", "")
+    return bool(token) and hmac.compare_digest(authorization, f"Bearer {token}")
+
+
+def metrics_view(request: HttpRequest) -> HttpResponse:
+    """Returns metrics in Prometheus text format.
+
+    When `PROMETHEUS_MULTIPROC_DIR` is set, metrics of all worker processes
+    are read from their files in that directory and aggregated.
+
+    :param request: Current request.
+    :return: Response with metrics.
+    :raises Http404: if metrics are disabled.
+    :raises PermissionDenied: if request may not read metrics.
+    """
+    if not is_enabled():
+        raise Http404
+    if not can_read_metrics(request):
+        raise PermissionDenied
+    registry = prometheus_client.REGISTRY
+    if os.environ.get(MULTIPROCESS_DIR_ENV):
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return HttpResponse(
+        prometheus_client.generate_latest(registry),
+        content_type=prometheus_client.CONTENT_TYPE_LATEST,
+    )
@@ -0,0 +1,265 @@
+import asyncio
+import json
+import logging
+from contextlib import ExitStack
+from typing import Any, Awaitable, Callable
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import HttpRequest, HttpResponseBase
+from rest_framework.permissions import SAFE_METHODS
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from common.budgets import get_query_budget, get_repeated_shapes, get_request_action
+from common.metrics import observe_request
+from common.replicas import (
+    achoose_replica,
+    bind_replica_usage,
+    choose_replica,
+    get_replica_aliases,
+    remember_write,
+    replica_alias,
+)
+from common.timing import Timings, current_timings
+
+logger = logging.getLogger(__name__)
+request_logger = logging.getLogger("common.requests")
+
+
+class QueryInspectionMiddleware:
+    """Logs SQL repeated within a request and exceeded query budgets.
+
+    Repeated queries of the same shape usually mean N+1 problem. Meant for
+    development, enabled with QUERY_INSPECTION setting. Queries made while
+    streaming response are not counted.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponseBase]):
+        if not settings.QUERY_INSPECTION["ENABLED"]:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        """Handles request recording its queries.
+
+        :param request: Current request.
+        :return: Response.
+        """
+        queries: list[str] = []
+
+        def record(execute: Callable[..., Any], sql: str, *args: Any) -> Any:
+            queries.append(sql)
+            return execute(sql, *args)
+
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(record))
+            response = self.get_response(request)
+
+        self._inspect(request, queries)
+        return response
+
+    @staticmethod
+    def _inspect(request: HttpRequest, queries: list[str]) -> None:
+        label = f"{request.method} {request.path}"
+        threshold: int = settings.QUERY_INSPECTION["REPEATED_THRESHOLD"]
+        for shape, count in get_repeated_shapes(queries, threshold):
+            logger.warning("%s executed %d times: %s", label, count, shape)
+
+        viewset, action = get_request_action(request)
+        budget = get_query_budget(viewset, action) if viewset else None
+        if budget is not None and len(queries) > budget:
+            logger.warning(
+                "%s made %d queries, budget of %s.%s is %d",
+                label,
+                len(queries),
+                viewset.__name__,
+                action,
+                budget,
+            )
+
+
+class RequestTimingMiddleware:
+    """Measures request handling phases.
+
+    Adds `Server-Timing` header with durations of authentication, database
+    queries, serialization, rendering and the whole request, and logs them as
+    JSON together with the name of the route. Works in sync and async mode.
+    Streaming content is produced after the response leaves middleware, so it
+    is not measured. Also records request metrics.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], Any]):
+        if not settings.REQUEST_TIMING["ENABLED"]:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            # Lets Django call this middleware without adapting it to sync.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(
+        self,
+        request: HttpRequest,
+    ) -> HttpResponseBase | Awaitable[HttpResponseBase]:
+        """Handles request measuring its phases.
+
+        :param request: Current request.
+        :return: Response or coroutine returning it in async mode.
+        """
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self._acall(request)
+
+        timings = Timings(request)
+        token = current_timings.set(timings)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_timings.reset(token)
+        return self._finish(request, response, timings)
+
+    async def _acall(self, request: HttpRequest) -> HttpResponseBase:
+        timings = Timings(request)
+        token = current_timings.set(timings)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_timings.reset(token)
+        return self._finish(request, response, timings)
+
+    @staticmethod
+    def _finish(
+        request: HttpRequest,
+        response: HttpResponseBase,
+        timings: Timings,
+    ) -> HttpResponseBase:
+        if settings.REQUEST_TIMING["SERVER_TIMING_HEADER"]:
+            response["Server-Timing"] = timings.get_server_timing()
+
+        match = getattr(request, "resolver_match", None)
+        record = {
+            "method": request.method,
+            "route": match.view_name if match else None,
+            "status": response.status_code,
+            "queries": timings.queries,
+            "timings_ms": timings.as_milliseconds(),
+        }
+        request_logger.info(json.dumps(record), extra={"request_timing": record})
+        observe_request(request, response, timings)
+        return response
+
+
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    """WhiteNoise middleware which can pass requests on in async mode.
+
+    WhiteNoise is sync only, so every async request would be switched to a
+    thread before reaching async views. Here only static files are served in
+    a thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], Any]):
+        super().__init__(get_response)
+        if asyncio.iscoroutinefunction(get_response):
+            # Lets Django call this middleware without adapting it to sync.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(
+        self,
+        request: HttpRequest,
+    ) -> HttpResponseBase | Awaitable[HttpResponseBase]:
+        """Serves static file or passes request on.
+
+        :param request: Current request.
+        :return: Response or coroutine returning it in async mode.
+        """
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self._acall(request)
+        return super().__call__(request)
+
+    async def _acall(self, request: HttpRequest) -> HttpResponseBase:
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
+
+
+class ReplicaMiddleware:
+    """Lets safe viewset requests read from a replica chosen per request.
+
+    Responses to successful writes set a cookie which keeps the client on the
+    default database for `REPLICA_ROUTING["STICKY_SECONDS"]`, so that it reads
+    its own writes. Token clients are also remembered in cache. Not used if
+    there are no replicas.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], Any]):
+        if not get_replica_aliases():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            # Lets Django call this middleware without adapting it to sync.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(
+        self,
+        request: HttpRequest,
+    ) -> HttpResponseBase | Awaitable[HttpResponseBase]:
+        """Handles request choosing database for its reads.
+
+        :param request: Current request.
+        :return: Response or coroutine returning it in async mode.
+        """
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self._acall(request)
+
+        alias = choose_replica(request)
+        token = replica_alias.set(alias)
+        try:
+            response = self.get_response(request)
+        finally:
+            replica_alias.reset(token)
+        return self._finish(request, response, alias)
+
+    async def _acall(self, request: HttpRequest) -> HttpResponseBase:
+        alias = await achoose_replica(request)
+        token = replica_alias.set(alias)
+        try:
+            response = await self.get_response(request)
+        finally:
+            replica_alias.reset(token)
+        return self._finish(request, response, alias)
+
+    @staticmethod
+    def _finish(
+        request: HttpRequest,
+        response: HttpResponseBase,
+        alias: str | None,
+    ) -> HttpResponseBase:
+        if response.streaming:
+            response.streaming_content = bind_replica_usage(
+                response.streaming_content,
+                alias,
+            )
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            remember_write(request)
+            response.set_cookie(
+                settings.REPLICA_ROUTING["STICKY_COOKIE"],
+                "1",
+                max_age=settings.REPLICA_ROUTING["STICKY_SECONDS"],
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
@@ -1,13 +1,17 @@
 from typing import TYPE_CHECKING, Any, Type
 
-from django.db.models import Model
-from rest_framework import status
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Model, QuerySet
+from django.db.models.options import Options
+from rest_framework import permissions, status
 from rest_framework.exceptions import ValidationError
 from rest_framework.request import Request
 from rest_framework.response import Response
-from rest_framework.serializers import Serializer
+from rest_framework.serializers import Field, Serializer
 from rest_framework.viewsets import ModelViewSet
 
+from common.serializers import get_sparse_fieldset
+
 Base = ModelViewSet if TYPE_CHECKING else object
 
 
@@ -127,3 +131,93 @@ class MultipleSerializersMixinSet(
 
     You need to provide the `serializer_action_classes` dictionary.
     """
+
+
+def _flatten_select_related(related: dict[str, Any], prefix: str = "") -> list[str]:
+    lookups = []
+    for name, nested in related.items():
+        lookups.append(f"{prefix}{name}")
+        lookups.extend(_flatten_select_related(nested, f"{prefix}{name}__"))
+    return lookups
+
+
+def _get_used_names(
+    opts: Options,
+    fields: dict[str, Field],
+) -> tuple[set[str], set[str]] | None:
+    columns = {opts.pk.name}
+    relations = set()
+    for field in fields.values():
+        name = field.source.split(".")[0]
+        try:
+            model_field = opts.get_field(name)
+        except FieldDoesNotExist:
+            return None
+        if not (model_field.many_to_many or model_field.one_to_many):
+            columns.add(name)
+        relations.add(model_field.name)
+    return columns, relations
+
+
+def _prune_related(queryset: QuerySet[Any], relations: set[str]) -> QuerySet[Any]:
+    prefetch_lookups = [
+        lookup
+        for lookup in queryset._prefetch_related_lookups
+        if getattr(lookup, "prefetch_to", lookup).split("__")[0] in relations
+    ]
+    queryset = queryset.prefetch_related(None).prefetch_related(*prefetch_lookups)
+    if not isinstance(queryset.query.select_related, dict):
+        return queryset
+    select_lookups = [
+        lookup
+        for lookup in _flatten_select_related(queryset.query.select_related)
+        if lookup.split("__")[0] in relations
+    ]
+    queryset = queryset.select_related(None)
+    if select_lookups:
+        queryset = queryset.select_related(*select_lookups)
+    return queryset
+
+
+def prune_queryset(queryset: QuerySet[Any], fields: dict[str, Field]) -> QuerySet[Any]:
+    """Loads only columns and relations used by serializer fields.
+
+    If a field is not backed by a model field, queryset is returned unchanged.
+
+    :param queryset: Queryset.
+    :param fields: Serializer fields.
+    :return: Queryset deferring unused columns and skipping unused relations.
+    """
+    used = _get_used_names(queryset.model._meta, fields)
+    if used is None:
+        return queryset
+    columns, relations = used
+    return _prune_related(queryset, relations).only(*columns)
+
+
+class SparseFieldsetMixin(Base):
+    """Prunes queryset of safe requests to fields requested by `fields` and `exclude`.
+
+    Serializer must use `SparseFieldsetSerializerMixin`.
+    """
+
+    def filter_queryset(self, queryset: QuerySet[Any]) -> QuerySet[Any]:
+        """Returns filtered queryset loading only data of requested fields.
+
+        :param queryset: Queryset.
+        :return: Filtered and pruned queryset.
+        """
+        return self.prune_queryset(super().filter_queryset(queryset))
+
+    def prune_queryset(self, queryset: QuerySet[Any]) -> QuerySet[Any]:
+        """Prunes queryset to data of fields of current serializer.
+
+        :param queryset: Queryset.
+        :return: Pruned queryset if request is safe and sparse fieldset was
+         requested, otherwise - the same queryset.
+        """
+        if self.request.method not in permissions.SAFE_METHODS or (
+            get_sparse_fieldset(self.request) == (None, set())
+        ):
+            return queryset
+        return prune_queryset(queryset, self.get_serializer().fields)
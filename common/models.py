@@ -0,0 +1,19 @@
+from django.db import models
+from django.utils import timezone
+
+
+class BackfillCheckpoint(models.Model):
+    """Model for database table 'backfill_checkpoint'.
+
+    Stores progress of backfill run by `backfill` command.
+    """
+
+    name = models.CharField(max_length=64, unique=True)
+    last_pk = models.BigIntegerField(default=0)
+    rows = models.PositiveBigIntegerField(default=0)
+    started_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self) -> str:
+        return self.name
@@ -0,0 +1,152 @@
+import json
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, Type
+
+from django.conf import settings
+from django.db.models import Model, QuerySet
+from django.http import StreamingHttpResponse
+from rest_framework import permissions
+from rest_framework.decorators import action
+from rest_framework.request import Request
+from rest_framework.viewsets import ModelViewSet
+
+from common.renderers import FastJSONRenderer, NDJSONRenderer, orjson
+from common.streaming import iter_chunks
+
+Base = ModelViewSet if TYPE_CHECKING else object
+
+Record = dict[str, Any]
+Exporter = Callable[[int], Iterator[Record]]
+
+
+def fetch_field(model: Type[Model], ids: Iterable[Any], field: str) -> dict[Any, Any]:
+    """Returns values of field of objects by their ids.
+
+    :param model: Model of objects.
+    :param ids: IDs of objects.
+    :param field: Name of field.
+    :return: Dict of object ids and field values.
+    """
+    return dict(model.objects.filter(pk__in=set(ids)).values_list("pk", field))
+
+
+def fetch_related(
+    through: Type[Model],
+    source: str,
+    lookup: str,
+    ids: list[Any],
+) -> dict[Any, list[Any]]:
+    """Returns values of many-to-many related objects grouped by source object.
+
+    :param through: Through model of many-to-many relation.
+    :param source: Name of through model's field pointing to source objects.
+    :param lookup: Lookup of related objects' value, e.g. 'tag__title'.
+    :param ids: IDs of source objects.
+    :return: Dict of source ids and lists of related values.
+    """
+    grouped: dict[Any, list[Any]] = {}
+    rows = (
+        through.objects.filter(**{f"{source}__in": ids})
+        .order_by("pk")
+        .values_list(f"{source}_id", lookup)
+    )
+    for source_id, value in rows:
+        grouped.setdefault(source_id, []).append(value)
+    return grouped
+
+
+def iter_row_chunks(queryset: QuerySet[Any], chunk_size: int) -> Iterator[list[Record]]:
+    """Reads values() queryset with `iterator` and splits its rows into chunks.
+
+    Only one chunk of rows is kept in memory.
+
+    :param queryset: Values queryset.
+    :param chunk_size: Number of rows fetched from database at once.
+    :yield: Lists of rows.
+    """
+    yield from iter_chunks(queryset.iterator(chunk_size=chunk_size), chunk_size)
+
+
+def render_ndjson(records: Iterable[Record]) -> Iterator[bytes]:
+    """Renders records as lines of newline delimited JSON.
+
+    :param records: Records.
+    :yield: Rendered lines.
+    """
+    renderer = NDJSONRenderer()
+    for record in records:
+        yield renderer.render(record)
+
+
+def parse_ndjson(lines: Iterable[bytes], start: int = 1) -> Iterator[Record]:
+    """Parses lines of newline delimited JSON, skipping blank ones.
+
+    :param lines: Lines of UTF-8 encoded JSON.
+    :param start: Number of the first line used in error messages.
+    :yield: Parsed records.
+    :raises ValueError: if line is not a valid JSON object.
+    """
+    loads = orjson.loads if orjson else json.loads
+    for number, line in enumerate(lines, start=start):
+        if not line.strip():
+            continue
+        try:
+            record = loads(line)
+        except ValueError as exc:
+            raise ValueError(f"Line {number} is not valid JSON: {exc}") from exc
+        if not isinstance(record, dict):
+            raise ValueError(f"Line {number} is not a JSON object.")
+        yield record
+
+
+def get_ndjson_response(
+    *exporters: Exporter,
+    filename: str,
+    chunk_size: int | None = None,
+) -> StreamingHttpResponse:
+    """Returns response streaming records of exporters as NDJSON attachment.
+
+    :param exporters: Functions yielding records, called with chunk size.
+    :param filename: Name of attachment.
+    :param chunk_size: Number of rows fetched from database at once.
+    :return: Streaming response.
+    """
+    chunk_size = chunk_size or settings.STREAMING_CHUNK_SIZE
+
+    def records() -> Iterator[Record]:
+        for exporter in exporters:
+            yield from exporter(chunk_size)
+
+    response = StreamingHttpResponse(
+        render_ndjson(records()),
+        content_type=NDJSONRenderer.media_type,
+    )
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+class NDJSONExportMixin(Base):
+    """Adds admin-only `export` action streaming records of `exporters` as NDJSON."""
+
+    exporters: tuple[Exporter, ...] = ()
+    export_filename = "export.ndjson"
+
+    @action(
+        detail=False,
+        methods=["GET"],
+        url_path="export",
+        name="export",
+        url_name="export",
+        permission_classes=[permissions.IsAdminUser],
+        renderer_classes=[FastJSONRenderer, NDJSONRenderer],
+    )
+    def export(
+        self, request: Request, *args: Any, **kwargs: Any
+    ) -> StreamingHttpResponse:
+        """Streams all objects as newline delimited JSON.
+
+        :param request: Current request.
+        :param args: Args.
+        :param kwargs: Kwargs.
+        :return: Streaming response with NDJSON attachment.
+        """
+        return get_ndjson_response(*self.exporters, filename=self.export_filename)
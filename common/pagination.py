@@ -1,7 +1,10 @@
 from typing import Any
 
+from django.db.models import QuerySet
 from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.views import APIView
 
 
 class LimitSkipPagination(LimitOffsetPagination):
@@ -16,3 +19,26 @@ class LimitSkipPagination(LimitOffsetPagination):
         :return: Response with raw data.
         """
         return Response(data)
+
+    async def apaginate_queryset(
+        self,
+        queryset: QuerySet[Any],
+        request: Request,
+        view: APIView | None = None,
+    ) -> list[Any] | None:
+        """Async counterpart of `paginate_queryset` reading page with `aiterator`.
+
+        Objects are not counted, the count is not part of response.
+
+        :param queryset: Queryset.
+        :param request: Current request.
+        :param view: Current view.
+        :return: Objects of page or None if pagination was not requested.
+        """
+        self.request = request
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+        self.offset = self.get_offset(request)
+        page = queryset[self.offset : self.offset + self.limit]
+        return [obj async for obj in page.aiterator()]
@@ -0,0 +1,35 @@
+from typing import IO, Any, Mapping
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+from common.renderers import orjson
+
+
+class FastJSONParser(JSONParser):
+    """Parses UTF-8 JSON with orjson, falls back to stdlib json."""
+
+    def parse(
+        self,
+        stream: IO[bytes],
+        media_type: str | None = None,
+        parser_context: Mapping[str, Any] | None = None,
+    ) -> Any:
+        """Parses JSON request body.
+
+        :param stream: Request body stream.
+        :param media_type: Media type of request.
+        :param parser_context: Parser context.
+        :return: Parsed data.
+        :raises ParseError: if body is not valid JSON.
+        """
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace("-", "") != "utf8":
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
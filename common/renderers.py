@@ -0,0 +1,95 @@
+from typing import Any, Mapping
+
+from rest_framework.renderers import JSONRenderer
+
+from common.timing import measure_timing
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME if orjson else 0
+
+
+class FastJSONRenderer(JSONRenderer):
+    """Renders compact JSON with orjson, falls back to stdlib json.
+
+    Output is the same as the one of default JSONRenderer.
+    """
+
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: str | None = None,
+        renderer_context: Mapping[str, Any] | None = None,
+    ) -> bytes:
+        """Renders data into JSON.
+
+        :param data: Data to render.
+        :param accepted_media_type: Accepted media type.
+        :param renderer_context: Renderer context.
+        :return: JSON bytes.
+        """
+        with measure_timing("render"):
+            return self._render(data, accepted_media_type, renderer_context)
+
+    def _render(
+        self,
+        data: Any,
+        accepted_media_type: str | None,
+        renderer_context: Mapping[str, Any] | None,
+    ) -> bytes:
+        if not self._can_use_orjson(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b""
+
+        try:
+            rendered = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=ORJSON_OPTIONS,
+            )
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Keep output a strict javascript subset like default renderer does.
+        return rendered.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9",
+            b"\\u2029",
+        )
+
+    def _can_use_orjson(
+        self,
+        accepted_media_type: str | None,
+        renderer_context: Mapping[str, Any],
+    ) -> bool:
+        return (
+            orjson is not None
+            and self.compact
+            and not self.ensure_ascii
+            and self.get_indent(accepted_media_type, renderer_context) is None
+        )
+
+
+class NDJSONRenderer(FastJSONRenderer):
+    """Renders data as one line of newline delimited JSON."""
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: str | None = None,
+        renderer_context: Mapping[str, Any] | None = None,
+    ) -> bytes:
+        """Renders data into JSON line.
+
+        :param data: Data to render.
+        :param accepted_media_type: Accepted media type.
+        :param renderer_context: Renderer context.
+        :return: JSON bytes ending with newline.
+        """
+        rendered = super().render(data, accepted_media_type, renderer_context)
+        return rendered + b"\n" if rendered else rendered
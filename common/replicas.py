@@ -0,0 +1,196 @@
+import hashlib
+import random
+from contextvars import ContextVar
+from typing import Any, Iterable, Iterator, Type
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Model
+from django.http import HttpRequest
+from django.urls import Resolver404, resolve
+
+from common.versions import get_cache
+
+# Replicas are configured in settings with aliases 'replica_0', 'replica_1'...
+REPLICA_ALIAS_PREFIX = "replica_"
+READ_METHODS = frozenset({"GET", "HEAD"})
+RECENT_WRITE_KEY_PREFIX = "replicas:write:"
+
+# Replica serving reads of current context, None for the default database.
+replica_alias: ContextVar[str | None] = ContextVar("replica_alias", default=None)
+
+
+def get_replica_aliases() -> list[str]:
+    """Returns aliases of configured replicas.
+
+    :return: List of aliases, empty if there are no replicas.
+    """
+    return [alias for alias in settings.DATABASES if is_replica(alias)]
+
+
+def is_replica(alias: str) -> bool:
+    """Returns whether database is a replica.
+
+    :param alias: Database alias.
+    :return: True if alias is an alias of replica.
+    """
+    return alias.startswith(REPLICA_ALIAS_PREFIX)
+
+
+def is_replica_request(request: HttpRequest) -> bool:
+    """Returns whether reads of request may go to a replica.
+
+    Only GET and HEAD requests of viewsets from clients which haven't written
+    anything recently are served by replicas.
+
+    :param request: Current request.
+    :return: True if request may read from replica.
+    """
+    if (
+        request.method not in READ_METHODS
+        or settings.REPLICA_ROUTING["STICKY_COOKIE"] in request.COOKIES
+    ):
+        return False
+    try:
+        match = resolve(request.path_info)
+    except Resolver404:
+        return False
+    return bool(getattr(match.func, "actions", None))
+
+
+def get_recent_write_key(request: HttpRequest) -> str | None:
+    """Returns cache key marking recent writes of token client of request.
+
+    Token clients are told apart by their Authorization header, which they send
+    cross-origin unlike cookies.
+
+    :param request: Current request.
+    :return: Cache key or None if request has no Authorization header.
+    """
+    authorization: str | None = request.META.get("HTTP_AUTHORIZATION")
+    if not authorization:
+        return None
+    digest = hashlib.sha256(authorization.encode()).hexdigest()
+    return f"{RECENT_WRITE_KEY_PREFIX}{digest}"
+
+
+def remember_write(request: HttpRequest) -> None:
+    """Keeps token client of request on the default database for a while.
+
+    :param request: Request which has written something.
+    """
+    key = get_recent_write_key(request)
+    if key is not None:
+        get_cache().set(key, 1, timeout=settings.REPLICA_ROUTING["STICKY_SECONDS"])
+
+
+def has_recent_write(request: HttpRequest) -> bool:
+    """Returns whether token client of request has written something recently.
+
+    :param request: Current request.
+    :return: True if client must read from the default database.
+    """
+    key = get_recent_write_key(request)
+    return key is not None and get_cache().get(key) is not None
+
+
+async def ahas_recent_write(request: HttpRequest) -> bool:
+    """Async counterpart of `has_recent_write`.
+
+    :param request: Current request.
+    :return: True if client must read from the default database.
+    """
+    key = get_recent_write_key(request)
+    return key is not None and await get_cache().aget(key) is not None
+
+
+def choose_replica(request: HttpRequest) -> str | None:
+    """Returns random replica serving all reads of request.
+
+    Reads of a request go to one replica, so they see the same state of data.
+
+    :param request: Current request.
+    :return: Alias of replica or None if request reads from default database.
+    """
+    replicas = get_replica_aliases()
+    if not replicas or not is_replica_request(request) or has_recent_write(request):
+        return None
+    return random.choice(replicas)  # noqa: S311
+
+
+async def achoose_replica(request: HttpRequest) -> str | None:
+    """Async counterpart of `choose_replica`.
+
+    :param request: Current request.
+    :return: Alias of replica or None if request reads from default database.
+    """
+    replicas = get_replica_aliases()
+    if (
+        not replicas
+        or not is_replica_request(request)
+        or await ahas_recent_write(request)
+    ):
+        return None
+    return random.choice(replicas)  # noqa: S311
+
+
+def bind_replica_usage(iterator: Iterable[Any], alias: str | None) -> Iterator[Any]:
+    """Makes reads of iterator use the same database as reads of request.
+
+    Content of streaming responses is produced after middleware is left.
+
+    :param iterator: Streaming content.
+    :param alias: Replica chosen for request or None for default database.
+    :yield: Items of iterator.
+    """
+    iterator = iter(iterator)
+    while True:
+        token = replica_alias.set(alias)
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            replica_alias.reset(token)
+        yield item
+
+
+class ReplicaRouter:
+    """Routes reads of safe viewset requests to the replica chosen for request.
+
+    `ReplicaMiddleware` decides which requests use which replica. Once anything
+    is written, the rest of the request reads from the default database.
+    Without replicas everything goes to the default database.
+    """
+
+    def db_for_read(self, model: Type[Model], **hints: Any) -> str | None:
+        """Returns database to read model from.
+
+        :param model: Model class.
+        :param hints: Hints.
+        :return: Alias of replica or None for default database.
+        """
+        return replica_alias.get()
+
+    def db_for_write(self, model: Type[Model], **hints: Any) -> str:
+        """Returns default database and stops reading from replicas.
+
+        :param model: Model class.
+        :param hints: Hints.
+        :return: Default database alias.
+        """
+        replica_alias.set(None)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1: Model, obj2: Model, **hints: Any) -> bool | None:
+        """Allows relations between objects of default database and replicas.
+
+        :param obj1: Object.
+        :param obj2: Related object.
+        :param hints: Hints.
+        :return: True if both objects come from the same data, None otherwise.
+        """
+        aliases = {DEFAULT_DB_ALIAS, *get_replica_aliases()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
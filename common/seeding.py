@@ -0,0 +1,266 @@
+import random
+import secrets
+from datetime import datetime, timedelta
+from itertools import accumulate
+from typing import Callable, Iterator
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from authentication.models import Notification, Role, User
+from common.versions import bump_model_version
+from forum.activity import refresh_question_activity
+from forum.duplicates import index_questions
+from forum.models import Comment, Question, Tag
+from forum.related import rebuild_tag_cooccurrence
+from forum.trending import record_tag_activity
+from news.models import Article
+
+QuestionTag = Question.tags.through
+ArticleLike = Article.likes.through
+ArticleDislike = Article.dislikes.through
+
+SEEDED_MODELS = (User, Tag, Question, Comment, Notification, Article)
+
+
+WORDS = (
+    "python django query index cache server request response database model "
+    "view serializer thread async worker memory latency throughput tag answer "
+    "question comment user error deploy docker redis postgres migration field "
+    "token auth router signal page list detail filter order count join table"
+).split()
+
+
+class ZipfSampler:
+    """Samples ranks 0..n-1 with probability proportional to 1 / (rank + 1) ** s."""
+
+    def __init__(self, size: int, exponent: float, rng: random.Random):
+        self.population = range(size)
+        self.cum_weights = list(
+            accumulate(1 / rank**exponent for rank in range(1, size + 1)),
+        )
+        self.rng = rng
+
+    def sample(self, count: int = 1) -> list[int]:
+        """Returns sampled ranks, possibly repeated.
+
+        :param count: Number of samples.
+        :return: List of ranks.
+        """
+        return self.rng.choices(self.population, cum_weights=self.cum_weights, k=count)
+
+
+class Seeder:
+    """Generates synthetic users, forum and news data with bulk inserts.
+
+    Tag popularity and authors' activity follow Zipf's law and question views
+    follow Pareto distribution, so the data is skewed like real forum's one.
+    All users share one precomputed password hash.
+    """
+
+    def __init__(
+        self,
+        *,
+        users: int,
+        tags: int,
+        questions: int,
+        comments_per_question: float,
+        articles: int,
+        likes_per_article: float,
+        exponent: float = 1.1,
+        days: int = 365,
+        password: str = "password",
+        seed: int | None = None,
+        batch_size: int = 5000,
+    ):
+        self.counts = {
+            "users": users,
+            "tags": tags,
+            "questions": questions,
+            "articles": articles,
+        }
+        self.comments_per_question = comments_per_question
+        self.likes_per_article = likes_per_article
+        self.exponent = exponent
+        self.days = days
+        self.password = password
+        self.batch_size = batch_size
+        self.rng = random.Random(seed)
+        self.run = secrets.token_hex(3)
+        self.now = timezone.now()
+        self.user_ids: list[int] = []
+        self.usernames: dict[int, str] = {}
+        self.tag_ids: list[int] = []
+        self.authors: ZipfSampler | None = None
+        self.tags: ZipfSampler | None = None
+
+    def seed(self, progress: Callable[[str, int], None]) -> None:
+        """Generates all data.
+
+        :param progress: Function called with name and number of created rows
+         after every batch.
+        """
+        self.seed_users(progress)
+        self.seed_tags()
+        self.seed_questions(progress)
+        self.seed_articles(progress)
+        for model in SEEDED_MODELS:
+            bump_model_version(model)
+
+    def seed_users(self, progress: Callable[[str, int], None]) -> None:
+        """Creates users, one of hundred is an admin.
+
+        :param progress: Progress callback.
+        """
+        admin_role, _ = Role.objects.get_or_create(title="Admin")
+        user_role, _ = Role.objects.get_or_create(title="User")
+        password = make_password(self.password)
+        for start, size in self._batches(self.counts["users"]):
+            users = User.objects.bulk_create(
+                User(
+                    username=f"seed_{self.run}_{number}",
+                    email=f"seed_{self.run}_{number}@example.com",
+                    password=password,
+                    date_created=self._random_date(),
+                    role=admin_role if number % 100 == 0 else user_role,
+                )
+                for number in range(start, start + size)
+            )
+            for user in users:
+                self.user_ids.append(user.pk)
+                self.usernames[user.pk] = user.username
+            progress("users", start + size)
+        self.authors = ZipfSampler(len(self.user_ids), self.exponent, self.rng)
+
+    def seed_tags(self) -> None:
+        """Creates tags, their order is the order of popularity."""
+        titles = [f"tag-{self.run}-{number}" for number in range(self.counts["tags"])]
+        Tag.objects.bulk_create(Tag(title=title) for title in titles)
+        tag_ids = dict(Tag.objects.filter(title__in=titles).values_list("title", "pk"))
+        self.tag_ids = [tag_ids[title] for title in titles]
+        self.tags = ZipfSampler(len(self.tag_ids), self.exponent, self.rng)
+
+    def seed_questions(self, progress: Callable[[str, int], None]) -> None:
+        """Creates questions with tags, comments and notifications of comments.
+
+        :param progress: Progress callback.
+        """
+        for start, size in self._batches(self.counts["questions"]):
+            with transaction.atomic():
+                questions = Question.objects.bulk_create(
+                    self._build_question(start + offset) for offset in range(size)
+                )
+                index_questions(questions)
+                question_tags = QuestionTag.objects.bulk_create(
+                    QuestionTag(question_id=question.pk, tag_id=tag_id)
+                    for question in questions
+                    for tag_id in self._sample_tags()
+                )
+                comments = Comment.objects.bulk_create(
+                    comment
+                    for question in questions
+                    for comment in self._build_comments(question)
+                )
+                Notification.objects.bulk_create(
+                    self._build_notification(comment)
+                    for comment in comments
+                    if comment.author_id != comment.question.author_id
+                )
+                refresh_question_activity(
+                    Question.objects.filter(
+                        pk__in=[question.pk for question in questions]
+                    ),
+                )
+                dates = {question.pk: question.date_created for question in questions}
+                record_tag_activity(
+                    (question_tag.tag_id, dates[question_tag.question_id])
+                    for question_tag in question_tags
+                )
+            progress("questions", start + size)
+        rebuild_tag_cooccurrence()
+
+    def seed_articles(self, progress: Callable[[str, int], None]) -> None:
+        """Creates articles with likes and dislikes.
+
+        :param progress: Progress callback.
+        """
+        for start, size in self._batches(self.counts["articles"]):
+            with transaction.atomic():
+                articles = Article.objects.bulk_create(
+                    Article(
+                        title=f"Article {number}",
+                        content=self._text(40),
+                        date_created=self._random_date(),
+                    )
+                    for number in range(start, start + size)
+                )
+                likes, dislikes = [], []
+                for article in articles:
+                    count = min(
+                        self._random_count(self.likes_per_article),
+                        len(self.user_ids),
+                    )
+                    for user_id in self.rng.sample(self.user_ids, count):
+                        rating = likes if self.rng.random() < 0.8 else dislikes
+                        rating.append((article.pk, user_id))
+                ArticleLike.objects.bulk_create(
+                    ArticleLike(article_id=article_id, user_id=user_id)
+                    for article_id, user_id in likes
+                )
+                ArticleDislike.objects.bulk_create(
+                    ArticleDislike(article_id=article_id, user_id=user_id)
+                    for article_id, user_id in dislikes
+                )
+            progress("articles", start + size)
+
+    def _batches(self, total: int) -> Iterator[tuple[int, int]]:
+        for start in range(0, total, self.batch_size):
+            yield start, min(self.batch_size, total - start)
+
+    def _build_question(self, number: int) -> Question:
+        return Question(
+            title=f"Question {number}: {self._text(6)}",
+            content=self._text(60),
+            date_created=self._random_date(),
+            views=int(self.rng.paretovariate(1.2) * 10) - 10,
+            author_id=self._sample_author(),
+        )
+
+    def _build_comments(self, question: Question) -> Iterator[Comment]:
+        count = self._random_count(self.comments_per_question)
+        answer = self.rng.randrange(count * 2) if count else -1
+        age = self.now - question.date_created
+        for number in range(count):
+            yield Comment(
+                content=self._text(20),
+                date_created=question.date_created + age * self.rng.random(),
+                is_answer=number == answer,
+                author_id=self._sample_author(),
+                question=question,
+            )
+
+    def _build_notification(self, comment: Comment) -> Notification:
+        username = self.usernames[comment.author_id]
+        question = comment.question
+        return Notification(
+            title=f'User {username} commented your question: "{question.title}".',
+            user_id=question.author_id,
+            question_id=question.pk,
+        )
+
+    def _random_count(self, mean: float) -> int:
+        return int(self.rng.expovariate(1 / mean)) if mean > 0 else 0
+
+    def _sample_author(self) -> int:
+        return self.user_ids[self.authors.sample()[0]]
+
+    def _sample_tags(self) -> set[int]:
+        ranks = self.tags.sample(self.rng.randint(0, 5)) if self.tag_ids else []
+        return {self.tag_ids[rank] for rank in ranks}
+
+    def _random_date(self) -> datetime:
+        return self.now - timedelta(seconds=self.rng.uniform(0, self.days * 86400))
+
+    def _text(self, words: int) -> str:
+        return " ".join(self.rng.choices(WORDS, k=words))
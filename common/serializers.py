@@ -0,0 +1,68 @@
+from typing import TYPE_CHECKING, Any
+
+from rest_framework import serializers
+from rest_framework.request import Request
+
+from common.timing import measure_timing
+
+Base = serializers.ModelSerializer if TYPE_CHECKING else object
+
+FIELDS_QUERY_PARAM = "fields"
+EXCLUDE_QUERY_PARAM = "exclude"
+
+
+def get_sparse_fieldset(request: Request | None) -> tuple[set[str] | None, set[str]]:
+    """Returns fields requested with `fields` and `exclude` query parameters.
+
+    Both parameters are comma separated lists of field names.
+
+    :param request: Current request.
+    :return: Set of requested fields (None if all fields are requested)
+     and set of excluded fields.
+    """
+    if request is None:
+        return None, set()
+
+    def parse(param: str) -> set[str]:
+        value: str = request.query_params.get(param, "")
+        return {name.strip() for name in value.split(",") if name.strip()}
+
+    return parse(FIELDS_QUERY_PARAM) or None, parse(EXCLUDE_QUERY_PARAM)
+
+
+class SparseFieldsetSerializerMixin(Base):
+    """Prunes fields of root serializer with `fields` and `exclude` query params.
+
+    Also measures serialization time of the request.
+    """
+
+    def get_fields(self) -> dict[str, serializers.Field]:
+        """Returns fields left after pruning.
+
+        Nested serializers are never pruned.
+
+        :return: Dict of serializer fields.
+        """
+        fields = super().get_fields()
+        if self.root is not self and self.root is not self.parent:
+            return fields
+
+        requested, excluded = get_sparse_fieldset(self.context.get("request"))
+        return {
+            name: field
+            for name, field in fields.items()
+            if (requested is None or name in requested) and name not in excluded
+        }
+
+    def to_representation(self, instance: Any) -> Any:
+        """Returns representation adding its duration to 'serialize' timing.
+
+        Only root serializer is measured, nested ones are part of its time.
+
+        :param instance: Serialized object.
+        :return: Representation.
+        """
+        if self.root is not self and self.root is not self.parent:
+            return super().to_representation(instance)
+        with measure_timing("serialize"):
+            return super().to_representation(instance)
@@ -0,0 +1,208 @@
+import asyncio
+import hashlib
+import threading
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, TypeVar
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse, HttpResponseBase
+from rest_framework.viewsets import ModelViewSet
+
+Base = ModelViewSet if TYPE_CHECKING else object
+
+T = TypeVar("T")
+
+KEY_HEADERS = ("HTTP_AUTHORIZATION", "HTTP_IF_NONE_MATCH", "HTTP_IF_MODIFIED_SINCE")
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.failed = False
+
+
+class SingleFlight:
+    """Shares result of a call with all concurrent callers using the same key."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[str, _Call] = {}
+
+    def do(self, key: str, func: Callable[[], T], timeout: float) -> T:
+        """Calls function or waits for result of the same call in another thread.
+
+        If the call in another thread fails or does not finish in time,
+        function is called in the current thread.
+
+        :param key: Key of call.
+        :param func: Function to call.
+        :param timeout: Max seconds to wait for another thread.
+        :return: Result of function.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self._calls[key] = _Call()
+
+        if not is_leader:
+            if call.done.wait(timeout) and not call.failed:
+                return call.result
+            return func()
+
+        try:
+            call.result = func()
+        except BaseException:
+            call.failed = True
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+
+class AsyncSingleFlight:
+    """Async counterpart of `SingleFlight` sharing results within an event loop."""
+
+    def __init__(self):
+        self._calls: dict[tuple[asyncio.AbstractEventLoop, str], asyncio.Future] = {}
+
+    async def do(
+        self,
+        key: str,
+        func: Callable[[], Awaitable[T]],
+        timeout: float,
+    ) -> T:
+        """Awaits coroutine function or result of the same call of another task.
+
+        If the call of another task fails or does not finish in time, function
+        is called by the current task.
+
+        :param key: Key of call.
+        :param func: Coroutine function to call.
+        :param timeout: Max seconds to wait for another task.
+        :return: Result of function.
+        """
+        loop = asyncio.get_running_loop()
+        call = self._calls.get((loop, key))
+        if call is not None:
+            try:
+                is_done, result = await asyncio.wait_for(asyncio.shield(call), timeout)
+            except asyncio.TimeoutError:
+                is_done = False
+            return result if is_done else await func()
+
+        call = self._calls[loop, key] = loop.create_future()
+        outcome: tuple[bool, Any] = (False, None)
+        try:
+            outcome = (True, await func())
+        finally:
+            del self._calls[loop, key]
+            call.set_result(outcome)
+        return outcome[1]
+
+
+single_flight = SingleFlight()
+async_single_flight = AsyncSingleFlight()
+
+FrozenResponse = tuple[int, bytes, list[tuple[str, str]]]
+
+
+def get_single_flight_key(request: HttpRequest) -> str:
+    """Returns key of request built from path, query and varying headers.
+
+    :param request: Current request.
+    :return: Key.
+    """
+    query = urlencode(sorted(request.GET.lists()), doseq=True)
+    headers = (request.META.get(header, "") for header in KEY_HEADERS)
+    raw_key = "|".join([request.method, request.path, query, *headers])
+    return hashlib.sha1(raw_key.encode()).hexdigest()
+
+
+class SingleFlightMixin(Base):
+    """Coalesces concurrent identical GET requests of `single_flight_actions`.
+
+    Only one of identical requests is handled, others wait for its rendered
+    response up to `single_flight_timeout` seconds.
+    """
+
+    single_flight_actions: tuple[str, ...] = ()
+    single_flight_timeout: float | None = None
+
+    def dispatch(self, request: HttpRequest, *args: Any, **kwargs: Any) -> Any:
+        """Handles request or shares response of the identical one in flight.
+
+        :param request: Current request.
+        :param args: Args.
+        :param kwargs: Kwargs.
+        :return: Response.
+        """
+        if not self._is_single_flight(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        def handle() -> FrozenResponse:
+            response = super(SingleFlightMixin, self).dispatch(request, *args, **kwargs)
+            return self._freeze(response)
+
+        return self._thaw(
+            single_flight.do(
+                get_single_flight_key(request),
+                handle,
+                self._get_single_flight_timeout(),
+            ),
+        )
+
+    async def adispatch(self, request: HttpRequest, *args: Any, **kwargs: Any) -> Any:
+        """Async counterpart of `dispatch`.
+
+        :param request: Current request.
+        :param args: Args.
+        :param kwargs: Kwargs.
+        :return: Response.
+        """
+        if not self._is_single_flight(request):
+            return await super().adispatch(request, *args, **kwargs)
+
+        async def handle() -> FrozenResponse:
+            response = await super(SingleFlightMixin, self).adispatch(
+                request,
+                *args,
+                **kwargs,
+            )
+            return self._freeze(response)
+
+        return self._thaw(
+            await async_single_flight.do(
+                get_single_flight_key(request),
+                handle,
+                self._get_single_flight_timeout(),
+            ),
+        )
+
+    def _is_single_flight(self, request: HttpRequest) -> bool:
+        action = self.action_map.get(request.method.lower())
+        return (
+            settings.SINGLE_FLIGHT["ENABLED"]
+            and request.method == "GET"
+            and action in self.single_flight_actions
+        )
+
+    def _get_single_flight_timeout(self) -> float:
+        return self.single_flight_timeout or settings.SINGLE_FLIGHT["TIMEOUT"]
+
+    @staticmethod
+    def _freeze(response: HttpResponseBase) -> FrozenResponse:
+        if hasattr(response, "render"):
+            response.render()
+        return response.status_code, response.content, list(response.items())
+
+    @staticmethod
+    def _thaw(frozen: FrozenResponse) -> HttpResponse:
+        status, content, headers = frozen
+        response = HttpResponse(content, status=status)
+        for header, value in headers:
+            response[header] = value
+        return response
@@ -0,0 +1,168 @@
+import json
+import logging
+import random
+import time
+from typing import Any, Callable
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.db.backends.base.base import BaseDatabaseWrapper
+
+from common.budgets import get_sql_shape
+from common.timing import current_timings
+
+logger = logging.getLogger(__name__)
+
+# EXPLAIN statements by database vendor, their plans are stored as JSON.
+EXPLAIN_PREFIXES = {
+    "postgresql": "EXPLAIN (FORMAT JSON) ",
+    "sqlite": "EXPLAIN QUERY PLAN ",
+    "mysql": "EXPLAIN FORMAT=JSON ",
+}
+EXPLAINED_STATEMENTS = ("SELECT", "WITH")
+EXPLAIN_SAVEPOINT = "slow_query_explain"
+
+
+def get_params_shape(params: Any, many: bool) -> Any:
+    """Returns types of query parameters, so that their values are not logged.
+
+    :param params: Parameters of query.
+    :param many: Whether parameters are a list of parameter sets.
+    :return: List of type names, dict of them or number of parameter sets.
+    """
+    if many:
+        return {"sets": len(params) if isinstance(params, (list, tuple)) else None}
+    if isinstance(params, dict):
+        return {name: type(value).__name__ for name, value in params.items()}
+    return [type(value).__name__ for value in params or ()]
+
+
+def get_current_view() -> str | None:
+    """Returns route name of request being handled in current context.
+
+    :return: Route name or None outside of request.
+    """
+    timings = current_timings.get()
+    match = getattr(timings and timings.request, "resolver_match", None)
+    return match.view_name if match else None
+
+
+def explain(connection: BaseDatabaseWrapper, sql: str, params: Any) -> Any:
+    """Returns execution plan of query.
+
+    Plan is fetched with a raw cursor, so it is not recorded or timed as a
+    query of the request. Inside transactions it is fetched in a savepoint, so
+    that a failed EXPLAIN doesn't abort the transaction of the request.
+
+    :param connection: Connection query was executed with.
+    :param sql: SQL of query.
+    :param params: Parameters of query.
+    :return: Plan rows or None if vendor or statement are not supported.
+    :raises DatabaseError: if EXPLAIN fails.
+    """
+    prefix = EXPLAIN_PREFIXES.get(connection.vendor)
+    if prefix is None or not sql.lstrip().upper().startswith(EXPLAINED_STATEMENTS):
+        return None
+    # Errors of raw cursors are not converted to Django's ones otherwise.
+    with connection.wrap_database_errors:
+        cursor = connection.create_cursor()
+        try:
+            if connection.get_autocommit():
+                return _fetch_plan(cursor, prefix + sql, params)
+            return _fetch_plan_in_savepoint(connection, cursor, prefix + sql, params)
+        finally:
+            cursor.close()
+
+
+def _fetch_plan(cursor: Any, sql: str, params: Any) -> list[list[Any]]:
+    cursor.execute(sql, params)
+    return [list(row) for row in cursor.fetchall()]
+
+
+def _fetch_plan_in_savepoint(
+    connection: BaseDatabaseWrapper,
+    cursor: Any,
+    sql: str,
+    params: Any,
+) -> list[list[Any]]:
+    cursor.execute(connection.ops.savepoint_create_sql(EXPLAIN_SAVEPOINT))
+    try:
+        plan = _fetch_plan(cursor, sql, params)
+    except Exception:
+        cursor.execute(connection.ops.savepoint_rollback_sql(EXPLAIN_SAVEPOINT))
+        raise
+    cursor.execute(connection.ops.savepoint_commit_sql(EXPLAIN_SAVEPOINT))
+    return plan
+
+
+def log_slow_query(
+    connection: BaseDatabaseWrapper,
+    sql: str,
+    params: Any,
+    many: bool,
+    duration: float,
+) -> None:
+    """Logs slow query as JSON, sampled queries together with execution plan.
+
+    :param connection: Connection query was executed with.
+    :param sql: SQL of query.
+    :param params: Parameters of query.
+    :param many: Whether it is executemany.
+    :param duration: Duration of query in seconds.
+    """
+    record: dict[str, Any] = {
+        "alias": connection.alias,
+        "view": get_current_view(),
+        "duration_ms": round(duration * 1000, 3),
+        "sql": sql,
+        "shape": get_sql_shape(sql),
+        "params": get_params_shape(params, many),
+    }
+    if not many and random.random() < settings.SLOW_QUERIES["EXPLAIN_SAMPLE_RATE"]:
+        try:
+            record["plan"] = explain(connection, sql, params)
+        except DatabaseError as exc:
+            record["plan_error"] = str(exc)
+    logger.warning(json.dumps(record, default=str), extra={"slow_query": record})
+
+
+def record_slow_query(
+    execute: Callable[..., Any],
+    sql: str,
+    params: Any,
+    many: bool,
+    context: dict[str, Any],
+) -> Any:
+    """Execute wrapper logging queries slower than `SLOW_QUERIES["THRESHOLD_MS"]`.
+
+    :param execute: Function executing query.
+    :param sql: SQL.
+    :param params: Parameters of query.
+    :param many: Whether it is executemany.
+    :param context: Context of execution.
+    :return: Result of execution.
+    """
+    started_at = time.perf_counter()
+    result = execute(sql, params, many, context)
+    duration = time.perf_counter() - started_at
+    if duration * 1000 >= settings.SLOW_QUERIES["THRESHOLD_MS"]:
+        log_slow_query(context["connection"], sql, params, many, duration)
+    return result
+
+
+def install_slow_query_recorder(
+    connection: BaseDatabaseWrapper,
+    **kwargs: Any,
+) -> None:
+    """Adds `record_slow_query` wrapper to new database connection.
+
+    Connected to `connection_created` signal.
+
+    :param connection: Database connection.
+    :param kwargs: Signal kwargs.
+    """
+    if (
+        settings.SLOW_QUERIES["ENABLED"]
+        and record_slow_query not in connection.execute_wrappers
+    ):
+        connection.execute_wrappers.insert(0, record_slow_query)
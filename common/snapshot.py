@@ -0,0 +1,107 @@
+import logging
+import threading
+from typing import Any, Callable, Iterable, Type
+
+from django.db import connections
+from django.db.models import Model
+from rest_framework.settings import api_settings
+
+from common.metrics import record_cache_lookup
+from common.versions import aget_model_versions, get_model_versions
+
+logger = logging.getLogger(__name__)
+
+
+class Snapshot:
+    """List of pre-rendered JSON items kept in process memory.
+
+    Snapshot is rebuilt in a background thread when versions of its dependencies
+    change. Until the rebuild is finished the stale copy is returned.
+    """
+
+    def __init__(
+        self,
+        build: Callable[[], Iterable[Any]],
+        dependencies: Iterable[Type[Model]],
+    ):
+        self.build = build
+        self.dependencies = tuple(dependencies)
+        self._items: list[bytes] | None = None
+        self._versions: dict[str, int] | None = None
+        self._rebuilding = False
+        self._lock = threading.Lock()
+
+    def get(self) -> tuple[list[bytes] | None, bool]:
+        """Returns rendered items and starts rebuild if they are outdated.
+
+        :return: List of rendered items (None if snapshot was never built) and
+         whether they are up to date.
+        """
+        return self._check_versions(get_model_versions(self.dependencies))
+
+    async def aget(self) -> tuple[list[bytes] | None, bool]:
+        """Async counterpart of `get`.
+
+        :return: List of rendered items (None if snapshot was never built) and
+         whether they are up to date.
+        """
+        return self._check_versions(await aget_model_versions(self.dependencies))
+
+    def render(self, limit: int) -> tuple[bytes, bool] | None:
+        """Returns JSON array of first items.
+
+        :param limit: Max number of items.
+        :return: JSON array and whether it is up to date,
+         None if snapshot was never built.
+        """
+        return self._render(*self.get(), limit)
+
+    async def arender(self, limit: int) -> tuple[bytes, bool] | None:
+        """Async counterpart of `render`.
+
+        :param limit: Max number of items.
+        :return: JSON array and whether it is up to date,
+         None if snapshot was never built.
+        """
+        return self._render(*await self.aget(), limit)
+
+    def _check_versions(
+        self,
+        versions: dict[str, int],
+    ) -> tuple[list[bytes] | None, bool]:
+        is_fresh = versions == self._versions
+        if not is_fresh:
+            self._start_rebuild(versions)
+        return self._items, is_fresh
+
+    def _render(
+        self,
+        items: list[bytes] | None,
+        is_fresh: bool,
+        limit: int,
+    ) -> tuple[bytes, bool] | None:
+        if items is None:
+            record_cache_lookup("snapshot", "miss")
+            return None
+        record_cache_lookup("snapshot", "hit" if is_fresh else "stale")
+        return b"[" + b",".join(items[:limit]) + b"]", is_fresh
+
+    def _start_rebuild(self, versions: dict[str, int]) -> None:
+        with self._lock:
+            if self._rebuilding:
+                return
+            self._rebuilding = True
+        thread = threading.Thread(target=self._rebuild, args=(versions,), daemon=True)
+        thread.start()
+
+    def _rebuild(self, versions: dict[str, int]) -> None:
+        renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+        try:
+            items = [renderer.render(item) for item in self.build()]
+        except Exception:
+            logger.exception("Snapshot rebuild failed")
+        else:
+            self._items, self._versions = items, versions
+        finally:
+            self._rebuilding = False
+            connections.close_all()
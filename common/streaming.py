@@ -0,0 +1,75 @@
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Iterable, Iterator
+
+from django.conf import settings
+from django.db.models import Model, QuerySet
+from django.http import StreamingHttpResponse
+from rest_framework.viewsets import ModelViewSet
+
+from common.renderers import FastJSONRenderer
+
+Base = ModelViewSet if TYPE_CHECKING else object
+
+STREAM_QUERY_PARAM = "stream"
+
+
+def iter_chunks(items: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    """Splits iterable into lists of `size` items.
+
+    :param items: Iterable.
+    :param size: Size of chunk.
+    :yield: Lists of items.
+    """
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+class StreamingListMixin(Base):
+    """Streams JSON list responses serialized chunk by chunk."""
+
+    streaming_renderer_class = FastJSONRenderer
+
+    def should_stream(self, queryset: QuerySet[Any]) -> bool:
+        """Returns whether list of queryset should be streamed.
+
+        Streamed responses are neither cached nor validated, so only lists
+        requested with `stream=true` or longer than `STREAMING_MIN_ROWS` are
+        streamed.
+
+        :param queryset: Queryset of list.
+        :return: True if list should be streamed.
+        """
+        if self.request.query_params.get(STREAM_QUERY_PARAM) == "true":
+            return True
+        min_rows: int = settings.STREAMING_MIN_ROWS
+        return queryset[min_rows : min_rows + 1].exists()
+
+    def get_streaming_response(self, queryset: QuerySet[Any]) -> StreamingHttpResponse:
+        """Returns response streaming serialized objects of queryset.
+
+        Queryset is read with `iterator`, so only one chunk of objects is kept in
+        memory. Output is equal to the rendered list of all objects.
+
+        :param queryset: Queryset.
+        :return: Streaming response.
+        """
+        chunk_size: int = settings.STREAMING_CHUNK_SIZE
+        return StreamingHttpResponse(
+            self._render_chunks(queryset.iterator(chunk_size=chunk_size), chunk_size),
+            content_type=self.streaming_renderer_class.media_type,
+        )
+
+    def _render_chunks(
+        self,
+        objects: Iterator[Model],
+        chunk_size: int,
+    ) -> Iterator[bytes]:
+        renderer = self.streaming_renderer_class()
+        separator = b""
+        yield b"["
+        for chunk in iter_chunks(objects, chunk_size):
+            data = self.get_serializer(chunk, many=True).data
+            yield separator + b",".join(renderer.render(item) for item in data)
+            separator = b","
+        yield b"]"
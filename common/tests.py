@@ -0,0 +1,1282 @@
+import asyncio
+import json
+import os
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from io import BytesIO, StringIO
+from threading import Event, Thread, current_thread, get_ident
+from typing import Any, Callable, Iterator, Type
+from unittest import mock
+from uuid import UUID
+
+from asgiref.sync import SyncToAsync, async_to_sync, sync_to_async
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import CommandError, call_command
+from django.db import connection, connections
+from django.db.backends.utils import CursorWrapper
+from django.db.models import Count, F, Q
+from django.http import HttpRequest, HttpResponse, QueryDict
+from django.test import (
+    Client,
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    override_settings,
+)
+from django.test.utils import CaptureQueriesContext
+from rest_framework import serializers
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+from rest_framework.viewsets import ViewSetMixin
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.authentication.urls import router as authentication_router
+from api.forum.serializers import QuestionSerializer
+from api.forum.snapshots import _find_front_page_snapshot, front_page_snapshots
+from api.forum.urls import router as forum_router
+from api.forum.views import CommentViewSet, QuestionViewSet
+from api.news.urls import router as news_router
+from api.news.views import ArticleViewSet
+from authentication.models import Notification, User
+from common.asgi import ExecutorPool, PooledThreadSensitiveContext, StreamingASGIHandler
+from common.backfill import BackfillRunner, backfills
+from common.benchmark import NO_CACHE_SETTINGS, count_endpoint_queries, seed_budget_data
+from common.budgets import breaks_query_budget, get_path_query_budget
+from common.fastpath import ValuesListMixin, ValuesPlan
+from common.index_audit import PlanAuditor
+from common.middleware import ReplicaMiddleware
+from common.mixins import prune_queryset
+from common.models import BackfillCheckpoint
+from common.ndjson import parse_ndjson
+from common.parsers import FastJSONParser
+from common.renderers import FastJSONRenderer
+from common.replicas import (
+    ReplicaRouter,
+    achoose_replica,
+    choose_replica,
+    replica_alias,
+)
+from common.seeding import Seeder
+from common.serializers import EXCLUDE_QUERY_PARAM, FIELDS_QUERY_PARAM
+from common.singleflight import AsyncSingleFlight, SingleFlight, get_single_flight_key
+from common.slow_queries import install_slow_query_recorder
+from common.snapshot import Snapshot
+from common.versions import bump_model_version, get_cache, get_model_versions
+from forum.models import Comment, Question, Tag, TagActivityBucket
+from forum.trending import rebuild_tag_activity
+from news.models import Article
+
+QUESTIONS_URL = "/api/forum/questions/"
+TAGS_URL = "/api/forum/tags/"
+SLOW_LIST_SETTINGS = {
+    "FAST_LIST": {"ENABLED": False},
+    "RESPONSE_CACHE": {"ENABLED": False, "ALIAS": "default", "TIMEOUT": 0},
+    "FRONT_PAGE_SNAPSHOT": {"ENABLED": False, "SIZE": 0},
+}
+
+
+class ForumTestCase(TestCase):
+    """Creates an author and tagged questions, starts with empty cache."""
+
+    def setUp(self) -> None:
+        get_cache().clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user("author", "author@example.com", "pass")
+        self.tags = [Tag.objects.create(title=title) for title in ("b", "a", "c")]
+        self.questions = []
+        for number in range(3):
+            question = Question.objects.create(
+                title=f"Question {number}",
+                content=f"Content of question {number}",
+                author=self.user,
+            )
+            # Tagged in reverse order of primary keys.
+            for tag in reversed(self.tags):
+                question.tags.add(tag)
+            self.questions.append(question)
+
+
+class ResponseCacheTests(ForumTestCase):
+    """Anonymous reads are cached until a model they depend on changes."""
+
+    def test_repeated_request_is_served_from_cache(self) -> None:
+        first = self.client.get(QUESTIONS_URL, {"limit": 10})
+
+        with self.assertNumQueries(0):
+            second = self.client.get(QUESTIONS_URL, {"limit": 10})
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.content, first.content)
+
+    def test_change_of_dependency_invalidates_response(self) -> None:
+        self.client.get(QUESTIONS_URL, {"limit": 10})
+
+        self.questions[0].title = "Changed"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.questions[0].save()
+        response = self.client.get(QUESTIONS_URL, {"limit": 10})
+
+        titles = [question["title"] for question in response.json()]
+        self.assertIn("Changed", titles)
+
+    def test_m2m_change_bumps_versions_of_both_models(self) -> None:
+        before = get_model_versions([Question, Tag])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.questions[0].tags.remove(self.tags[0])
+
+        after = get_model_versions([Question, Tag])
+        self.assertGreater(after["forum.question"], before["forum.question"])
+        self.assertGreater(after["forum.tag"], before["forum.tag"])
+
+    def test_versions_are_bumped_after_commit(self) -> None:
+        before = get_model_versions([Question])
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.questions[0].title = "Changed"
+            self.questions[0].save()
+            # Other connections can't see the change yet.
+            self.assertEqual(get_model_versions([Question]), before)
+
+        self.assertEqual(get_model_versions([Question]), before)
+        for callback in callbacks:
+            callback()
+        self.assertGreater(
+            get_model_versions([Question])["forum.question"],
+            before["forum.question"],
+        )
+
+    def test_authenticated_request_is_not_cached(self) -> None:
+        self.client.get(QUESTIONS_URL, {"limit": 10})
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(QUESTIONS_URL, {"limit": 10})
+
+        self.assertTrue(queries)
+
+    @override_settings(
+        RESPONSE_CACHE={"ENABLED": False, "ALIAS": "default", "TIMEOUT": 0},
+    )
+    def test_disabled_cache_is_not_used(self) -> None:
+        self.client.get(QUESTIONS_URL, {"limit": 10})
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(QUESTIONS_URL, {"limit": 10})
+
+        self.assertTrue(queries)
+
+
+@override_settings(
+    RESPONSE_CACHE={"ENABLED": False, "ALIAS": "default", "TIMEOUT": 0},
+)
+class ConditionalGetTests(ForumTestCase):
+    """Validators come from model versions and answer conditional requests."""
+
+    def test_matching_etag_is_answered_without_queries(self) -> None:
+        etag = self.client.get(QUESTIONS_URL, {"limit": 10})["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                QUESTIONS_URL,
+                {"limit": 10},
+                HTTP_IF_NONE_MATCH=etag,
+            )
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_validators_add_no_queries(self) -> None:
+        with self.assertNumQueries(2):
+            # Questions and their tags.
+            response = self.client.get(QUESTIONS_URL, {"limit": 10})
+
+        self.assertTrue(response.has_header("ETag"))
+        self.assertTrue(response.has_header("Last-Modified"))
+
+    def test_delete_changes_validators(self) -> None:
+        first = self.client.get(QUESTIONS_URL, {"limit": 10})
+
+        with mock.patch("common.versions.time.time", return_value=time.time() + 10):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.questions[0].delete()
+        response = self.client.get(
+            QUESTIONS_URL,
+            {"limit": 10},
+            HTTP_IF_MODIFIED_SINCE=first["Last-Modified"],
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], first["ETag"])
+        self.assertEqual(len(response.json()), 2)
+
+    def test_unchanged_list_is_not_modified_since(self) -> None:
+        first = self.client.get(QUESTIONS_URL, {"limit": 10})
+
+        response = self.client.get(
+            QUESTIONS_URL,
+            {"limit": 10},
+            HTTP_IF_MODIFIED_SINCE=first["Last-Modified"],
+        )
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_updated_at_is_not_serialized(self) -> None:
+        token = RefreshToken.for_user(self.user).access_token
+        client = APIClient(HTTP_AUTHORIZATION=f"Bearer {token}")
+        created = client.post(
+            QUESTIONS_URL,
+            {"title": "New", "content": "New question", "tags": ["a"]},
+            format="json",
+        )
+        snapshot = front_page_snapshots["order_by_date", "desc"]
+        cases = {
+            "detail": self.client.get(f"{QUESTIONS_URL}{self.questions[0].pk}/"),
+            "create": created,
+            "fast list": self.client.get(QUESTIONS_URL, {"limit": 10}),
+            "snapshot": snapshot.build(),
+        }
+        with override_settings(FAST_LIST={"ENABLED": False}):
+            cases["list"] = self.client.get(QUESTIONS_URL, {"limit": 10})
+
+        for name, response in cases.items():
+            with self.subTest(name):
+                data = response if name == "snapshot" else response.json()
+                question = data[0] if isinstance(data, list) else data
+                self.assertNotIn("updated_at", question)
+                self.assertEqual(list(question["tags"][0]), ["id", "title"])
+
+
+@override_settings(**SLOW_LIST_SETTINGS)
+class RequestTimingTests(ForumTestCase):
+    """Durations of request phases are exposed in Server-Timing header."""
+
+    def test_header_has_database_and_serialization_phases(self) -> None:
+        response = self.client.get(
+            QUESTIONS_URL,
+            {"limit": 10},
+            HTTP_ORIGIN="https://frontend.example.com",
+        )
+
+        metrics = {
+            metric.split(";")[0]: metric
+            for metric in response["Server-Timing"].split(", ")
+        }
+        self.assertIn("db", metrics)
+        self.assertRegex(metrics["db"], r'^db;dur=[\d.]+;desc="\d+ queries"$')
+        self.assertIn("serialize", metrics)
+        self.assertIn("Server-Timing", response["Access-Control-Expose-Headers"])
+
+
+class SlowQueryTests(TestCase):
+    """Queries over threshold are logged, a sample of them with plans."""
+
+    def setUp(self) -> None:
+        install_slow_query_recorder(connection)
+
+    def log_query(self, rate: float, sample: float = 0.5) -> dict[str, Any]:
+        slow_queries = {"ENABLED": True, "THRESHOLD_MS": 0, "EXPLAIN_SAMPLE_RATE": rate}
+        with override_settings(SLOW_QUERIES=slow_queries):
+            with mock.patch("common.slow_queries.random.random", return_value=sample):
+                with self.assertLogs("common.slow_queries", "WARNING") as logs:
+                    Tag.objects.filter(title="a").count()
+        (record,) = logs.records
+        return record.slow_query
+
+    @override_settings(
+        SLOW_QUERIES={
+            "ENABLED": True,
+            "THRESHOLD_MS": 10**6,
+            "EXPLAIN_SAMPLE_RATE": 1,
+        },
+    )
+    def test_fast_query_is_not_logged(self) -> None:
+        with self.assertNoLogs("common.slow_queries"):
+            Tag.objects.count()
+
+    def test_sampled_query_is_explained(self) -> None:
+        record = self.log_query(rate=0.6)
+
+        self.assertEqual(record["params"], ["str"])
+        self.assertTrue(record["plan"])
+
+    def test_query_out_of_sample_is_not_explained(self) -> None:
+        record = self.log_query(rate=0.4)
+
+        self.assertIn("COUNT(*)", record["sql"])
+        self.assertNotIn("plan", record)
+
+    def test_failed_explain_is_logged_and_rolled_back(self) -> None:
+        prefixes = {connection.vendor: "EXPLAIN NOTHING "}
+        with mock.patch.dict("common.slow_queries.EXPLAIN_PREFIXES", prefixes):
+            record = self.log_query(rate=1)
+
+        self.assertIn("plan_error", record)
+        # Transaction of the test is still usable.
+        self.assertEqual(Tag.objects.count(), 0)
+
+
+class PlanAuditTests(SimpleTestCase):
+    """Full scans with filters and sorts without index are found in plans."""
+
+    sql = 'SELECT * FROM "forum_question" WHERE "views" > %s ORDER BY "title"'
+
+    def setUp(self) -> None:
+        self.auditor = PlanAuditor(min_rows=10)
+        self.auditor.row_counts = {"forum_question": 100, "forum_tag": 5}
+
+    def test_full_scan_and_temporary_sort_are_reported(self) -> None:
+        plan = [
+            [2, 0, 0, "SCAN forum_question"],
+            [10, 0, 0, "USE TEMP B-TREE FOR ORDER BY"],
+        ]
+
+        self.assertEqual(
+            list(self.auditor._audit_sqlite(plan, self.sql)),
+            ["full scan of forum_question", "sort of forum_question without index"],
+        )
+
+    def test_index_scans_and_small_tables_are_not_reported(self) -> None:
+        plan = [
+            [2, 0, 0, "SCAN forum_question USING INDEX forum_question_views"],
+            [3, 0, 0, "SCAN forum_tag"],
+            [10, 0, 0, "USE TEMP B-TREE FOR ORDER BY"],
+        ]
+
+        self.assertEqual(list(self.auditor._audit_sqlite(plan, self.sql)), [])
+
+
+class SnapshotTests(TestCase):
+    """Snapshots are rebuilt in background and served stale meanwhile."""
+
+    def setUp(self) -> None:
+        get_cache().clear()
+        self.items = [{"id": 1}, {"id": 2}]
+        self.snapshot = Snapshot(lambda: self.items, (Tag,))
+        # Rebuilds are started by tests, so they don't race with assertions.
+        patcher = mock.patch("common.snapshot.threading.Thread")
+        self.thread_class = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def rebuild(self) -> None:
+        kwargs = self.thread_class.call_args.kwargs
+        thread = Thread(target=kwargs["target"], args=kwargs["args"])
+        thread.start()
+        thread.join()
+
+    def test_first_render_starts_rebuild(self) -> None:
+        self.assertIsNone(self.snapshot.render(1))
+        self.rebuild()
+
+        self.assertEqual(self.snapshot.render(1), (b'[{"id":1}]', True))
+
+    def test_outdated_snapshot_is_served_stale(self) -> None:
+        self.snapshot.render(2)
+        self.rebuild()
+        self.items = [{"id": 3}]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_model_version(Tag)
+        stale = self.snapshot.render(2)
+        self.rebuild()
+
+        self.assertEqual(stale, (b'[{"id":1},{"id":2}]', False))
+        self.assertEqual(self.snapshot.render(2), (b'[{"id":3}]', True))
+
+    def test_one_rebuild_runs_at_a_time(self) -> None:
+        self.snapshot.render(1)
+        self.snapshot.render(1)
+
+        self.thread_class.assert_called_once()
+
+
+class FrontPageTests(ForumTestCase):
+    """Only first pages in common orderings are served from snapshots."""
+
+    def test_snapshot_is_found_for_first_page(self) -> None:
+        found = _find_front_page_snapshot(
+            QueryDict("order_by_date=desc&limit=10&skip=0"),
+        )
+
+        self.assertEqual(found, (front_page_snapshots["order_by_date", "desc"], 10))
+
+    def test_other_pages_are_not_served_from_snapshots(self) -> None:
+        for query in (
+            "order_by_date=desc&limit=10&skip=10",
+            "order_by_date=desc&limit=1000",
+            "order_by_date=desc",
+            "order_by_date=asc&limit=10",
+            "order_by_date=DESC&limit=10",
+            "order_by_date=desc&by_title=a&limit=10",
+        ):
+            with self.subTest(query=query):
+                self.assertIsNone(_find_front_page_snapshot(QueryDict(query)))
+
+    def test_stale_page_is_not_validated_or_cached(self) -> None:
+        stale = (b'[{"id":1}]', False)
+        with mock.patch("api.forum.views.get_front_page", return_value=stale):
+            with mock.patch("api.forum.views.aget_front_page", return_value=stale):
+                response = self.client.get(
+                    QUESTIONS_URL,
+                    {"order_by_date": "desc", "limit": 10},
+                )
+
+        self.assertEqual(response.content, stale[0])
+        self.assertIn("no-cache", response["Cache-Control"])
+        self.assertFalse(response.has_header("ETag"))
+
+
+class SingleFlightTests(SimpleTestCase):
+    """Concurrent identical calls share the result of one of them."""
+
+    def call_concurrently(
+        self,
+        flight: SingleFlight,
+        func: Callable[[], Any],
+        count: int,
+        timeout: float = 5,
+    ) -> list[Any]:
+        results: list[Any] = []
+        threads = [
+            Thread(target=lambda: results.append(flight.do("key", func, timeout)))
+            for _ in range(count)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_concurrent_calls_share_result(self) -> None:
+        calls = []
+
+        def func() -> int:
+            calls.append(1)
+            time.sleep(0.2)
+            return len(calls)
+
+        results = self.call_concurrently(SingleFlight(), func, 5)
+
+        self.assertEqual(calls, [1])
+        self.assertEqual(results, [1] * 5)
+
+    def test_failed_call_is_repeated_by_waiting_caller(self) -> None:
+        flight = SingleFlight()
+        errors = []
+
+        def fail() -> str:
+            time.sleep(0.1)
+            raise ValueError
+
+        def lead() -> None:
+            try:
+                flight.do("key", fail, 5)
+            except ValueError as err:
+                errors.append(err)
+
+        leader = Thread(target=lead)
+        leader.start()
+        time.sleep(0.02)
+        result = flight.do("key", lambda: "own", 5)
+        leader.join()
+
+        self.assertEqual(result, "own")
+        self.assertEqual(len(errors), 1)
+
+    def test_waiting_caller_calls_function_after_timeout(self) -> None:
+        flight = SingleFlight()
+        release = Event()
+        results = []
+
+        def slow() -> str:
+            release.wait(1)
+            return "slow"
+
+        leader = Thread(target=lambda: results.append(flight.do("key", slow, 5)))
+        leader.start()
+        time.sleep(0.05)
+        results.append(flight.do("key", lambda: "own", 0.05))
+        release.set()
+        leader.join()
+
+        self.assertEqual(results, ["own", "slow"])
+
+    def test_async_concurrent_calls_share_result(self) -> None:
+        calls = []
+
+        async def func() -> int:
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return len(calls)
+
+        async def call_all() -> list[int]:
+            flight = AsyncSingleFlight()
+            return await asyncio.gather(*(flight.do("key", func, 5) for _ in range(5)))
+
+        self.assertEqual(asyncio.run(call_all()), [1] * 5)
+        self.assertEqual(calls, [1])
+
+    def test_key_depends_on_authorization(self) -> None:
+        factory = RequestFactory()
+        anonymous = factory.get("/api/forum/questions/1/", {"a": 1})
+        authorized = factory.get(
+            "/api/forum/questions/1/",
+            {"a": 1},
+            HTTP_AUTHORIZATION="Bearer token",
+        )
+
+        self.assertNotEqual(
+            get_single_flight_key(anonymous),
+            get_single_flight_key(authorized),
+        )
+
+
+@override_settings(
+    RESPONSE_CACHE={"ENABLED": False, "ALIAS": "default", "TIMEOUT": 0},
+)
+class SparseFieldsetTests(ForumTestCase):
+    """Fields are selected with `fields` and `exclude`, unused data isn't loaded."""
+
+    def test_only_requested_fields_are_returned(self) -> None:
+        response = self.client.get(QUESTIONS_URL, {"limit": 10, "fields": "id,title"})
+
+        self.assertEqual(
+            [question.keys() for question in response.json()],
+            [{"id", "title"}] * 3,
+        )
+
+    def test_excluded_relation_is_not_fetched(self) -> None:
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                QUESTIONS_URL,
+                {"limit": 10, "exclude": "tags"},
+            )
+
+        self.assertNotIn("tags", response.json()[0])
+        self.assertIn("title", response.json()[0])
+
+    def test_prune_queryset_defers_unused_columns(self) -> None:
+        fields = QuestionSerializer().fields
+        queryset = prune_queryset(
+            Question.objects.prefetch_related("tags"),
+            {"title": fields["title"]},
+        )
+
+        self.assertEqual(queryset.query.deferred_loading, ({"id", "title"}, False))
+        self.assertEqual(queryset._prefetch_related_lookups, ())
+
+    def test_prune_queryset_keeps_queryset_of_computed_fields(self) -> None:
+        queryset = Question.objects.prefetch_related("tags")
+        field = serializers.IntegerField()
+        field.bind("rank", None)
+
+        pruned = prune_queryset(queryset, {"rank": field})
+
+        self.assertIs(pruned, queryset)
+
+
+class ForumContentTestCase(ForumTestCase):
+    """Also creates comments of questions and a rated article."""
+
+    def setUp(self) -> None:
+        super().setUp()
+        reader = User.objects.create_user("reader", "reader@example.com", "pass")
+        for number, question in enumerate(self.questions):
+            Comment.objects.create(
+                content=f"Comment {number}",
+                author=reader,
+                question=question,
+                is_answer=number == 0,
+            )
+        self.article = Article.objects.create(title="Article", content="Content")
+        # Rated in reverse order of primary keys.
+        self.article.likes.add(reader)
+        self.article.likes.add(self.user)
+        self.article.dislikes.add(reader)
+
+
+class FastListTests(ForumContentTestCase):
+    """List endpoints return the same data from values() rows as from serializers."""
+
+    def test_fast_and_slow_lists_are_equal(self) -> None:
+        factory = APIRequestFactory()
+        for prefix, viewset in self.get_viewsets():
+            for params in self.get_query_variants(viewset):
+                with self.subTest(prefix=prefix, params=params):
+                    request = factory.get(f"/{prefix}/", params)
+                    force_authenticate(request, user=self.user)
+                    with override_settings(ASYNC_READS={"ENABLED": False}):
+                        view = viewset.as_view({"get": "list"})
+                    fast = view(request).render().content
+                    with override_settings(**SLOW_LIST_SETTINGS):
+                        slow = view(request).render().content
+
+                    self.assertEqual(fast, slow)
+
+    def test_many_to_many_rows_are_ordered_by_primary_key(self) -> None:
+        plan = ValuesPlan.build(QuestionSerializer())
+
+        (question,) = plan.represent(
+            plan.values(Question.objects.filter(pk=self.questions[0].pk)),
+        )
+
+        tag_ids = [tag["id"] for tag in question["tags"]]
+        self.assertEqual(tag_ids, sorted(tag_ids))
+
+    def test_plan_is_not_built_for_computed_fields(self) -> None:
+        class RankedQuestionSerializer(serializers.ModelSerializer[Question]):
+            rank = serializers.SerializerMethodField()
+
+            class Meta:
+                model = Question
+                fields = ["id", "rank"]
+
+            def get_rank(self, question: Question) -> int:
+                return question.pk
+
+        self.assertIsNone(ValuesPlan.build(RankedQuestionSerializer()))
+
+    @staticmethod
+    def get_viewsets() -> Iterator[tuple[str, Type[ViewSetMixin]]]:
+        for router in (authentication_router, forum_router, news_router):
+            for prefix, viewset, _ in router.registry:
+                if issubclass(viewset, ValuesListMixin):
+                    yield prefix, viewset
+
+    @staticmethod
+    def get_query_variants(viewset: Type[ViewSetMixin]) -> list[dict[str, str]]:
+        view = viewset()
+        view.action = "list"
+        field_names = list(view.get_serializer_class()().fields)
+        return [
+            {},
+            {"limit": "2", "skip": "1"},
+            {FIELDS_QUERY_PARAM: ",".join(field_names[:2])},
+            {EXCLUDE_QUERY_PARAM: field_names[-1]},
+        ]
+
+
+class StreamingListTests(ForumTestCase):
+    """Only long lists and lists requested as streams are streamed."""
+
+    def test_short_list_is_buffered_and_cached(self) -> None:
+        first = self.client.get(TAGS_URL)
+
+        with self.assertNumQueries(0):
+            second = self.client.get(TAGS_URL)
+
+        self.assertFalse(first.streaming)
+        self.assertEqual(second.content, first.content)
+
+    def test_requested_stream_equals_buffered_list(self) -> None:
+        buffered = self.client.get(TAGS_URL)
+
+        streamed = self.client.get(TAGS_URL, {"stream": "true"})
+
+        self.assertTrue(streamed.streaming)
+        self.assertEqual(b"".join(streamed.streaming_content), buffered.content)
+
+    @override_settings(STREAMING_MIN_ROWS=2, STREAMING_CHUNK_SIZE=2)
+    def test_long_list_is_streamed(self) -> None:
+        response = self.client.get(TAGS_URL)
+
+        self.assertTrue(response.streaming)
+        tags = json.loads(b"".join(response.streaming_content))
+        self.assertEqual([tag["title"] for tag in tags], ["b", "a", "c"])
+
+
+class FastJSONTests(ForumTestCase):
+    """orjson renderer and parser agree with the default JSON ones."""
+
+    data = {
+        "aware": datetime(2023, 1, 2, 3, 4, 5, 678901, tzinfo=dt_timezone.utc),
+        "naive": datetime(2023, 1, 2, 3, 4, 5),
+        "price": Decimal("1.50"),
+        "uuid": UUID("12345678-1234-5678-1234-567812345678"),
+        "text": "line\u2028separator",
+    }
+
+    def test_rendered_data_is_parsed_back(self) -> None:
+        rendered = FastJSONRenderer().render(self.data)
+
+        self.assertEqual(rendered, JSONRenderer().render(self.data))
+        self.assertEqual(
+            FastJSONParser().parse(BytesIO(rendered)),
+            {
+                "aware": "2023-01-02T03:04:05.678901Z",
+                "naive": "2023-01-02T03:04:05",
+                "price": 1.5,
+                "uuid": "12345678-1234-5678-1234-567812345678",
+                "text": "line\u2028separator",
+            },
+        )
+
+    def test_malformed_body_is_bad_request(self) -> None:
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        response = self.client.post(
+            QUESTIONS_URL,
+            b'{"title": "Question",',
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 400)
+        with self.assertRaises(ParseError):
+            FastJSONParser().parse(BytesIO(b"[1, 2"))
+
+
+class SeededTestCase(TestCase):
+    """Seeds a small forum and news with `Seeder` once per class."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        get_cache().clear()
+        cls.seeder = Seeder(
+            users=10,
+            tags=5,
+            questions=30,
+            comments_per_question=2,
+            articles=5,
+            likes_per_article=3,
+            seed=1,
+            batch_size=20,
+        )
+        cls.seeder.seed(lambda name, created: None)
+
+
+class ExportTests(SeededTestCase):
+    """Exports write one parsable NDJSON line per exported row."""
+
+    def test_command_exports_every_row(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "export.ndjson")
+            call_command("export_forum", output=path, chunk_size=7, stderr=StringIO())
+            with open(path, "rb") as file:
+                lines = file.readlines()
+
+        records = [json.loads(line) for line in lines]
+        self.assertEqual(
+            Counter(record["type"] for record in records),
+            {
+                "tag": Tag.objects.count(),
+                "question": Question.objects.count(),
+                "comment": Comment.objects.count(),
+                "article": Article.objects.count(),
+            },
+        )
+
+    def test_endpoint_streams_every_question(self) -> None:
+        client = APIClient()
+        client.force_authenticate(
+            User.objects.create_superuser("staff", "staff@example.com", "pass"),
+        )
+
+        with override_settings(STREAMING_CHUNK_SIZE=7):
+            response = client.get(f"{QUESTIONS_URL}export/")
+            lines = b"".join(response.streaming_content).splitlines()
+
+        records = list(parse_ndjson(lines))
+        self.assertEqual(len(lines), Question.objects.count())
+        self.assertEqual(
+            [record["id"] for record in records],
+            list(Question.objects.order_by("pk").values_list("pk", flat=True)),
+        )
+
+
+class BenchmarkTests(SeededTestCase):
+    """Benchmark reports measurements of every discovered endpoint."""
+
+    def test_report_has_results_of_endpoints(self) -> None:
+        admin = User.objects.filter(role__title="Admin").get()
+        output = StringIO()
+
+        call_command(
+            "benchmark",
+            "--requests=2",
+            "--warmup=1",
+            "--no-cache",
+            f"--user={admin.username}",
+            stdout=output,
+            stderr=StringIO(),
+        )
+
+        report = json.loads(output.getvalue())
+        self.assertEqual(report["meta"]["rows"]["forum.question"], 30)
+        self.assertEqual(report["meta"]["options"]["requests"], 2)
+        self.assertIn("question-list?limit=20&skip=0", report["results"])
+        for key, result in report["results"].items():
+            with self.subTest(key):
+                self.assertEqual(result["requests"], 2)
+                self.assertEqual(
+                    list(result["latency_ms"]),
+                    ["min", "p50", "p95", "p99", "max", "mean"],
+                )
+                self.assertLessEqual(
+                    result["queries"]["min"],
+                    result["queries"]["max"],
+                )
+                self.assertTrue(all(status < 500 for status in result["status"]))
+
+    def test_unchanged_queries_are_not_regressions(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            baseline = os.path.join(directory, "baseline.json")
+            options = ["--requests=1", "--no-cache", "--filter=question-list"]
+            call_command(
+                "benchmark",
+                *options,
+                f"--output={baseline}",
+                stderr=StringIO(),
+            )
+
+            call_command(
+                "benchmark",
+                *options,
+                f"--compare={baseline}",
+                "--threshold=1000",
+                stdout=StringIO(),
+                stderr=StringIO(),
+            )
+
+
+@override_settings(**NO_CACHE_SETTINGS, STREAMING_CHUNK_SIZE=10**6)
+class BackfillTests(SeededTestCase):
+    """Backfills resume from checkpoints and report rows left outdated."""
+
+    def setUp(self) -> None:
+        self.backfill = backfills["question_activity"]
+        Question.objects.update(comment_count=99)
+
+    def test_resumed_run_continues_after_checkpoint(self) -> None:
+        def interrupt(checkpoint: BackfillCheckpoint) -> None:
+            raise KeyboardInterrupt
+
+        runner = BackfillRunner(
+            self.backfill, batch_size=10, sleep=0, progress=interrupt
+        )
+        with self.assertRaises(KeyboardInterrupt):
+            runner.run(resume=False)
+        checkpoint = runner.get_checkpoint()
+        self.assertEqual((checkpoint.rows, checkpoint.completed_at), (10, None))
+        # Rows before the checkpoint are not filled again by resumed run.
+        filled = Question.objects.filter(pk__lte=checkpoint.last_pk)
+        filled.update(comment_count=99)
+
+        call_command(
+            "backfill",
+            "question_activity",
+            "--resume",
+            "--batch-size=10",
+            "--sleep=0",
+            "--verify=0",
+            stderr=StringIO(),
+        )
+
+        checkpoint.refresh_from_db()
+        self.assertEqual(checkpoint.rows, 30)
+        self.assertIsNotNone(checkpoint.completed_at)
+        self.assertQuerysetEqual(
+            Question.objects.filter(comment_count=99).order_by("pk"),
+            filled.order_by("pk"),
+        )
+        self.assertEqual(filled.count(), 10)
+
+    def test_verify_reports_outdated_rows(self) -> None:
+        with self.assertRaisesMessage(CommandError, "sampled rows are outdated"):
+            call_command(
+                "backfill",
+                "question_activity",
+                "--verify-only",
+                stderr=StringIO(),
+            )
+
+        stderr = StringIO()
+        call_command(
+            "backfill",
+            "question_activity",
+            "--sleep=0",
+            "--verify=30",
+            stderr=stderr,
+        )
+        self.assertIn("sampled rows match", stderr.getvalue())
+
+
+class QueryBudgetTests(TestCase):
+    """Endpoints keep their query budgets and make no more queries on more data."""
+
+    def test_queries_are_within_budgets(self) -> None:
+        get_cache().clear()
+        counts = []
+        for questions in (10, 30):
+            seed_budget_data(questions)
+            counts.append(count_endpoint_queries(Client()))
+
+        for key, (path, _) in counts[-1].items():
+            sizes = [size_counts.get(key, (path, None))[1] for size_counts in counts]
+            with self.subTest(key, queries=sizes):
+                self.assertFalse(
+                    breaks_query_budget(get_path_query_budget(path), sizes),
+                )
+
+
+class SeedTests(TestCase):
+    """Seeded rows match requested numbers and their denormalized data."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        call_command(
+            "seed",
+            "--users=10",
+            "--tags=5",
+            "--questions=30",
+            "--comments-per-question=2",
+            "--articles=5",
+            "--likes-per-article=3",
+            # Questions stay inside trending windows.
+            "--days=7",
+            "--seed=1",
+            "--batch-size=20",
+            stderr=StringIO(),
+        )
+
+    def test_requested_rows_are_created(self) -> None:
+        self.assertEqual(
+            [model.objects.count() for model in (User, Tag, Question, Article)],
+            [10, 5, 30, 5],
+        )
+        self.assertTrue(Comment.objects.exists())
+        self.assertEqual(
+            Notification.objects.count(),
+            Comment.objects.exclude(author=F("question__author")).count(),
+        )
+
+    def test_activity_of_questions_matches_comments(self) -> None:
+        questions = Question.objects.annotate(
+            comments_total=Count("comments"),
+            answers_total=Count("comments", filter=Q(comments__is_answer=True)),
+        )
+
+        self.assertFalse(
+            questions.exclude(
+                comment_count=F("comments_total"),
+                answer_count=F("answers_total"),
+                has_answer=Q(answers_total__gt=0),
+            ).exists(),
+        )
+
+    def test_tag_activity_matches_rebuild(self) -> None:
+        seeded = self.get_buckets()
+
+        rebuild_tag_activity()
+
+        self.assertTrue(seeded)
+        self.assertEqual(self.get_buckets(), seeded)
+
+    @staticmethod
+    def get_buckets() -> set[tuple[int, int, datetime, int]]:
+        return set(
+            TagActivityBucket.objects.values_list("tag_id", "hours", "start", "count"),
+        )
+
+
+@override_settings(METRICS={"ENABLED": True, "TOKEN": "metrics-token"})
+class MetricsAccessTests(TestCase):
+    """Metrics are served only to internal addresses, staff and token holders."""
+
+    url = "/metrics"
+
+    def setUp(self) -> None:
+        self.client = Client(REMOTE_ADDR="203.0.113.1")
+
+    def test_denies_external_anonymous_requests(self) -> None:
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+        response = self.client.get(self.url, HTTP_AUTHORIZATION="Bearer wrong")
+        self.assertEqual(response.status_code, 403)
+
+    def test_allows_internal_addresses(self) -> None:
+        response = self.client.get(self.url, REMOTE_ADDR="127.0.0.1")
+        self.assertEqual(response.status_code, 200)
+
+    def test_allows_token(self) -> None:
+        response = self.client.get(self.url, HTTP_AUTHORIZATION="Bearer metrics-token")
+        self.assertEqual(response.status_code, 200)
+
+    def test_allows_staff(self) -> None:
+        staff = User.objects.create_superuser("staff", "staff@example.com", "pass")
+        self.client.force_login(staff)
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    @override_settings(METRICS={"ENABLED": True, "TOKEN": ""})
+    def test_empty_token_is_disabled(self) -> None:
+        response = self.client.get(self.url, HTTP_AUTHORIZATION="Bearer ")
+        self.assertEqual(response.status_code, 403)
+
+
+class ReplicaRoutingTests(ForumTestCase):
+    """Reads of a request go to one replica until something is written."""
+
+    replicas = ["replica_0", "replica_1"]
+
+    def setUp(self) -> None:
+        super().setUp()
+        for target in ("common.replicas", "common.middleware"):
+            patcher = mock.patch(
+                f"{target}.get_replica_aliases",
+                return_value=self.replicas,
+            )
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.factory = RequestFactory()
+        self.router = ReplicaRouter()
+
+    def test_reads_of_request_use_one_replica(self) -> None:
+        for _ in range(10):
+            aliases = self.get_aliases(self.factory.get(QUESTIONS_URL), ["read"] * 5)
+            self.assertEqual(len(set(aliases)), 1)
+            self.assertIn(aliases[0], self.replicas)
+        self.assertIsNone(replica_alias.get())
+
+    def test_write_switches_to_default_database(self) -> None:
+        aliases = self.get_aliases(
+            self.factory.get(QUESTIONS_URL),
+            ["read", "write", "read"],
+        )
+        self.assertIn(aliases[0], self.replicas)
+        self.assertEqual(aliases[1:], ["default", None])
+
+    def test_sticky_client_and_writes_use_default_database(self) -> None:
+        self.factory.cookies[settings.REPLICA_ROUTING["STICKY_COOKIE"]] = "1"
+        self.assertEqual(self.get_aliases(self.factory.get(QUESTIONS_URL)), [None])
+        del self.factory.cookies[settings.REPLICA_ROUTING["STICKY_COOKIE"]]
+        self.assertEqual(self.get_aliases(self.factory.post(QUESTIONS_URL)), [None])
+
+    def test_response_cache_miss_reads_default_database_after_write(self) -> None:
+        view = QuestionViewSet()
+        token = replica_alias.set("replica_0")
+        self.addCleanup(replica_alias.reset, token)
+        view._read_primary_after_write()
+        self.assertIsNone(replica_alias.get())
+
+        replica_alias.set("replica_0")
+        later = time.time() + settings.REPLICA_ROUTING["STICKY_SECONDS"] + 1
+        with mock.patch("common.cache.time.time", return_value=later):
+            view._read_primary_after_write()
+        self.assertEqual(replica_alias.get(), "replica_0")
+
+    def test_token_client_reads_own_writes_without_cookie(self) -> None:
+        token = RefreshToken.for_user(self.user).access_token
+        headers = {"HTTP_AUTHORIZATION": f"Bearer {token}"}
+        client = APIClient(**headers)
+
+        response = client.post(
+            QUESTIONS_URL,
+            {"title": "New", "content": "New question"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 201)
+        read = self.factory.get(QUESTIONS_URL, **headers)
+        self.assertNotIn(settings.REPLICA_ROUTING["STICKY_COOKIE"], read.COOKIES)
+        self.assertIsNone(choose_replica(read))
+        self.assertIsNone(async_to_sync(achoose_replica)(read))
+        other = self.factory.get(QUESTIONS_URL, HTTP_AUTHORIZATION="Bearer other")
+        self.assertIn(choose_replica(other), self.replicas)
+
+    def get_aliases(
+        self,
+        request: HttpRequest,
+        operations: tuple[str, ...] | list[str] = ("read",),
+    ) -> list[str | None]:
+        aliases: list[str | None] = []
+
+        def get_response(request: HttpRequest) -> HttpResponse:
+            for operation in operations:
+                route = getattr(self.router, f"db_for_{operation}")
+                aliases.append(route(Question))
+            return HttpResponse()
+
+        ReplicaMiddleware(get_response)(request)
+        return aliases
+
+
+class PooledExecutorTests(SimpleTestCase):
+    """Requests take a pooled thread only when their sync code runs."""
+
+    def test_thread_is_taken_on_first_sync_call(self) -> None:
+        pool = ExecutorPool(1)
+
+        async def handle() -> tuple[int, int]:
+            async with PooledThreadSensitiveContext(pool):
+                created = pool.created
+                read_thread = sync_to_async(get_ident, thread_sensitive=True)
+                threads = {await read_thread(), await read_thread()}
+            return created, len(threads)
+
+        self.assertEqual(asyncio.run(handle()), (0, 1))
+        self.assertEqual(pool.created, 1)
+
+    def test_request_without_sync_code_takes_no_thread(self) -> None:
+        pool = ExecutorPool(1)
+
+        async def handle() -> None:
+            async with PooledThreadSensitiveContext(pool):
+                await asyncio.sleep(0)
+
+        asyncio.run(handle())
+
+        self.assertEqual(pool.created, 0)
+
+    def test_requests_share_threads_of_pool(self) -> None:
+        pool = ExecutorPool(1)
+        read_thread = sync_to_async(get_ident, thread_sensitive=True)
+
+        async def handle() -> int:
+            async with PooledThreadSensitiveContext(pool):
+                await asyncio.sleep(0)
+                return await read_thread()
+
+        async def handle_concurrently() -> list[int]:
+            return await asyncio.gather(*(handle() for _ in range(3)))
+
+        self.assertEqual(len(set(asyncio.run(handle_concurrently()))), 1)
+        self.assertEqual(pool.created, 1)
+
+    def test_unsupported_asgiref_fails_startup(self) -> None:
+        StreamingASGIHandler()
+
+        with mock.patch.object(SyncToAsync, "context_to_thread_executor", None):
+            with self.assertRaises(ImproperlyConfigured):
+                StreamingASGIHandler()
+
+
+@override_settings(DATABASE_CONNECTIONS={**settings.DATABASE_CONNECTIONS, "THREADS": 1})
+class StreamingASGIHandlerTests(SimpleTestCase):
+    """Queries of requests served by the ASGI handler run in pooled threads."""
+
+    databases = {"default"}
+
+    def test_queries_run_in_pooled_thread(self) -> None:
+        handler = StreamingASGIHandler()
+        threads = []
+        execute = CursorWrapper._execute_with_wrappers
+
+        def record_thread(cursor: CursorWrapper, *args: Any, **kwargs: Any) -> Any:
+            threads.append(current_thread().name)
+            return execute(cursor, *args, **kwargs)
+
+        with mock.patch.object(
+            CursorWrapper,
+            "_execute_with_wrappers",
+            autospec=True,
+            side_effect=record_thread,
+        ):
+            responses = [
+                asyncio.run(self._get(handler, QUESTIONS_URL, b"limit=10")),
+                asyncio.run(self._get(handler, TAGS_URL, b"stream=true")),
+            ]
+        asyncio.run(self._close_connections(handler))
+
+        self.assertEqual([status for status, _ in responses], [200, 200])
+        self.assertEqual(json.loads(responses[1][1]), [])
+        self.assertTrue(threads)
+        self.assertEqual(set(threads), {"asgi-1_0"})
+        self.assertEqual(handler.executors.created, 1)
+
+    @staticmethod
+    async def _get(
+        handler: StreamingASGIHandler,
+        path: str,
+        query_string: bytes,
+    ) -> tuple[int, bytes]:
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "root_path": "",
+            "query_string": query_string,
+            "headers": [(b"host", b"testserver")],
+            "server": ("testserver", 80),
+            "client": ("127.0.0.1", 1024),
+        }
+        messages = []
+
+        async def receive() -> dict[str, Any]:
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message: dict[str, Any]) -> None:
+            messages.append(message)
+
+        await handler(scope, receive, send)
+        body = b"".join(message.get("body", b"") for message in messages[1:])
+        return messages[0]["status"], body
+
+    @staticmethod
+    async def _close_connections(handler: StreamingASGIHandler) -> None:
+        async with PooledThreadSensitiveContext(handler.executors):
+            await sync_to_async(connections.close_all, thread_sensitive=True)()
+
+
+@override_settings(
+    RESPONSE_CACHE={"ENABLED": False, "ALIAS": "default", "TIMEOUT": 0},
+    FRONT_PAGE_SNAPSHOT={"ENABLED": False, "SIZE": 0},
+)
+class AsyncReadTests(ForumContentTestCase):
+    """Async actions return the same bytes as sync views."""
+
+    def test_async_and_sync_responses_are_equal(self) -> None:
+        factory = APIRequestFactory()
+        comment = Comment.objects.order_by("pk").first()
+        cases = [
+            (QuestionViewSet, "list", QUESTIONS_URL, {}, {}),
+            (QuestionViewSet, "list", QUESTIONS_URL, {"limit": "2", "skip": "1"}, {}),
+            (
+                QuestionViewSet,
+                "list",
+                QUESTIONS_URL,
+                {"order_by_date": "asc", FIELDS_QUERY_PARAM: "id,tags"},
+                {},
+            ),
+            (
+                QuestionViewSet,
+                "retrieve",
+                f"{QUESTIONS_URL}{self.questions[0].pk}/",
+                {},
+                {"pk": self.questions[0].pk},
+            ),
+            (
+                CommentViewSet,
+                "retrieve",
+                f"/api/forum/comments/{comment.pk}/",
+                {},
+                {"pk": comment.pk},
+            ),
+            (ArticleViewSet, "list", "/api/news/articles/", {}, {}),
+        ]
+        for viewset, action, url, params, kwargs in cases:
+            with self.subTest(viewset=viewset.__name__, action=action, params=params):
+                async_view = viewset.as_view({"get": action})
+                with override_settings(ASYNC_READS={"ENABLED": False}):
+                    sync_view = viewset.as_view({"get": action})
+                self.assertTrue(asyncio.iscoroutinefunction(async_view))
+
+                sync_response = sync_view(factory.get(url, params), **kwargs)
+                if hasattr(sync_response, "render"):
+                    sync_response.render()
+                async_response = async_to_sync(async_view)(
+                    factory.get(url, params),
+                    **kwargs,
+                )
+
+                self.assertEqual(sync_response.status_code, 200)
+                self.assertEqual(async_response.status_code, 200)
+                self.assertEqual(async_response.content, sync_response.content)
@@ -0,0 +1,122 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator
+
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.http import HttpRequest
+
+
+class Timings:
+    """Durations of request handling phases in seconds."""
+
+    def __init__(self, request: HttpRequest | None = None):
+        self.request = request
+        self.started_at = time.perf_counter()
+        self.durations: dict[str, float] = {}
+        self.queries = 0
+
+    def add(self, name: str, duration: float) -> None:
+        """Adds duration to phase.
+
+        :param name: Name of phase.
+        :param duration: Duration in seconds.
+        """
+        self.durations[name] = self.durations.get(name, 0) + duration
+
+    @property
+    def total(self) -> float:
+        """Seconds passed since start of request.
+
+        :return: Total duration.
+        """
+        return time.perf_counter() - self.started_at
+
+    def as_milliseconds(self) -> dict[str, float]:
+        """Returns durations of phases and total duration in milliseconds.
+
+        :return: Dict of phase names and durations.
+        """
+        durations = {**self.durations, "total": self.total}
+        return {name: round(duration * 1000, 3) for name, duration in durations.items()}
+
+    def get_server_timing(self) -> str:
+        """Returns value of Server-Timing header.
+
+        :return: Header value.
+        """
+        metrics = []
+        for name, duration in self.as_milliseconds().items():
+            metric = f"{name};dur={duration}"
+            if name == "db":
+                metric += f';desc="{self.queries} queries"'
+            metrics.append(metric)
+        return ", ".join(metrics)
+
+
+current_timings: ContextVar[Timings | None] = ContextVar(
+    "current_timings",
+    default=None,
+)
+
+
+@contextmanager
+def measure_timing(name: str) -> Iterator[None]:
+    """Adds duration of block to phase of current request.
+
+    Does nothing outside of request.
+
+    :param name: Name of phase.
+    :yield: None.
+    """
+    timings = current_timings.get()
+    if timings is None:
+        yield
+        return
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - started_at)
+
+
+def record_query(
+    execute: Callable[..., Any],
+    sql: str,
+    params: Any,
+    many: bool,
+    context: dict[str, Any],
+) -> Any:
+    """Execute wrapper adding duration of query to 'db' phase of current request.
+
+    :param execute: Function executing query.
+    :param sql: SQL.
+    :param params: Parameters of query.
+    :param many: Whether it is executemany.
+    :param context: Context of execution.
+    :return: Result of execution.
+    """
+    timings = current_timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    started_at = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.add("db", time.perf_counter() - started_at)
+        timings.queries += 1
+
+
+def install_query_timer(connection: BaseDatabaseWrapper, **kwargs: Any) -> None:
+    """Adds `record_query` wrapper to new database connection.
+
+    Connected to `connection_created` signal, so queries are timed in every
+    thread, including the ones running sync code of ASGI requests.
+
+    :param connection: Database connection.
+    :param kwargs: Signal kwargs.
+    """
+    if record_query not in connection.execute_wrappers:
+        # Connection may be created inside `execute_wrapper` block which pops
+        # the last wrapper on exit, so this one goes first.
+        connection.execute_wrappers.insert(0, record_query)
@@ -0,0 +1,160 @@
+import functools
+import time
+from typing import Any, Callable, Iterable, Type
+
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+from django.db import transaction
+from django.db.models import Model, signals
+
+VERSION_KEY_PREFIX = "rc:version:"
+MODIFIED_KEY_PREFIX = "rc:modified:"
+
+
+def get_cache() -> BaseCache:
+    """Returns cache backend used for responses and model versions.
+
+    :return: Cache backend.
+    """
+    return caches[settings.RESPONSE_CACHE["ALIAS"]]
+
+
+def get_version_key(model: Type[Model]) -> str:
+    """Returns cache key of model version counter.
+
+    :param model: Model class.
+    :return: Cache key.
+    """
+    return f"{VERSION_KEY_PREFIX}{model._meta.label_lower}"
+
+
+def get_modified_key(model: Type[Model]) -> str:
+    """Returns cache key of time of the latest model version bump.
+
+    :param model: Model class.
+    :return: Cache key.
+    """
+    return f"{MODIFIED_KEY_PREFIX}{model._meta.label_lower}"
+
+
+def _get_or_add_many(
+    keys: dict[str, str],
+    default: Callable[[], Any],
+) -> dict[str, Any]:
+    cache = get_cache()
+    values = cache.get_many(keys)
+    for key in keys.keys() - values.keys():
+        cache.add(key, default(), timeout=None)
+        values[key] = cache.get(key)
+    return {label: values[key] for key, label in keys.items()}
+
+
+async def _aget_or_add_many(
+    keys: dict[str, str],
+    default: Callable[[], Any],
+) -> dict[str, Any]:
+    cache = get_cache()
+    values = await cache.aget_many(keys)
+    for key in keys.keys() - values.keys():
+        await cache.aadd(key, default(), timeout=None)
+        values[key] = await cache.aget(key)
+    return {label: values[key] for key, label in keys.items()}
+
+
+def get_model_versions(models: Iterable[Type[Model]]) -> dict[str, int]:
+    """Returns current version counters of models.
+
+    Missing counters are initialized with current time, so that a counter evicted
+    from cache never starts again from a value that was already used.
+
+    :param models: Model classes.
+    :return: Dict of model labels and their versions.
+    """
+    keys = {get_version_key(model): model._meta.label_lower for model in models}
+    return _get_or_add_many(keys, time.time_ns)
+
+
+async def aget_model_versions(models: Iterable[Type[Model]]) -> dict[str, int]:
+    """Async counterpart of `get_model_versions`.
+
+    :param models: Model classes.
+    :return: Dict of model labels and their versions.
+    """
+    keys = {get_version_key(model): model._meta.label_lower for model in models}
+    return await _aget_or_add_many(keys, time.time_ns)
+
+
+def get_last_modified(models: Iterable[Type[Model]]) -> float:
+    """Returns time of the latest version bump of models.
+
+    Missing times are initialized with current time, so changes made before a
+    time was evicted from cache are never reported as older.
+
+    :param models: Model classes.
+    :return: Unix timestamp.
+    """
+    keys = {get_modified_key(model): model._meta.label_lower for model in models}
+    return max(_get_or_add_many(keys, time.time).values())
+
+
+async def aget_last_modified(models: Iterable[Type[Model]]) -> float:
+    """Async counterpart of `get_last_modified`.
+
+    :param models: Model classes.
+    :return: Unix timestamp.
+    """
+    keys = {get_modified_key(model): model._meta.label_lower for model in models}
+    return max((await _aget_or_add_many(keys, time.time)).values())
+
+
+def bump_model_version(model: Type[Model]) -> None:
+    """Increments version counter of model once the current transaction commits.
+
+    All cached responses depending on model become unreachable. Bumping before
+    the commit would let concurrent requests cache rows from before the change
+    under the new version. Outside transactions it is bumped immediately.
+
+    :param model: Model class.
+    """
+    transaction.on_commit(functools.partial(_bump_model_version, model))
+
+
+def _bump_model_version(model: Type[Model]) -> None:
+    cache = get_cache()
+    key = get_version_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, time.time_ns(), timeout=None):
+            cache.incr(key)
+    cache.set(get_modified_key(model), time.time(), timeout=None)
+
+
+def _on_model_change(sender: Type[Model], **kwargs: Any) -> None:
+    bump_model_version(sender)
+
+
+def _on_m2m_change(sender: Type[Model], instance: Model, **kwargs: Any) -> None:
+    if not kwargs["action"].startswith("post_"):
+        return
+    bump_model_version(type(instance))
+    bump_model_version(kwargs["model"])
+
+
+def track_model_versions(*models: Type[Model]) -> None:
+    """Bumps model versions on every change of models or their m2m relations.
+
+    Must be called from `AppConfig.ready`.
+
+    :param models: Model classes.
+    """
+    for model in models:
+        uid = f"rc:{model._meta.label_lower}"
+        signals.post_save.connect(_on_model_change, sender=model, dispatch_uid=uid)
+        signals.post_delete.connect(_on_model_change, sender=model, dispatch_uid=uid)
+        for field in model._meta.local_many_to_many:
+            signals.m2m_changed.connect(
+                _on_m2m_change,
+                sender=field.remote_field.through,
+                dispatch_uid=uid,
+            )
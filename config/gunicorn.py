@@ -0,0 +1,32 @@
+"""Gunicorn hooks keeping Prometheus multiprocess directory consistent."""
+import os
+import shutil
+from typing import Any
+
+MULTIPROCESS_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+
+def on_starting(server: Any) -> None:
+    """Removes metric files left by previous run of server.
+
+    :param server: Gunicorn arbiter.
+    """
+    directory = os.environ.get(MULTIPROCESS_DIR_ENV)
+    if directory:
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory)
+
+
+def child_exit(server: Any, worker: Any) -> None:
+    """Marks metrics of exited worker as dead, so its live gauges are dropped.
+
+    :param server: Gunicorn arbiter.
+    :param worker: Exited worker.
+    """
+    if not os.environ.get(MULTIPROCESS_DIR_ENV):
+        return
+    try:
+        from prometheus_client import multiprocess
+    except ImportError:  # pragma: no cover
+        return
+    multiprocess.mark_process_dead(worker.pid)
@@ -1,6 +1,7 @@
 from datetime import timedelta
 from pathlib import Path
 
+import dj_database_url
 from environs import Env
 
 env = Env()
@@ -27,6 +28,7 @@ CSRF_TRUSTED_ORIGINS = [
 ]
 
 CORS_ORIGIN_ALLOW_ALL = True
+CORS_EXPOSE_HEADERS = ["X-Possible-Duplicates", "Server-Timing"]
 
 INTERNAL_IPS = ["127.0.0.1", "localhost"]
 
@@ -41,30 +43,38 @@ INSTALLED_APPS = [
     # 3rd party
     "channels",
     "corsheaders",
-    "debug_toolbar",
     "django_filters",
     "rest_framework",
     "rest_framework_simplejwt",
     # Local
     "authentication",
     "chat",
+    "common",
     "forum",
     "news",
 ]
 
 MIDDLEWARE = [
+    "common.middleware.RequestTimingMiddleware",
+    "common.middleware.ReplicaMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "common.middleware.StaticFilesMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
+    "common.middleware.QueryInspectionMiddleware",
 ]
 
+# Toolbar is shown only in debug mode and can't handle async requests, so it
+# would switch requests of async views to a thread.
+if DEBUG:
+    INSTALLED_APPS.append("debug_toolbar")
+    MIDDLEWARE.insert(-1, "debug_toolbar.middleware.DebugToolbarMiddleware")
+
 ROOT_URLCONF = "config.urls"
 
 TEMPLATES = [
@@ -90,6 +100,144 @@ DATABASES = {
     "default": env.dj_db_url("DATABASE_URL", default="sqlite:///db.sqlite3"),
 }
 
+# Comma separated URLs of read replicas. Replicas mirror the default database in
+# tests.
+for number, url in enumerate(env.list("DATABASE_REPLICA_URLS", default=[])):
+    DATABASES[f"replica_{number}"] = {
+        **dj_database_url.parse(url),
+        "TEST": {"MIRROR": "default"},
+    }
+
+# Connections are kept open between requests and checked before reuse. Under
+# ASGI each worker runs sync code of requests in ASGI_THREADS threads, so it
+# keeps at most that many connections per database.
+DATABASE_CONNECTIONS = {
+    "MAX_AGE": env.int("CONN_MAX_AGE", default=60),
+    "HEALTH_CHECKS": env.bool("CONN_HEALTH_CHECKS", default=True),
+    "THREADS": env.int("ASGI_THREADS", default=8),
+}
+
+for database in DATABASES.values():
+    database["CONN_MAX_AGE"] = DATABASE_CONNECTIONS["MAX_AGE"]
+    database["CONN_HEALTH_CHECKS"] = DATABASE_CONNECTIONS["HEALTH_CHECKS"]
+
+DATABASE_ROUTERS = ["common.replicas.ReplicaRouter"]
+
+# Clients which have written something read from the default database until
+# the cookie expires. Token clients, which may not send cookies cross-origin,
+# are remembered in cache by their Authorization header for the same time.
+# Responses missing in the response cache are read from the default database
+# for the same time after their models change.
+REPLICA_ROUTING = {
+    "STICKY_COOKIE": "use_primary",
+    "STICKY_SECONDS": env.int("REPLICA_STICKY_SECONDS", default=5),
+}
+
+# Local memory cache is per process, use a shared backend (redis://, file://)
+# when several workers are running.
+CACHES = {
+    "default": env.dj_cache_url("CACHE_URL", default="locmem://"),
+}
+
+RESPONSE_CACHE = {
+    "ENABLED": env.bool("RESPONSE_CACHE_ENABLED", default=True),
+    "ALIAS": "default",
+    "TIMEOUT": env.int("RESPONSE_CACHE_TIMEOUT", default=300),
+}
+
+FRONT_PAGE_SNAPSHOT = {
+    "ENABLED": env.bool("FRONT_PAGE_SNAPSHOT_ENABLED", default=True),
+    "SIZE": env.int("FRONT_PAGE_SNAPSHOT_SIZE", default=50),
+}
+
+SINGLE_FLIGHT = {
+    "ENABLED": env.bool("SINGLE_FLIGHT_ENABLED", default=True),
+    "TIMEOUT": env.float("SINGLE_FLIGHT_TIMEOUT", default=5.0),
+}
+
+FAST_LIST = {
+    "ENABLED": env.bool("FAST_LIST_ENABLED", default=True),
+}
+
+# Hot read-only actions are served with async ORM by ASGI application. Read
+# when URLs are loaded.
+ASYNC_READS = {
+    "ENABLED": env.bool("ASYNC_READS_ENABLED", default=True),
+}
+
+# Changing half-life or weights requires `manage.py backfill question_hot_score`.
+HOT_SCORE = {
+    "HALF_LIFE_HOURS": env.float("HOT_SCORE_HALF_LIFE_HOURS", default=24),
+    "QUESTION_WEIGHT": 1.0,
+    "COMMENT_WEIGHT": 2.0,
+    "ANSWER_WEIGHT": 4.0,
+    "VIEW_WEIGHT": 0.5,
+}
+
+# Windows of trending tags in hours. Hourly buckets of tag activity older than
+# HOURLY_RETENTION_HOURS are merged into daily ones by `compact_tag_activity`.
+TRENDING_TAGS = {
+    "WINDOWS": {"24h": 24, "7d": 7 * 24},
+    "HOURLY_RETENTION_HOURS": env.int(
+        "TRENDING_TAGS_HOURLY_RETENTION_HOURS", default=48
+    ),
+    "DEFAULT_LIMIT": 10,
+    "MAX_LIMIT": 100,
+}
+
+# Co-occurrences kept per tag, the rest are dropped by
+# `rebuild_tag_cooccurrence`. Related questions are looked up among questions
+# latest tagged with TAGS tags most co-occurring with tags of question.
+RELATED_QUESTIONS = {
+    "MAX_PER_TAG": env.int("RELATED_QUESTIONS_MAX_PER_TAG", default=50),
+    "TAGS": 10,
+    "CANDIDATES_PER_TAG": 50,
+    "DEFAULT_LIMIT": 5,
+    "MAX_LIMIT": 20,
+}
+
+# Questions created with text similar to existing ones are flagged by
+# X-Possible-Duplicates header. Changing SHINGLE_SIZE, PERMUTATIONS or BANDS
+# requires `manage.py backfill question_signatures`.
+DUPLICATE_QUESTIONS = {
+    "ENABLED": env.bool("DUPLICATE_QUESTIONS_ENABLED", default=True),
+    "SHINGLE_SIZE": 3,
+    "PERMUTATIONS": 64,
+    "BANDS": 16,
+    "THRESHOLD": env.float("DUPLICATE_QUESTIONS_THRESHOLD", default=0.8),
+    "MAX_CANDIDATES": 100,
+    "LIMIT": 5,
+}
+
+REQUEST_TIMING = {
+    "ENABLED": env.bool("REQUEST_TIMING_ENABLED", default=True),
+    "SERVER_TIMING_HEADER": env.bool("SERVER_TIMING_HEADER", default=True),
+}
+
+# Prometheus metrics served at /metrics, requires prometheus_client. Request
+# metrics are recorded by RequestTimingMiddleware. Set PROMETHEUS_MULTIPROC_DIR
+# to aggregate metrics of several worker processes. Metrics are served to staff
+# users, INTERNAL_IPS and requests with "Authorization: Bearer <TOKEN>".
+METRICS = {
+    "ENABLED": env.bool("METRICS_ENABLED", default=True),
+    "TOKEN": env.str("METRICS_TOKEN", default=""),
+}
+
+# Logs queries slower than threshold to SLOW_QUERIES_LOG_FILE, a sample of them
+# with EXPLAIN output. Several workers append to the file, so it is rotated by
+# logrotate and reopened once moved.
+SLOW_QUERIES = {
+    "ENABLED": env.bool("SLOW_QUERIES_ENABLED", default=True),
+    "THRESHOLD_MS": env.float("SLOW_QUERIES_THRESHOLD_MS", default=200),
+    "EXPLAIN_SAMPLE_RATE": env.float("SLOW_QUERIES_EXPLAIN_SAMPLE_RATE", default=0.1),
+}
+
+# Logs repeated SQL and exceeded query budgets of requests.
+QUERY_INSPECTION = {
+    "ENABLED": env.bool("QUERY_INSPECTION_ENABLED", default=DEBUG),
+    "REPEATED_THRESHOLD": env.int("QUERY_INSPECTION_REPEATED_THRESHOLD", default=3),
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -112,6 +260,14 @@ LOGGING = {
         "console": {
             "class": "logging.StreamHandler",
         },
+        "slow_queries": {
+            "class": "logging.handlers.WatchedFileHandler",
+            "filename": env.str(
+                "SLOW_QUERIES_LOG_FILE",
+                default=str(BASE_DIR / "slow_queries.log"),
+            ),
+            "delay": True,
+        },
     },
     "loggers": {
         "django": {
@@ -119,18 +275,36 @@ LOGGING = {
             "level": "INFO",
             "propagate": False,
         },
+        "common": {
+            "handlers": ["console"],
+            "level": "INFO",
+            "propagate": False,
+        },
+        "common.slow_queries": {
+            "handlers": ["slow_queries"],
+            "level": "INFO",
+            "propagate": False,
+        },
     },
 }
 
 REST_FRAMEWORK = {
-    "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
-    ),
+    "DEFAULT_AUTHENTICATION_CLASSES": ("common.authentication.JWTAuthentication",),
     "DEFAULT_PAGINATION_CLASS": "common.pagination.LimitSkipPagination",
     "DEFAULT_FILTER_BACKENDS": ("django_filters.rest_framework.DjangoFilterBackend",),
-    "DEFAULT_RENDERER_CLASSES": ("rest_framework.renderers.JSONRenderer",),
+    "DEFAULT_RENDERER_CLASSES": ("common.renderers.FastJSONRenderer",),
+    "DEFAULT_PARSER_CLASSES": (
+        "common.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
 }
 
+STREAMING_CHUNK_SIZE = env.int("STREAMING_CHUNK_SIZE", default=500)
+# Streamed lists bypass response cache and conditional requests, shorter lists
+# are buffered unless streaming is requested with `stream=true`.
+STREAMING_MIN_ROWS = env.int("STREAMING_MIN_ROWS", default=1000)
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(days=30),
 }
@@ -0,0 +1,154 @@
+from typing import Any
+
+from django.conf import settings
+from django.db.models import (
+    Count,
+    Exists,
+    F,
+    Max,
+    OuterRef,
+    QuerySet,
+    Subquery,
+    Value,
+    signals,
+)
+from django.db.models.functions import Coalesce, Greatest, Now
+
+from common.backfill import Backfill, register_backfill
+from common.versions import bump_model_version
+from forum import hotness
+from forum.models import Comment, Question
+
+
+def _has_answer() -> Exists:
+    return Exists(Comment.objects.filter(question=OuterRef("pk"), is_answer=True))
+
+
+def get_activity_expressions() -> dict[str, Any]:
+    """Returns expressions computing activity fields of question from comments.
+
+    :return: Dict of field names and expressions for `QuerySet.update`.
+    """
+    comments = (
+        Comment.objects.filter(question=OuterRef("pk")).order_by().values("question")
+    )
+    answers = comments.filter(is_answer=True)
+    return {
+        "comment_count": Coalesce(
+            Subquery(comments.annotate(count=Count("pk")).values("count")),
+            0,
+        ),
+        "answer_count": Coalesce(
+            Subquery(answers.annotate(count=Count("pk")).values("count")),
+            0,
+        ),
+        "has_answer": _has_answer(),
+        "last_activity_at": Coalesce(
+            Subquery(comments.annotate(last=Max("date_created")).values("last")),
+            F("date_created"),
+        ),
+    }
+
+
+register_backfill(Backfill("question_activity", Question, get_activity_expressions))
+
+
+def refresh_question_activity(questions: QuerySet[Question]) -> int:
+    """Recomputes comment counters, last activity and hot scores of questions.
+
+    Used after comments are inserted in bulk, which sends no signals.
+
+    :param questions: Questions to refresh.
+    :return: Number of updated questions.
+    """
+    updated = questions.update(**get_activity_expressions(), updated_at=Now())
+    hotness.refresh_hot_scores(questions)
+    bump_model_version(Question)
+    return updated
+
+
+def _decrement(field: str) -> Greatest:
+    # Counters don't go below zero if they were already off, e.g. rows
+    # inserted in bulk before the backfill.
+    return Greatest(F(field) - 1, Value(0))
+
+
+def _update_question(question_id: int, **fields: Any) -> None:
+    Question.objects.filter(pk=question_id).update(**fields, updated_at=Now())
+    bump_model_version(Question)
+
+
+def _on_question_saved(instance: Question, created: bool, **kwargs: Any) -> None:
+    old_views = getattr(instance, "_loaded_views", None)
+    new_views = instance._loaded_views = int(instance.views)
+    if created:
+        score = hotness.get_created_score(instance.date_created)
+        _update_question(instance.pk, hot_score=score)
+    elif old_views is None:
+        refresh_question_activity(Question.objects.filter(pk=instance.pk))
+    elif old_views != new_views:
+        score = hotness.change_views(old_views, new_views)
+        _update_question(instance.pk, hot_score=score)
+
+
+def _on_comment_saved(instance: Comment, created: bool, **kwargs: Any) -> None:
+    was_answer = getattr(instance, "_loaded_is_answer", None)
+    instance._loaded_is_answer = instance.is_answer
+    if created:
+        weight = hotness.get_comment_weight(instance.is_answer)
+        fields = {
+            "comment_count": F("comment_count") + 1,
+            "last_activity_at": Greatest(
+                "last_activity_at",
+                Value(instance.date_created),
+            ),
+            "hot_score": hotness.add_event(weight, instance.date_created),
+        }
+        if instance.is_answer:
+            fields.update(answer_count=F("answer_count") + 1, has_answer=True)
+        _update_question(instance.question_id, **fields)
+    elif was_answer is None:
+        refresh_question_activity(Question.objects.filter(pk=instance.question_id))
+    elif was_answer != instance.is_answer:
+        fields = {"has_answer": _has_answer()}
+        if instance.is_answer:
+            weight = settings.HOT_SCORE["ANSWER_WEIGHT"]
+            fields.update(
+                answer_count=F("answer_count") + 1,
+                hot_score=hotness.add_event(weight, instance.date_created),
+            )
+        else:
+            _refresh_hot_score(instance.question_id)
+            fields.update(answer_count=_decrement("answer_count"))
+        _update_question(instance.question_id, **fields)
+
+
+def _on_comment_deleted(instance: Comment, **kwargs: Any) -> None:
+    fields = {"comment_count": _decrement("comment_count")}
+    if getattr(instance, "_loaded_is_answer", instance.is_answer):
+        fields.update(answer_count=_decrement("answer_count"), has_answer=_has_answer())
+    _refresh_hot_score(instance.question_id)
+    _update_question(instance.question_id, **fields)
+
+
+def _refresh_hot_score(question_id: int) -> None:
+    # Removed events are not subtracted, that loses precision when they outweigh
+    # the rest. Locked, so that events added concurrently are not lost.
+    questions = Question.objects.filter(pk=question_id).select_for_update()
+    hotness.refresh_hot_scores(questions)
+
+
+def track_question_activity() -> None:
+    """Keeps activity fields and hot scores of questions in sync.
+
+    Counters and scores are changed with F() expressions in the transaction of
+    comment change, so concurrent comments don't overwrite each other's
+    changes. Hot scores are recomputed when comments are deleted or unmarked as
+    answers. Last activity is the time of the latest comment ever added, it is
+    not moved back when comments are deleted. Must be called from
+    `AppConfig.ready`.
+    """
+    uid = "forum:question_activity"
+    signals.post_save.connect(_on_question_saved, sender=Question, dispatch_uid=uid)
+    signals.post_save.connect(_on_comment_saved, sender=Comment, dispatch_uid=uid)
+    signals.post_delete.connect(_on_comment_deleted, sender=Comment, dispatch_uid=uid)
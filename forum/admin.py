@@ -1,7 +1,38 @@
 from django.contrib import admin
+from django.db.models import QuerySet
+from django.http import HttpRequest
 
 from forum.models import Comment, Question, Tag
 
+
+class QuestionAdmin(admin.ModelAdmin):
+    """Question model renderer in admin panel."""
+
+    list_display = ("title", "author", "date_created", "views")
+    list_select_related = ("author",)
+    search_fields = ("title",)
+    raw_id_fields = ("author",)
+
+
+class CommentAdmin(admin.ModelAdmin):
+    """Comment model renderer in admin panel.
+
+    Author is selected because it is a part of comment's string representation.
+    """
+
+    list_display = ("__str__", "question", "date_created", "is_answer")
+    list_select_related = ("author", "question")
+    raw_id_fields = ("author", "question")
+
+    def get_queryset(self, request: HttpRequest) -> QuerySet[Comment]:
+        """Returns queryset of comments selecting their authors.
+
+        :param request: Current request.
+        :return: Queryset of comments with selected authors.
+        """
+        return super().get_queryset(request).select_related("author")
+
+
 admin.site.register(Tag)
-admin.site.register(Question)
-admin.site.register(Comment)
+admin.site.register(Question, QuestionAdmin)
+admin.site.register(Comment, CommentAdmin)
@@ -6,3 +6,22 @@ class ForumConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "forum"
+
+    def ready(self) -> None:
+        """Tracks changes of forum models.
+
+        Cached responses are invalidated, activity of questions and tags is
+        updated and text of questions is indexed.
+        """
+        from common.versions import track_model_versions
+        from forum.activity import track_question_activity
+        from forum.duplicates import track_question_signatures
+        from forum.models import Comment, Question, Tag
+        from forum.related import track_tag_cooccurrence
+        from forum.trending import track_tag_activity
+
+        track_model_versions(Tag, Question, Comment)
+        track_question_activity()
+        track_tag_activity()
+        track_tag_cooccurrence()
+        track_question_signatures()
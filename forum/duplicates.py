@@ -0,0 +1,257 @@
+import hashlib
+import random
+import re
+import struct
+from functools import lru_cache
+from typing import Any, Iterable
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q, signals
+
+from common.backfill import Backfill, register_backfill
+from forum.models import Question, QuestionLSHBand, QuestionSignature
+
+# Hash functions a * x + b modulo Mersenne prime stand for random permutations,
+# their coefficients are generated from a fixed seed so signatures stay
+# comparable between processes.
+PRIME = (1 << 61) - 1
+SEED = 1
+VALUE_FORMAT = "<I"
+VALUE_SIZE = struct.calcsize(VALUE_FORMAT)
+WORD_RE = re.compile(r"\w+")
+
+
+def _hash(data: bytes, size: int, signed: bool = False) -> int:
+    digest = hashlib.blake2b(data, digest_size=size).digest()
+    return int.from_bytes(digest, "little", signed=signed)
+
+
+def get_shingles(title: str, content: str) -> set[int]:
+    """Returns hashes of word shingles of question text.
+
+    Words are lowercased, so case and punctuation don't make texts different.
+
+    :param title: Title of question.
+    :param content: Content of question.
+    :return: Hashes of every `SHINGLE_SIZE` consecutive words.
+    """
+    words = WORD_RE.findall(f"{title} {content}".lower())
+    if not words:
+        return set()
+    size = settings.DUPLICATE_QUESTIONS["SHINGLE_SIZE"]
+    return {
+        _hash(" ".join(words[start : start + size]).encode(), 4)
+        for start in range(max(len(words) - size + 1, 1))
+    }
+
+
+@lru_cache
+def _get_hash_functions(count: int) -> list[tuple[int, int]]:
+    rng = random.Random(SEED)  # noqa: S311
+    return [(rng.randrange(1, PRIME), rng.randrange(PRIME)) for _ in range(count)]
+
+
+def get_signature(title: str, content: str) -> bytes | None:
+    """Returns MinHash signature of question text.
+
+    Every value is the minimum of a hash function over shingles, the share of
+    equal values of two signatures estimates Jaccard similarity of shingles.
+
+    :param title: Title of question.
+    :param content: Content of question.
+    :return: Packed 32-bit values, None if text has no words.
+    """
+    shingles = get_shingles(title, content)
+    if not shingles:
+        return None
+    functions = _get_hash_functions(settings.DUPLICATE_QUESTIONS["PERMUTATIONS"])
+    return b"".join(
+        struct.pack(
+            VALUE_FORMAT,
+            min((a * shingle + b) % PRIME for shingle in shingles) & 0xFFFFFFFF,
+        )
+        for a, b in functions
+    )
+
+
+def get_bands(signature: bytes) -> list[int]:
+    """Returns hashes of bands of signature.
+
+    Texts with similarity s share at least one of b bands of r values with
+    probability 1 - (1 - s ** r) ** b, e.g. 99.98% for s = 0.8, b = 16, r = 4.
+
+    :param signature: MinHash signature.
+    :return: Signed 64-bit hash of every band.
+    """
+    size = len(signature) // settings.DUPLICATE_QUESTIONS["BANDS"]
+    return [
+        _hash(signature[start : start + size], 8, signed=True)
+        for start in range(0, len(signature), size)
+    ]
+
+
+def get_similarity(signature: bytes, other: bytes) -> float:
+    """Returns estimated Jaccard similarity of texts of signatures.
+
+    :param signature: MinHash signature.
+    :param other: Other MinHash signature.
+    :return: Share of equal values, 0 if signatures are not comparable.
+    """
+    if len(signature) != len(other):
+        return 0.0
+    equal = sum(
+        signature[start : start + VALUE_SIZE] == other[start : start + VALUE_SIZE]
+        for start in range(0, len(signature), VALUE_SIZE)
+    )
+    return equal / (len(signature) // VALUE_SIZE)
+
+
+def find_duplicate_ids(
+    title: str,
+    content: str,
+    exclude_id: int | None = None,
+) -> list[int]:
+    """Returns ids of questions with text similar to given one.
+
+    Candidates are found by index of LSH bands, so only questions sharing a
+    band are compared, at most `MAX_CANDIDATES` sharing the most bands.
+
+    :param title: Title of question.
+    :param content: Content of question.
+    :param exclude_id: Id of question excluded from results.
+    :return: Ids of questions with similarity of at least `THRESHOLD`, most
+     similar first.
+    """
+    config = settings.DUPLICATE_QUESTIONS
+    signature = get_signature(title, content)
+    if signature is None:
+        return []
+
+    bands = Q()
+    for band, bucket in enumerate(get_bands(signature)):
+        bands |= Q(band=band, bucket=bucket)
+    # Questions sharing more bands are likely more similar, newer ones go first
+    # among equal.
+    candidate_ids = (
+        QuestionLSHBand.objects.filter(bands)
+        .exclude(question_id=exclude_id)
+        .values("question_id")
+        .annotate(matches=Count("pk"))
+        .order_by("-matches", "-question_id")
+        .values("question_id")[: config["MAX_CANDIDATES"]]
+    )
+    candidates = QuestionSignature.objects.filter(question_id__in=candidate_ids)
+    similarities = [
+        (get_similarity(signature, bytes(minhash)), question_id)
+        for question_id, minhash in candidates.values_list("question_id", "minhash")
+    ]
+    duplicates = sorted(
+        (item for item in similarities if item[0] >= config["THRESHOLD"]),
+        key=lambda item: (-item[0], item[1]),
+    )
+    return [question_id for _, question_id in duplicates[: config["LIMIT"]]]
+
+
+def index_questions(questions: Iterable[Question]) -> int:
+    """Replaces signatures and LSH bands of questions.
+
+    :param questions: Questions with loaded title and content.
+    :return: Number of questions with signatures.
+    """
+    questions = list(questions)
+    signatures = []
+    bands = []
+    for question in questions:
+        signature = get_signature(question.title, question.content)
+        if signature is None:
+            continue
+        signatures.append(QuestionSignature(question_id=question.pk, minhash=signature))
+        bands.extend(
+            QuestionLSHBand(question_id=question.pk, band=band, bucket=bucket)
+            for band, bucket in enumerate(get_bands(signature))
+        )
+
+    pks = [question.pk for question in questions]
+    with transaction.atomic():
+        QuestionSignature.objects.filter(question_id__in=pks).delete()
+        QuestionLSHBand.objects.filter(question_id__in=pks).delete()
+        QuestionSignature.objects.bulk_create(signatures)
+        QuestionLSHBand.objects.bulk_create(bands)
+    return len(signatures)
+
+
+class SignatureBackfill(Backfill):
+    """Recomputes MinHash signatures and LSH bands of questions.
+
+    Must be run after questions are inserted in bulk or signature settings are
+    changed.
+    """
+
+    def fill(self, start: int, end: int) -> int:
+        """Indexes questions with primary keys in range (start, end].
+
+        Questions are locked, so edits made meanwhile wait for the batch.
+
+        :param start: Primary key before the range.
+        :param end: Last primary key of the range.
+        :return: Number of indexed questions.
+        """
+        questions = self.get_queryset().filter(pk__gt=start, pk__lte=end)
+        return index_questions(
+            questions.select_for_update().only("pk", "title", "content"),
+        )
+
+    def find_mismatches(self, pks: list[int]) -> list[int]:
+        """Recomputes signatures of questions and compares them with stored ones.
+
+        :param pks: Primary keys of checked questions.
+        :return: Primary keys of questions with outdated signatures or bands.
+        """
+        questions = self.get_queryset().filter(pk__in=pks).only("title", "content")
+        signatures = dict(
+            QuestionSignature.objects.filter(question_id__in=pks).values_list(
+                "question_id",
+                "minhash",
+            ),
+        )
+        bands: dict[int, list[int]] = {pk: [] for pk in pks}
+        rows = (
+            QuestionLSHBand.objects.filter(question_id__in=pks)
+            .order_by("question_id", "band")
+            .values_list("question_id", "bucket")
+        )
+        for question_id, bucket in rows:
+            bands[question_id].append(bucket)
+
+        mismatches = []
+        for question in questions:
+            signature = get_signature(question.title, question.content)
+            expected = (signature, get_bands(signature) if signature else [])
+            stored = signatures.get(question.pk)
+            if (stored and bytes(stored), bands[question.pk]) != expected:
+                mismatches.append(question.pk)
+        return mismatches
+
+
+register_backfill(SignatureBackfill("question_signatures", Question))
+
+
+def _on_question_saved(instance: Question, **kwargs: Any) -> None:
+    text = (instance.title, instance.content)
+    if getattr(instance, "_loaded_text", None) == text:
+        return
+    instance._loaded_text = text
+    index_questions([instance])
+
+
+def track_question_signatures() -> None:
+    """Indexes text of questions when they are created or their text changes.
+
+    Must be called from `AppConfig.ready`.
+    """
+    signals.post_save.connect(
+        _on_question_saved,
+        sender=Question,
+        dispatch_uid="forum:question_signatures",
+    )
@@ -0,0 +1,76 @@
+from typing import Iterator
+
+from authentication.models import User
+from common.ndjson import Record, fetch_field, fetch_related, iter_row_chunks
+from forum.models import Comment, Question, Tag
+
+QuestionTag = Question.tags.through
+
+
+def export_tags(chunk_size: int) -> Iterator[Record]:
+    """Yields records of all tags.
+
+    :param chunk_size: Number of rows fetched from database at once.
+    :yield: Tag records.
+    """
+    rows = Tag.objects.order_by("pk").values("id", "title")
+    for chunk in iter_row_chunks(rows, chunk_size):
+        for row in chunk:
+            yield {"type": "tag", **row}
+
+
+def export_questions(chunk_size: int) -> Iterator[Record]:
+    """Yields records of all questions with their authors and tag titles.
+
+    Authors and tags are fetched with one query per chunk.
+
+    :param chunk_size: Number of rows fetched from database at once.
+    :yield: Question records.
+    """
+    rows = Question.objects.order_by("pk").values(
+        "id",
+        "title",
+        "content",
+        "date_created",
+        "views",
+        "author_id",
+    )
+    for chunk in iter_row_chunks(rows, chunk_size):
+        ids = [row["id"] for row in chunk]
+        usernames = fetch_field(User, (row["author_id"] for row in chunk), "username")
+        tags = fetch_related(QuestionTag, "question", "tag__title", ids)
+        for row in chunk:
+            author_id = row.pop("author_id")
+            yield {
+                "type": "question",
+                **row,
+                "author": {"id": author_id, "username": usernames.get(author_id)},
+                "tags": tags.get(row["id"], []),
+            }
+
+
+def export_comments(chunk_size: int) -> Iterator[Record]:
+    """Yields records of all comments with their authors.
+
+    Authors are fetched with one query per chunk.
+
+    :param chunk_size: Number of rows fetched from database at once.
+    :yield: Comment records.
+    """
+    rows = Comment.objects.order_by("pk").values(
+        "id",
+        "content",
+        "date_created",
+        "is_answer",
+        "question_id",
+        "author_id",
+    )
+    for chunk in iter_row_chunks(rows, chunk_size):
+        usernames = fetch_field(User, (row["author_id"] for row in chunk), "username")
+        for row in chunk:
+            author_id = row.pop("author_id")
+            yield {
+                "type": "comment",
+                **row,
+                "author": {"id": author_id, "username": usernames.get(author_id)},
+            }
@@ -0,0 +1,190 @@
+import math
+from collections import defaultdict
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from typing import Iterable
+
+from django.conf import settings
+from django.db.models import Expression, F, QuerySet, Value
+from django.db.models.functions import Exp, Greatest, Ln
+
+from common.backfill import Backfill, register_backfill
+from forum.models import Comment, Question
+
+# Hot score is the logarithm of the sum of event weights, each multiplied by
+# 2 ** (hours from epoch to event / half-life), plus a views term. Old events
+# are not decayed, new ones weigh more instead, so stored scores keep the order
+# of decayed ones at any moment and never have to be rewritten as time passes.
+EPOCH = datetime(2020, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def get_event_score(weight: float, at: datetime) -> float:
+    """Returns score of single event in logarithmic scale.
+
+    :param weight: Weight of event.
+    :param at: Time of event.
+    :return: Score.
+    """
+    half_life = timedelta(hours=settings.HOT_SCORE["HALF_LIFE_HOURS"])
+    return math.log(weight) + (at - EPOCH) / half_life * math.log(2)
+
+
+def get_comment_weight(is_answer: bool) -> float:
+    """Returns weight of comment event.
+
+    :param is_answer: Whether comment is an answer.
+    :return: Weight.
+    """
+    weights = settings.HOT_SCORE
+    return weights["COMMENT_WEIGHT"] + (weights["ANSWER_WEIGHT"] if is_answer else 0)
+
+
+def get_views_score(views: int) -> float:
+    """Returns part of score added by views.
+
+    Times of views are unknown, so they are not decayed but count logarithmically.
+
+    :param views: Number of views.
+    :return: Score.
+    """
+    return settings.HOT_SCORE["VIEW_WEIGHT"] * math.log1p(views)
+
+
+def compute_hot_score(
+    date_created: datetime,
+    views: int,
+    comments: Iterable[tuple[datetime, bool]],
+) -> float:
+    """Returns hot score of question.
+
+    :param date_created: Creation time of question.
+    :param views: Number of views.
+    :param comments: Creation times of comments and whether they are answers.
+    :return: Score.
+    """
+    scores = [get_event_score(settings.HOT_SCORE["QUESTION_WEIGHT"], date_created)]
+    scores += [
+        get_event_score(get_comment_weight(is_answer), created_at)
+        for created_at, is_answer in comments
+    ]
+    top = max(scores)
+    events = top + math.log(sum(math.exp(score - top) for score in scores))
+    return events + get_views_score(views)
+
+
+def compute_hot_scores(questions: Iterable[Question]) -> dict[int, float]:
+    """Returns hot scores of questions computed from their comments.
+
+    :param questions: Questions with loaded creation time and views.
+    :return: Dict of question ids and scores.
+    """
+    questions = list(questions)
+    comments: dict[int, list[tuple[datetime, bool]]] = defaultdict(list)
+    rows = Comment.objects.filter(question__in=questions).values_list(
+        "question_id",
+        "date_created",
+        "is_answer",
+    )
+    for question_id, *comment in rows:
+        comments[question_id].append(comment)
+    return {
+        question.pk: compute_hot_score(
+            question.date_created,
+            question.views,
+            comments[question.pk],
+        )
+        for question in questions
+    }
+
+
+def refresh_hot_scores(questions: QuerySet[Question]) -> int:
+    """Recomputes hot scores of questions.
+
+    :param questions: Questions to refresh.
+    :return: Number of updated questions.
+    """
+    questions = list(questions.only("pk", "date_created", "views"))
+    scores = compute_hot_scores(questions)
+    for question in questions:
+        question.hot_score = scores[question.pk]
+    return Question.objects.bulk_update(questions, ["hot_score"])
+
+
+def _get_event_expression(weight: float, at: datetime) -> Expression:
+    views = settings.HOT_SCORE["VIEW_WEIGHT"] * Ln(F("views") + 1)
+    return Value(get_event_score(weight, at)) + views
+
+
+def get_created_score(at: datetime) -> Expression:
+    """Returns expression of hot score of new question.
+
+    :param at: Creation time of question.
+    :return: Expression for `QuerySet.update`.
+    """
+    return _get_event_expression(settings.HOT_SCORE["QUESTION_WEIGHT"], at)
+
+
+def add_event(weight: float, at: datetime) -> Expression:
+    """Returns expression adding event to stored hot score.
+
+    Logarithm of sum is computed relative to the bigger term, so exponents
+    don't overflow.
+
+    :param weight: Weight of event.
+    :param at: Time of event.
+    :return: Expression for `QuerySet.update`.
+    """
+    event = _get_event_expression(weight, at)
+    top = Greatest(F("hot_score"), event)
+    return top + Ln(Exp(F("hot_score") - top) + Exp(event - top))
+
+
+def change_views(old: int, new: int) -> Expression:
+    """Returns expression replacing views part of stored hot score.
+
+    :param old: Previous number of views.
+    :param new: New number of views.
+    :return: Expression for `QuerySet.update`.
+    """
+    return F("hot_score") + Value(get_views_score(new) - get_views_score(old))
+
+
+class HotScoreBackfill(Backfill):
+    """Recomputes hot scores of questions from their comments.
+
+    Must be run after weights or half-life are changed. Running it periodically
+    also corrects rounding errors accumulated by incremental updates.
+    """
+
+    def fill(self, start: int, end: int) -> int:
+        """Recomputes scores of questions with primary keys in range (start, end].
+
+        Questions are locked, so scores changed meanwhile wait for the batch.
+
+        :param start: Primary key before the range.
+        :param end: Last primary key of the range.
+        :return: Number of updated rows.
+        """
+        questions = self.get_queryset().filter(pk__gt=start, pk__lte=end)
+        return refresh_hot_scores(questions.select_for_update())
+
+    def find_mismatches(self, pks: list[int]) -> list[int]:
+        """Recomputes scores of questions and compares them with stored ones.
+
+        :param pks: Primary keys of checked questions.
+        :return: Primary keys of questions with outdated scores.
+        """
+        questions = list(
+            self.get_queryset()
+            .filter(pk__in=pks)
+            .only("pk", "date_created", "views", "hot_score"),
+        )
+        scores = compute_hot_scores(questions)
+        return [
+            question.pk
+            for question in questions
+            if not math.isclose(question.hot_score, scores[question.pk], abs_tol=1e-6)
+        ]
+
+
+register_backfill(HotScoreBackfill("question_hot_score", Question))
@@ -0,0 +1,201 @@
+from collections import Counter
+from typing import Any, Iterable, Type
+
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Model
+
+from authentication.models import User
+from common.ndjson import Record
+from common.versions import bump_model_version
+from forum.activity import refresh_question_activity
+from forum.duplicates import index_questions
+from forum.models import Comment, Question, Tag
+
+QuestionTag = Question.tags.through
+
+IMPORTED_MODELS = (Tag, Question, Comment)
+
+
+class ForumImporter:
+    """Imports tag, question and comment records in bulk.
+
+    Records have the format written by `export_forum`. Questions and comments
+    keep their ids. Rows imported before are skipped, so importing the same
+    records twice is safe, but ids of other existing rows are refused. Authors
+    are matched by username.
+    """
+
+    def __init__(self, default_author: str | None = None):
+        self.default_author = default_author
+        self.tag_ids: dict[str, int] = {}
+        self.user_ids: dict[str, int] = {}
+        self.counts: Counter[str] = Counter()
+
+    def import_records(self, records: list[Record]) -> None:
+        """Imports chunk of records in a single transaction.
+
+        :param records: Parsed records.
+        :raises ValueError: if a record is invalid, its author does not exist or
+         its id belongs to another row.
+        """
+        grouped: dict[str, list[Record]] = {"tag": [], "question": [], "comment": []}
+        for record in records:
+            group = grouped.get(record.get("type"))
+            if group is None:
+                self.counts["skipped"] += 1
+                continue
+            group.append(record)
+
+        try:
+            with transaction.atomic():
+                self._resolve_tags(
+                    [record["title"] for record in grouped["tag"]]
+                    + [
+                        title
+                        for record in grouped["question"]
+                        for title in record.get("tags", [])
+                    ],
+                )
+                self._resolve_authors(grouped["question"] + grouped["comment"])
+                self._import_questions(grouped["question"])
+                self._import_comments(grouped["comment"])
+                # Bulk inserts send no signals updating activity of questions.
+                refresh_question_activity(
+                    Question.objects.filter(
+                        pk__in={record["id"] for record in grouped["question"]}
+                        | {record["question_id"] for record in grouped["comment"]},
+                    ),
+                )
+        except KeyError as exc:
+            raise ValueError(f"Record has no field {exc}.") from exc
+
+        for model in IMPORTED_MODELS:
+            bump_model_version(model)
+
+    def _resolve_tags(self, titles: Iterable[str]) -> None:
+        new_titles = set(titles) - self.tag_ids.keys()
+        if not new_titles:
+            return
+        existing = dict(
+            Tag.objects.filter(title__in=new_titles).values_list("title", "pk"),
+        )
+        created = Tag.objects.bulk_create(
+            [Tag(title=title) for title in new_titles - existing.keys()],
+            ignore_conflicts=True,
+        )
+        self.tag_ids.update(
+            Tag.objects.filter(title__in=new_titles).values_list("title", "pk"),
+        )
+        self.counts["tags"] += len(created)
+
+    def _resolve_authors(self, records: list[Record]) -> None:
+        usernames = {record["author"]["username"] for record in records}
+        if self.default_author:
+            usernames.add(self.default_author)
+        new_usernames = usernames - self.user_ids.keys()
+        self.user_ids.update(
+            User.objects.filter(username__in=new_usernames).values_list(
+                "username",
+                "pk",
+            ),
+        )
+
+    def _get_author_id(self, record: Record) -> int:
+        username = record["author"]["username"]
+        author_id = self.user_ids.get(username) or self.user_ids.get(
+            self.default_author,
+        )
+        if author_id is None:
+            raise ValueError(f"User '{username}' does not exist.")
+        return author_id
+
+    def _import_questions(self, records: list[Record]) -> None:
+        new_records = self._get_new_records(Question, records, ("title",))
+        questions = [
+            Question(
+                pk=record["id"],
+                title=record["title"],
+                content=record["content"],
+                views=record.get("views", 0),
+                author_id=self._get_author_id(record),
+                **self._get_date_created(record),
+            )
+            for record in new_records
+        ]
+        Question.objects.bulk_create(questions)
+        # Bulk inserts send no signals indexing questions for duplicate search.
+        index_questions(questions)
+        QuestionTag.objects.bulk_create(
+            QuestionTag(question_id=record["id"], tag_id=self.tag_ids[title])
+            for record in new_records
+            for title in set(record.get("tags", []))
+        )
+        self.counts["questions"] += len(questions)
+        self.counts["skipped"] += len(records) - len(questions)
+
+    def _import_comments(self, records: list[Record]) -> None:
+        question_ids = set(
+            Question.objects.filter(
+                pk__in={record["question_id"] for record in records},
+            ).values_list("pk", flat=True),
+        )
+        new_records = self._get_new_records(
+            Comment,
+            [record for record in records if record["question_id"] in question_ids],
+            ("question_id", "content"),
+        )
+        comments = [
+            Comment(
+                pk=record["id"],
+                content=record["content"],
+                is_answer=record.get("is_answer", False),
+                question_id=record["question_id"],
+                author_id=self._get_author_id(record),
+                **self._get_date_created(record),
+            )
+            for record in new_records
+        ]
+        Comment.objects.bulk_create(comments)
+        self.counts["comments"] += len(comments)
+        self.counts["skipped"] += len(records) - len(comments)
+
+    @staticmethod
+    def _get_new_records(
+        model: Type[Model],
+        records: list[Record],
+        fields: tuple[str, ...],
+    ) -> list[Record]:
+        # Existing rows must have been imported from the same records before,
+        # otherwise their ids collide with ids of records.
+        existing = {
+            pk: tuple(values)
+            for pk, *values in model.objects.filter(
+                pk__in={record["id"] for record in records},
+            ).values_list("pk", *fields)
+        }
+        new_records: dict[Any, Record] = {}
+        for record in records:
+            values = existing.get(record["id"])
+            if values is None:
+                new_records.setdefault(record["id"], record)
+            elif values != tuple(record[field] for field in fields):
+                raise ValueError(
+                    f"{model._meta.verbose_name.capitalize()} {record['id']} "
+                    "already exists and differs from its record.",
+                )
+        return list(new_records.values())
+
+    @staticmethod
+    def _get_date_created(record: Record) -> dict[str, Any]:
+        if record.get("date_created") is None:
+            return {}
+        return {"date_created": record["date_created"]}
+
+
+def reset_sequences() -> None:
+    """Moves primary key sequences past ids inserted explicitly."""
+    statements = connection.ops.sequence_reset_sql(no_style(), IMPORTED_MODELS)
+    with connection.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
@@ -0,0 +1,41 @@
+# Generated by Django 4.1 on 2026-10-19 12:00
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("forum", "0003_delete_notification"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comment",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True,
+                default=django.utils.timezone.now,
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="question",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True,
+                default=django.utils.timezone.now,
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="tag",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True,
+                default=django.utils.timezone.now,
+            ),
+            preserve_default=False,
+        ),
+    ]
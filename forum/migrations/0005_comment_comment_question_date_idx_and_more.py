@@ -0,0 +1,35 @@
+# Generated by Django 4.1.13 on 2026-10-19 14:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("forum", "0004_comment_updated_at_question_updated_at_tag_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["question", "date_created"], name="comment_question_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="question",
+            index=models.Index(
+                fields=["date_created"], name="question_date_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="question",
+            index=models.Index(fields=["-views"], name="question_views_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="question",
+            index=models.Index(
+                fields=["author", "-date_created"], name="question_author_date_idx"
+            ),
+        ),
+    ]
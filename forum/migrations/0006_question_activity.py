@@ -0,0 +1,79 @@
+# Generated by Django 4.1.13 on 2026-10-19 14:37
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import Count, Exists, F, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_question_activity(apps, schema_editor):
+    Comment = apps.get_model("forum", "Comment")
+    Question = apps.get_model("forum", "Question")
+    comments = (
+        Comment.objects.filter(question=OuterRef("pk")).order_by().values("question")
+    )
+    answers = comments.filter(is_answer=True)
+    Question.objects.update(
+        comment_count=Coalesce(
+            Subquery(comments.annotate(count=Count("pk")).values("count")), 0
+        ),
+        answer_count=Coalesce(
+            Subquery(answers.annotate(count=Count("pk")).values("count")), 0
+        ),
+        has_answer=Exists(answers),
+        last_activity_at=Coalesce(
+            Subquery(comments.annotate(last=Max("date_created")).values("last")),
+            F("date_created"),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("forum", "0005_comment_comment_question_date_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="question",
+            name="answer_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="question",
+            name="comment_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="question",
+            name="has_answer",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name="question",
+            name="last_activity_at",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.RunPython(fill_question_activity, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="question",
+            index=models.Index(
+                fields=["-last_activity_at"], name="question_last_activity_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="question",
+            index=models.Index(
+                fields=["-comment_count"], name="question_comment_count_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="question",
+            index=models.Index(
+                condition=models.Q(("has_answer", False)),
+                fields=["date_created"],
+                name="question_unanswered_date_idx",
+            ),
+        ),
+    ]
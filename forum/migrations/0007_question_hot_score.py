@@ -0,0 +1,22 @@
+# Generated by Django 4.1.13 on 2026-10-19 14:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("forum", "0006_question_activity"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="question",
+            name="hot_score",
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name="question",
+            index=models.Index(fields=["-hot_score"], name="question_hot_score_idx"),
+        ),
+    ]
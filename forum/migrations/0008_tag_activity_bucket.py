@@ -0,0 +1,49 @@
+# Generated by Django 4.1.13 on 2026-10-19 14:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("forum", "0007_question_hot_score"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TagActivityBucket",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("start", models.DateTimeField()),
+                ("hours", models.PositiveSmallIntegerField(default=1)),
+                ("count", models.PositiveIntegerField(default=0)),
+                (
+                    "tag",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="activity_buckets",
+                        to="forum.tag",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="tagactivitybucket",
+            index=models.Index(fields=["start"], name="tag_activity_start_idx"),
+        ),
+        migrations.AddConstraint(
+            model_name="tagactivitybucket",
+            constraint=models.UniqueConstraint(
+                fields=("tag", "hours", "start"), name="tag_activity_bucket_unique"
+            ),
+        ),
+    ]
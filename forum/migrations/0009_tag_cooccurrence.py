@@ -0,0 +1,51 @@
+# Generated by Django 4.1.13 on 2026-10-19 14:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("forum", "0008_tag_activity_bucket"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TagCooccurrence",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("count", models.PositiveIntegerField(default=0)),
+                (
+                    "other",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="forum.tag",
+                    ),
+                ),
+                (
+                    "tag",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="cooccurrences",
+                        to="forum.tag",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="tagcooccurrence",
+            constraint=models.UniqueConstraint(
+                fields=("tag", "other"), name="tag_cooccurrence_unique"
+            ),
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 4.1.13 on 2026-10-19 14:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("forum", "0009_tag_cooccurrence"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="QuestionSignature",
+            fields=[
+                (
+                    "question",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="signature",
+                        serialize=False,
+                        to="forum.question",
+                    ),
+                ),
+                ("minhash", models.BinaryField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name="QuestionLSHBand",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("band", models.PositiveSmallIntegerField()),
+                ("bucket", models.BigIntegerField()),
+                (
+                    "question",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="lsh_bands",
+                        to="forum.question",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="questionlshband",
+            index=models.Index(
+                fields=["band", "bucket"], name="question_lsh_bucket_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="questionlshband",
+            constraint=models.UniqueConstraint(
+                fields=("question", "band"), name="question_lsh_band_unique"
+            ),
+        ),
+    ]
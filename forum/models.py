@@ -1,4 +1,6 @@
-from django.db import models
+from typing import Any
+
+from django.db import models, transaction
 from django.utils import timezone
 
 
@@ -6,6 +8,7 @@ class Tag(models.Model):
     """Model for database table 'tag'."""
 
     title = models.CharField(max_length=64, unique=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self) -> str:
         return self.title
@@ -14,10 +17,39 @@ class Tag(models.Model):
 class Question(models.Model):
     """Model for database table 'question'."""
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["date_created"], name="question_date_created_idx"),
+            models.Index(fields=["-views"], name="question_views_idx"),
+            models.Index(
+                fields=["author", "-date_created"],
+                name="question_author_date_idx",
+            ),
+            models.Index(
+                fields=["-last_activity_at"],
+                name="question_last_activity_idx",
+            ),
+            models.Index(fields=["-comment_count"], name="question_comment_count_idx"),
+            models.Index(fields=["-hot_score"], name="question_hot_score_idx"),
+            models.Index(
+                fields=["date_created"],
+                condition=models.Q(has_answer=False),
+                name="question_unanswered_date_idx",
+            ),
+        ]
+
     title = models.CharField(max_length=256)
     content = models.TextField()
     date_created = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
     views = models.PositiveBigIntegerField(default=0)
+    # Denormalized from comments by `forum.activity`.
+    comment_count = models.PositiveIntegerField(default=0)
+    answer_count = models.PositiveIntegerField(default=0)
+    has_answer = models.BooleanField(default=False)
+    last_activity_at = models.DateTimeField(default=timezone.now)
+    # Maintained by `forum.hotness`, logarithmic and growing with time.
+    hot_score = models.FloatField(default=0)
     author = models.ForeignKey(
         "authentication.User",
         on_delete=models.CASCADE,
@@ -25,15 +57,149 @@ class Question(models.Model):
     )
     tags = models.ManyToManyField(Tag, blank=True, related_name="questions")
 
+    @classmethod
+    def from_db(
+        cls,
+        db: str | None,
+        field_names: list[str],
+        values: list[Any],
+    ) -> "Question":
+        """Remembers loaded `views` and text to update hot score and signature.
+
+        :param db: Database alias.
+        :param field_names: Names of loaded fields.
+        :param values: Values of loaded fields.
+        :return: Question instance.
+        """
+        instance = super().from_db(db, field_names, values)
+        if "views" in field_names:
+            instance._loaded_views = instance.views
+        if "title" in field_names and "content" in field_names:
+            instance._loaded_text = (instance.title, instance.content)
+        return instance
+
     def __str__(self) -> str:
         return self.title
 
 
+class TagActivityBucket(models.Model):
+    """Model for database table 'tag_activity_bucket'.
+
+    Counts questions tagged with tag during `hours` hours from `start`.
+    Maintained by `forum.trending`.
+    """
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["tag", "hours", "start"],
+                name="tag_activity_bucket_unique",
+            ),
+        ]
+        indexes = [models.Index(fields=["start"], name="tag_activity_start_idx")]
+
+    tag = models.ForeignKey(
+        Tag,
+        on_delete=models.CASCADE,
+        related_name="activity_buckets",
+    )
+    start = models.DateTimeField()
+    hours = models.PositiveSmallIntegerField(default=1)
+    count = models.PositiveIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f"{self.tag_id}: {self.count} from {self.start:%Y-%m-%d %H:%M}"
+
+
+class TagCooccurrence(models.Model):
+    """Model for database table 'tag_cooccurrence'.
+
+    Counts questions tagged with both tags, the row of a tag with itself counts
+    questions with the tag. Maintained by `forum.related`.
+    """
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["tag", "other"],
+                name="tag_cooccurrence_unique",
+            ),
+        ]
+
+    tag = models.ForeignKey(
+        Tag,
+        on_delete=models.CASCADE,
+        related_name="cooccurrences",
+    )
+    other = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name="+")
+    count = models.PositiveIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f"{self.tag_id} & {self.other_id}: {self.count}"
+
+
+class QuestionSignature(models.Model):
+    """Model for database table 'question_signature'.
+
+    Stores MinHash signature of question text. Maintained by `forum.duplicates`.
+    """
+
+    question = models.OneToOneField(
+        Question,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="signature",
+    )
+    minhash = models.BinaryField()
+
+    def __str__(self) -> str:
+        return str(self.question_id)
+
+
+class QuestionLSHBand(models.Model):
+    """Model for database table 'question_lsh_band'.
+
+    Stores hash of a band of MinHash signature, questions with equal hash of
+    any band are candidate duplicates. Maintained by `forum.duplicates`.
+    """
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["question", "band"],
+                name="question_lsh_band_unique",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["band", "bucket"], name="question_lsh_bucket_idx"),
+        ]
+
+    question = models.ForeignKey(
+        Question,
+        on_delete=models.CASCADE,
+        related_name="lsh_bands",
+    )
+    band = models.PositiveSmallIntegerField()
+    bucket = models.BigIntegerField()
+
+    def __str__(self) -> str:
+        return f"{self.question_id}: {self.band}"
+
+
 class Comment(models.Model):
     """Model for database table 'comment'."""
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["question", "date_created"],
+                name="comment_question_date_idx",
+            ),
+        ]
+
     content = models.TextField()
     date_created = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
     is_answer = models.BooleanField(default=False)
     author = models.ForeignKey(
         "authentication.User",
@@ -46,7 +212,41 @@ class Comment(models.Model):
         related_name="comments",
     )
 
+    @classmethod
+    def from_db(
+        cls,
+        db: str | None,
+        field_names: list[str],
+        values: list[Any],
+    ) -> "Comment":
+        """Remembers loaded `is_answer` to update answer counters on change.
+
+        :param db: Database alias.
+        :param field_names: Names of loaded fields.
+        :param values: Values of loaded fields.
+        :return: Comment instance.
+        """
+        instance = super().from_db(db, field_names, values)
+        if "is_answer" in field_names:
+            instance._loaded_is_answer = instance.is_answer
+        return instance
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        """Saves comment and updates counters of its question atomically.
+
+        Counters are updated by `post_save` receiver of `forum.activity`.
+
+        :param args: Args.
+        :param kwargs: Kwargs.
+        """
+        with transaction.atomic(using=kwargs.get("using")):
+            super().save(*args, **kwargs)
+
     def __str__(self) -> str:
-        username = self.author.username
+        # Author is not loaded here, string representation must not query.
+        if Comment.author.is_cached(self):
+            author = self.author.username
+        else:
+            author = f"#{self.author_id}"
         content = self.content[:20]
-        return f"{username}: {content}"
+        return f"{author}: {content}"
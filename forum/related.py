@@ -0,0 +1,267 @@
+import heapq
+import math
+from collections import Counter
+from itertools import groupby
+from typing import Any, Iterable
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Value, signals
+from django.db.models.functions import Greatest
+
+from forum.models import Question, TagCooccurrence
+
+QuestionTag = Question.tags.through
+
+
+def get_pairs(
+    tag_ids: Iterable[int],
+    changed: Iterable[int],
+) -> Counter[tuple[int, int]]:
+    """Returns ordered pairs of tags of question affected by changed tags.
+
+    :param tag_ids: Tags of question other than changed ones.
+    :param changed: Added or removed tags.
+    :return: Counter of pairs, including pairs of changed tags with themselves.
+    """
+    tag_ids, changed = set(tag_ids), set(changed)
+    pairs: Counter[tuple[int, int]] = Counter()
+    for tag_id in changed:
+        for other_id in tag_ids | changed:
+            pairs[tag_id, other_id] += 1
+            if other_id not in changed:
+                pairs[other_id, tag_id] += 1
+    return pairs
+
+
+def _increment(tag_id: int, other_id: int, count: int) -> bool:
+    rows = TagCooccurrence.objects.filter(tag_id=tag_id, other_id=other_id)
+    return bool(rows.update(count=F("count") + count))
+
+
+def _create(tag_id: int, other_id: int, count: int) -> None:
+    try:
+        with transaction.atomic():
+            TagCooccurrence.objects.create(
+                tag_id=tag_id,
+                other_id=other_id,
+                count=count,
+            )
+    except IntegrityError:
+        # Created by concurrent transaction meanwhile.
+        _increment(tag_id, other_id, count)
+
+
+def _count_rows(tag_ids: set[int]) -> Counter[int]:
+    if not tag_ids:
+        return Counter()
+    rows = (
+        TagCooccurrence.objects.filter(tag_id__in=tag_ids)
+        .order_by()
+        .values("tag_id")
+        .annotate(count=Count("pk"))
+        .values_list("tag_id", "count")
+    )
+    return Counter(dict(rows))
+
+
+def add_cooccurrences(pairs: Counter[tuple[int, int]]) -> None:
+    """Adds counts of pairs to co-occurrences of tags.
+
+    New pairs of a tag which already has `MAX_PER_TAG` co-occurrences are
+    skipped until the next rebuild, the row of tag with itself is always kept.
+    Rows of tags with new pairs are counted by one query.
+
+    :param pairs: Counts by pairs of tag ids.
+    """
+    max_per_tag = settings.RELATED_QUESTIONS["MAX_PER_TAG"]
+    # Sorted, so that concurrent transactions lock rows in the same order.
+    missing = [
+        (tag_id, other_id, count)
+        for (tag_id, other_id), count in sorted(pairs.items())
+        if not _increment(tag_id, other_id, count)
+    ]
+    # The row of tag with itself is counted too.
+    row_counts = _count_rows(
+        {tag_id for tag_id, other_id, _ in missing if tag_id != other_id},
+    )
+    for tag_id, other_id, count in missing:
+        if tag_id != other_id and row_counts[tag_id] > max_per_tag:
+            continue
+        _create(tag_id, other_id, count)
+        row_counts[tag_id] += 1
+
+
+def remove_cooccurrences(pairs: Counter[tuple[int, int]]) -> None:
+    """Subtracts counts of pairs from co-occurrences of tags.
+
+    Rows dropping to zero are deleted.
+
+    :param pairs: Counts by pairs of tag ids.
+    """
+    for (tag_id, other_id), count in sorted(pairs.items()):
+        rows = TagCooccurrence.objects.filter(tag_id=tag_id, other_id=other_id)
+        # Pairs created after the question was tagged may count less.
+        if rows.update(count=Greatest(F("count") - count, Value(0))):
+            rows.filter(count=0).delete()
+
+
+def get_related_question_ids(question_id: int, limit: int) -> list[int]:
+    """Returns ids of questions sharing the most weighted tags with question.
+
+    Tags are weighted by cosine similarity of their questions to tags of
+    question, summed over its tags, so tags of question weigh at least 1 and
+    tags on most questions weigh little. Candidates are the questions latest
+    tagged with each of `TAGS` heaviest tags, `CANDIDATES_PER_TAG` per tag.
+
+    :param question_id: Id of question.
+    :param limit: Max number of questions.
+    :return: Ids of questions, most related first.
+    """
+    config = settings.RELATED_QUESTIONS
+    totals = TagCooccurrence.objects.filter(
+        tag_id=OuterRef("other_id"),
+        other_id=OuterRef("other_id"),
+    ).values("count")
+    rows = list(
+        TagCooccurrence.objects.filter(
+            tag_id__in=QuestionTag.objects.filter(question_id=question_id).values(
+                "tag_id",
+            ),
+        )
+        .annotate(other_total=Subquery(totals))
+        .values_list("tag_id", "other_id", "count", "other_total"),
+    )
+    tag_totals = {
+        tag_id: count for tag_id, other_id, count, _ in rows if tag_id == other_id
+    }
+    weights: Counter[int] = Counter()
+    for tag_id, other_id, count, other_total in rows:
+        if tag_totals.get(tag_id) and other_total:
+            weights[other_id] += count / math.sqrt(tag_totals[tag_id] * other_total)
+    tag_weights = dict(weights.most_common(config["TAGS"]))
+
+    if not tag_weights:
+        return []
+
+    # Latest taggings of every tag are found by index, not by sorting all of them.
+    latest = Q()
+    for tag_id in tag_weights:
+        latest |= Q(
+            pk__in=QuestionTag.objects.filter(tag_id=tag_id)
+            .order_by("-pk")
+            .values("pk")[: config["CANDIDATES_PER_TAG"]],
+        )
+    candidates = (
+        QuestionTag.objects.filter(latest)
+        .exclude(question_id=question_id)
+        .order_by("-question_id")
+        .values_list("question_id", "tag_id")
+    )
+    scores: Counter[int] = Counter()
+    for candidate_id, tag_id in candidates:
+        scores[candidate_id] += tag_weights[tag_id]
+    # Ties keep the order of candidates, newer questions first.
+    return [candidate_id for candidate_id, _ in scores.most_common(limit)]
+
+
+def rebuild_tag_cooccurrence() -> int:
+    """Recounts co-occurrences of tags from all questions.
+
+    Only `MAX_PER_TAG` co-occurrences with most questions are kept per tag,
+    besides the row of tag with itself.
+
+    :return: Number of stored rows.
+    """
+    max_per_tag = settings.RELATED_QUESTIONS["MAX_PER_TAG"]
+    pairs = (
+        QuestionTag.objects.values("tag_id", other_id=F("question__tags"))
+        .annotate(count=Count("pk"))
+        .order_by("tag_id")
+        .values_list("tag_id", "other_id", "count")
+    )
+    with transaction.atomic():
+        TagCooccurrence.objects.all().delete()
+        created = 0
+        for tag_id, rows in groupby(pairs.iterator(), key=lambda row: row[0]):
+            rows = list(rows)
+            kept = [row for row in rows if row[1] == tag_id]
+            kept += heapq.nlargest(
+                max_per_tag,
+                (row for row in rows if row[1] != tag_id),
+                key=lambda row: row[2],
+            )
+            TagCooccurrence.objects.bulk_create(
+                TagCooccurrence(tag_id=tag_id, other_id=other_id, count=count)
+                for tag_id, other_id, count in kept
+            )
+            created += len(kept)
+    return created
+
+
+def _get_tag_ids(question_ids: Iterable[int]) -> dict[int, set[int]]:
+    tag_ids: dict[int, set[int]] = {question_id: set() for question_id in question_ids}
+    rows = QuestionTag.objects.filter(question_id__in=tag_ids).values_list(
+        "question_id",
+        "tag_id",
+    )
+    for question_id, tag_id in rows:
+        tag_ids[question_id].add(tag_id)
+    return tag_ids
+
+
+def _get_changed_pairs(
+    instance: Any,
+    reverse: bool,
+    pk_set: set[int] | None,
+) -> Counter[tuple[int, int]]:
+    pairs: Counter[tuple[int, int]] = Counter()
+    if not pk_set:
+        return pairs
+    changes = {pk: {instance.pk} for pk in pk_set} if reverse else {instance.pk: pk_set}
+    for question_id, tag_ids in _get_tag_ids(changes).items():
+        pairs += get_pairs(tag_ids - changes[question_id], changes[question_id])
+    return pairs
+
+
+def _get_related_ids(instance: Any, reverse: bool) -> set[int]:
+    if reverse:
+        return set(instance.questions.values_list("pk", flat=True))
+    return _get_tag_ids([instance.pk])[instance.pk]
+
+
+def _on_question_tags_changed(
+    instance: Any,
+    action: str,
+    reverse: bool,
+    pk_set: set[int] | None,
+    **kwargs: Any,
+) -> None:
+    if action == "post_add":
+        add_cooccurrences(_get_changed_pairs(instance, reverse, pk_set))
+    elif action == "post_remove":
+        remove_cooccurrences(_get_changed_pairs(instance, reverse, pk_set))
+    elif action == "pre_clear":
+        # Cleared tags are not known after clearing.
+        pk_set = _get_related_ids(instance, reverse)
+        remove_cooccurrences(_get_changed_pairs(instance, reverse, pk_set))
+
+
+def _on_question_deleted(instance: Question, **kwargs: Any) -> None:
+    # Tags of deleted questions are deleted without m2m_changed signals.
+    remove_cooccurrences(get_pairs([], _get_tag_ids([instance.pk])[instance.pk]))
+
+
+def track_tag_cooccurrence() -> None:
+    """Keeps co-occurrences of tags in sync with tags of questions.
+
+    Counts are changed with F() expressions in the transaction changing tags.
+    Must be called from `AppConfig.ready`.
+    """
+    uid = "forum:tag_cooccurrence"
+    signals.m2m_changed.connect(
+        _on_question_tags_changed,
+        sender=QuestionTag,
+        dispatch_uid=uid,
+    )
+    signals.pre_delete.connect(_on_question_deleted, sender=Question, dispatch_uid=uid)
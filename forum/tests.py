@@ -0,0 +1,487 @@
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.models import Sum
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from authentication.models import User
+from common.ndjson import render_ndjson
+from common.versions import get_cache
+from forum import duplicates, hotness, related, trending
+from forum.activity import refresh_question_activity
+from forum.importers import ForumImporter
+from forum.models import (
+    Comment,
+    Question,
+    QuestionLSHBand,
+    QuestionSignature,
+    Tag,
+    TagActivityBucket,
+    TagCooccurrence,
+)
+
+
+class ForumModelTestCase(TestCase):
+    """Creates an author and a question, starts with empty cache."""
+
+    def setUp(self) -> None:
+        get_cache().clear()
+        self.user = User.objects.create_user("author", "author@example.com", "pass")
+        self.question = self.create_question("Question", "Content of question")
+
+    def create_question(self, title: str, content: str, **fields: object) -> Question:
+        return Question.objects.create(
+            title=title,
+            content=content,
+            author=self.user,
+            **fields,
+        )
+
+    def create_comment(self, question: Question, **fields: object) -> Comment:
+        return Comment.objects.create(
+            content="Comment",
+            author=self.user,
+            question=question,
+            **fields,
+        )
+
+    def get_question(self, question: Question) -> Question:
+        return Question.objects.get(pk=question.pk)
+
+
+class QuestionActivityTests(ForumModelTestCase):
+    """Comment changes keep activity fields of questions in sync."""
+
+    def assert_activity(self, comments: int, answers: int) -> None:
+        question = self.get_question(self.question)
+        self.assertEqual(question.comment_count, comments)
+        self.assertEqual(question.answer_count, answers)
+        self.assertEqual(question.has_answer, answers > 0)
+
+    def test_created_comments_are_counted(self) -> None:
+        created_at = timezone.now() + timedelta(hours=1)
+        self.create_comment(self.question)
+        self.create_comment(self.question, is_answer=True, date_created=created_at)
+
+        self.assert_activity(comments=2, answers=1)
+        self.assertEqual(self.get_question(self.question).last_activity_at, created_at)
+
+    def test_marking_answer_changes_answer_count(self) -> None:
+        comment = self.create_comment(self.question)
+
+        comment.is_answer = True
+        comment.save()
+        self.assert_activity(comments=1, answers=1)
+
+        comment.is_answer = False
+        comment.save()
+        self.assert_activity(comments=1, answers=0)
+
+    def test_deleted_comments_are_subtracted(self) -> None:
+        self.create_comment(self.question)
+        answer = self.create_comment(self.question, is_answer=True)
+
+        Comment.objects.get(pk=answer.pk).delete()
+
+        self.assert_activity(comments=1, answers=0)
+
+    def test_counters_do_not_go_below_zero(self) -> None:
+        comment = self.create_comment(self.question, is_answer=True)
+        # Counters lag behind comments, e.g. before the backfill.
+        Question.objects.update(comment_count=0, answer_count=0)
+
+        comment.is_answer = False
+        comment.save()
+        self.assert_activity(comments=0, answers=0)
+
+        Comment.objects.get(pk=comment.pk).delete()
+        self.assert_activity(comments=0, answers=0)
+
+    def test_refresh_counts_comments_inserted_in_bulk(self) -> None:
+        Comment.objects.bulk_create(
+            Comment(content="Comment", author=self.user, question=self.question)
+            for _ in range(3)
+        )
+        self.assert_activity(comments=0, answers=0)
+
+        refresh_question_activity(Question.objects.filter(pk=self.question.pk))
+
+        self.assert_activity(comments=3, answers=0)
+
+
+class HotScoreTests(ForumModelTestCase):
+    """Incrementally updated hot scores match scores computed from comments."""
+
+    def assert_score_is_fresh(self, question: Question) -> None:
+        question = self.get_question(question)
+        expected = hotness.compute_hot_scores([question])[question.pk]
+        self.assertAlmostEqual(question.hot_score, expected, places=6)
+
+    def test_score_follows_comments_and_views(self) -> None:
+        self.assert_score_is_fresh(self.question)
+
+        comment = self.create_comment(self.question)
+        self.create_comment(self.question, is_answer=True)
+        self.assert_score_is_fresh(self.question)
+
+        comment.is_answer = True
+        comment.save()
+        self.assert_score_is_fresh(self.question)
+
+        question = self.get_question(self.question)
+        question.views = 100
+        question.save()
+        self.assert_score_is_fresh(self.question)
+
+        Comment.objects.get(pk=comment.pk).delete()
+        self.assert_score_is_fresh(self.question)
+
+    def test_recent_activity_ranks_higher(self) -> None:
+        now = timezone.now()
+        old = self.create_question("Old", "Old question", date_created=now)
+        new = self.create_question(
+            "New",
+            "New question",
+            date_created=now + timedelta(hours=2),
+        )
+        self.assertGreater(
+            self.get_question(new).hot_score,
+            self.get_question(old).hot_score,
+        )
+
+        half_life = settings.HOT_SCORE["HALF_LIFE_HOURS"]
+        for _ in range(3):
+            self.create_comment(old, date_created=now + timedelta(hours=half_life))
+
+        ranked = Question.objects.filter(pk__in=[old.pk, new.pk]).order_by(
+            "-hot_score",
+        )
+        self.assertEqual(list(ranked), [old, new])
+
+    def test_backfill_finds_outdated_scores(self) -> None:
+        self.create_comment(self.question)
+        Question.objects.update(hot_score=0)
+        backfill = hotness.HotScoreBackfill("question_hot_score", Question)
+
+        self.assertEqual(
+            backfill.find_mismatches([self.question.pk]),
+            [self.question.pk],
+        )
+        backfill.fill(0, self.question.pk)
+        self.assertEqual(backfill.find_mismatches([self.question.pk]), [])
+
+
+class TrendingTagsTests(ForumModelTestCase):
+    """Taggings are counted in buckets and ranked over trending windows."""
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.tags = [Tag.objects.create(title=title) for title in ("a", "b", "c")]
+
+    def get_totals(self, hours: int) -> list[tuple[str, int]]:
+        return [
+            (row["tag__title"], row["total"])
+            for row in trending.get_trending_tags(hours, 10)
+        ]
+
+    def test_taggings_are_ranked_by_count(self) -> None:
+        first, second, third = self.tags
+        self.question.tags.add(first, second)
+        other = self.create_question("Other", "Other question")
+        other.tags.add(second)
+        third.questions.add(other)
+
+        self.assertEqual(self.get_totals(24), [("b", 2), ("a", 1), ("c", 1)])
+
+    def test_compaction_keeps_totals_of_windows(self) -> None:
+        tag = self.tags[0]
+        now = timezone.now()
+        retention = settings.TRENDING_TAGS["HOURLY_RETENTION_HOURS"]
+        for hours_ago in (1, retention + 24, retention + 25, 24 * 30):
+            TagActivityBucket.objects.create(
+                tag=tag,
+                hours=1,
+                start=trending.get_bucket_start(now - timedelta(hours=hours_ago)),
+                count=1,
+            )
+
+        merged, expired = trending.compact_tag_activity()
+
+        self.assertEqual((merged, expired), (3, 0))
+        self.assertEqual(
+            TagActivityBucket.objects.filter(hours=24).aggregate(Sum("count")),
+            {"count__sum": 2},
+        )
+        self.assertEqual(self.get_totals(24), [("a", 1)])
+        self.assertEqual(self.get_totals(7 * 24), [("a", 3)])
+
+    def test_rebuild_counts_questions_of_longest_window(self) -> None:
+        self.question.tags.add(*self.tags)
+        expired = self.create_question(
+            "Expired",
+            "Expired question",
+            date_created=timezone.now() - trending.get_retention() * 2,
+        )
+        expired.tags.add(self.tags[0])
+        TagActivityBucket.objects.all().delete()
+
+        self.assertEqual(trending.rebuild_tag_activity(), 3)
+        self.assertEqual(self.get_totals(24), [("a", 1), ("b", 1), ("c", 1)])
+
+
+class RelatedQuestionsTests(ForumModelTestCase):
+    """Co-occurrences of tags follow tags of questions and rank related ones."""
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.tags = [Tag.objects.create(title=title) for title in ("a", "b", "c")]
+
+    def get_cooccurrences(self) -> set[tuple[int, int, int]]:
+        return set(
+            TagCooccurrence.objects.values_list("tag_id", "other_id", "count"),
+        )
+
+    def assert_rebuilt_equally(self) -> None:
+        incremental = self.get_cooccurrences()
+        related.rebuild_tag_cooccurrence()
+        self.assertEqual(incremental, self.get_cooccurrences())
+
+    def test_changes_of_tags_match_rebuild(self) -> None:
+        first, second, third = self.tags
+        other = self.create_question("Other", "Other question")
+        self.question.tags.add(first, second)
+        other.tags.add(second)
+        third.questions.add(self.question, other)
+        self.assert_rebuilt_equally()
+
+        self.question.tags.remove(second)
+        third.questions.remove(other)
+        self.assert_rebuilt_equally()
+
+        self.question.tags.clear()
+        self.assert_rebuilt_equally()
+
+        other.tags.add(first)
+        second.questions.clear()
+        self.assert_rebuilt_equally()
+
+        other.delete()
+        self.assertEqual(self.get_cooccurrences(), set())
+
+    @override_settings(
+        RELATED_QUESTIONS={**settings.RELATED_QUESTIONS, "MAX_PER_TAG": 1},
+    )
+    def test_new_pairs_over_limit_are_skipped(self) -> None:
+        first, second, third = self.tags
+        self.question.tags.add(first, second)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.question.tags.add(third)
+        counts = [sql for sql in queries.captured_queries if "COUNT(" in sql["sql"]]
+
+        self.assertEqual(len(counts), 1)
+        self.assertEqual(TagCooccurrence.objects.filter(tag=first).count(), 2)
+        self.assertTrue(
+            TagCooccurrence.objects.filter(tag=third, other=third, count=1).exists(),
+        )
+
+    def test_questions_sharing_more_tags_rank_higher(self) -> None:
+        first, second, third = self.tags
+        self.question.tags.add(first, second)
+        both = self.create_question("Both", "Both tags")
+        both.tags.add(first, second)
+        one = self.create_question("One", "One tag")
+        one.tags.add(second)
+        self.create_question("None", "Other tag").tags.add(third)
+
+        ids = related.get_related_question_ids(self.question.pk, 5)
+
+        self.assertEqual(ids, [both.pk, one.pk])
+
+
+class DuplicateQuestionsTests(ForumModelTestCase):
+    """Questions with similar text are found through the index of LSH bands."""
+
+    title = "How to keep database connections open"
+    content = (
+        "Every request opens a new database connection and closes it at the "
+        "end, how can connections be reused between requests of a worker?"
+    )
+
+    def test_similar_questions_are_found(self) -> None:
+        original = self.create_question(self.title, self.content)
+        self.create_question("Unrelated", "Nothing in common with the other text")
+
+        self.assertEqual(
+            duplicates.find_duplicate_ids(self.title, self.content),
+            [original.pk],
+        )
+        self.assertEqual(
+            duplicates.find_duplicate_ids(
+                self.title,
+                self.content,
+                exclude_id=original.pk,
+            ),
+            [],
+        )
+        self.assertEqual(duplicates.find_duplicate_ids("", "!"), [])
+
+    def test_changed_text_is_reindexed(self) -> None:
+        question = self.create_question("Unrelated", "Nothing in common")
+
+        question.title = self.title
+        question.content = self.content
+        question.save()
+
+        self.assertEqual(
+            duplicates.find_duplicate_ids(self.title, self.content),
+            [question.pk],
+        )
+
+    @override_settings(
+        DUPLICATE_QUESTIONS={**settings.DUPLICATE_QUESTIONS, "MAX_CANDIDATES": 1},
+    )
+    def test_candidates_sharing_more_bands_are_compared_first(self) -> None:
+        older = self.create_question("Unrelated", "Nothing in common")
+        original = self.create_question(self.title, self.content)
+        signature = QuestionSignature.objects.get(question=original).minhash
+        # Older question has the same signature, but shares only one band.
+        QuestionSignature.objects.filter(question=older).update(minhash=signature)
+        QuestionLSHBand.objects.filter(question=older).exclude(band=0).delete()
+        QuestionLSHBand.objects.filter(question=older).update(
+            bucket=duplicates.get_bands(bytes(signature))[0],
+        )
+
+        self.assertEqual(
+            duplicates.find_duplicate_ids(self.title, self.content),
+            [original.pk],
+        )
+
+
+class ForumImportTests(ForumModelTestCase):
+    """Imports insert records once and refuse ids of other rows."""
+
+    def setUp(self) -> None:
+        super().setUp()
+        author = {"id": self.user.pk, "username": self.user.username}
+        first_id, second_id = self.question.pk + 1, self.question.pk + 2
+        self.records = [
+            {"type": "tag", "id": 1, "title": "imported"},
+            {
+                "type": "question",
+                "id": first_id,
+                "title": "First",
+                "content": "First question",
+                "author": author,
+                "tags": ["imported", "other"],
+            },
+            {
+                "type": "question",
+                "id": second_id,
+                "title": "Second",
+                "content": "Second question",
+                "author": author,
+                "tags": ["imported"],
+            },
+            {
+                "type": "comment",
+                "id": 1,
+                "content": "Answer",
+                "is_answer": True,
+                "question_id": first_id,
+                "author": author,
+            },
+            {
+                "type": "comment",
+                "id": 2,
+                "content": "Comment",
+                "question_id": second_id,
+                "author": author,
+            },
+        ]
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = Path(self.directory.name, "forum.ndjson")
+
+    def write_records(self, records: list[dict[str, object]]) -> None:
+        self.path.write_bytes(b"".join(render_ndjson(records)))
+
+    def call_import(self, *args: str) -> None:
+        call_command("import_forum", str(self.path), *args, stderr=StringIO())
+
+    def assert_imported(self) -> None:
+        self.assertEqual(Question.objects.count(), 3)
+        self.assertEqual(
+            set(Question.objects.values_list("title", "tags__title")),
+            {
+                ("Question", None),
+                ("First", "imported"),
+                ("First", "other"),
+                ("Second", "imported"),
+            },
+        )
+        self.assertEqual(Comment.objects.count(), 2)
+        first = Question.objects.get(title="First")
+        self.assertEqual((first.comment_count, first.answer_count), (1, 1))
+
+    def test_records_are_imported_once(self) -> None:
+        importer = ForumImporter()
+
+        importer.import_records(self.records)
+        importer.import_records(self.records)
+
+        self.assert_imported()
+        self.assertEqual(
+            importer.counts,
+            {"tags": 2, "questions": 2, "comments": 2, "skipped": 4},
+        )
+
+    def test_imported_questions_are_found_as_duplicates(self) -> None:
+        record = {
+            **self.records[1],
+            "content": "How can questions of another forum be imported in bulk?",
+        }
+
+        ForumImporter().import_records([record])
+
+        self.assertEqual(
+            duplicates.find_duplicate_ids(record["title"], record["content"]),
+            [record["id"]],
+        )
+
+    def test_failed_import_is_resumed(self) -> None:
+        invalid = {**self.records[3], "author": {"username": "missing"}}
+        self.write_records([*self.records[:3], invalid, self.records[4]])
+
+        with self.assertRaises(CommandError):
+            self.call_import("--chunk-size", "2")
+        self.assertEqual(Path(f"{self.path}.checkpoint").read_text(), "2")
+
+        self.write_records(self.records)
+        self.call_import("--chunk-size", "2", "--resume")
+
+        self.assert_imported()
+        self.assertFalse(Path(f"{self.path}.checkpoint").exists())
+
+    def test_colliding_ids_are_refused(self) -> None:
+        self.write_records(
+            [
+                {**self.records[1], "id": self.question.pk},
+                {**self.records[3], "question_id": self.question.pk},
+            ],
+        )
+
+        with self.assertRaisesMessage(CommandError, f"{self.question.pk} already"):
+            self.call_import()
+
+        question = self.get_question(self.question)
+        self.assertEqual(question.title, "Question")
+        self.assertFalse(question.tags.exists())
+        self.assertFalse(Comment.objects.exists())
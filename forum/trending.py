@@ -0,0 +1,183 @@
+from collections import Counter
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from typing import Any, Iterable
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum, signals
+from django.utils import timezone
+
+from forum.models import Question, TagActivityBucket
+
+QuestionTag = Question.tags.through
+
+# Buckets are aligned to UTC, so daily buckets don't depend on time zone.
+BUCKET_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+DELETE_BATCH_SIZE = 1000
+
+
+def get_bucket_start(at: datetime, hours: int = 1) -> datetime:
+    """Returns start of bucket containing time.
+
+    :param at: Time.
+    :param hours: Length of bucket.
+    :return: Start of bucket.
+    """
+    size = timedelta(hours=hours)
+    return BUCKET_EPOCH + (at - BUCKET_EPOCH) // size * size
+
+
+def get_retention() -> timedelta:
+    """Returns time buckets are kept for, the longest trending window.
+
+    :return: Retention.
+    """
+    return timedelta(hours=max(settings.TRENDING_TAGS["WINDOWS"].values()))
+
+
+def add_tag_activity(counts: Counter[tuple[int, datetime]], hours: int = 1) -> None:
+    """Adds counts to buckets of tags, creating missing buckets.
+
+    Existing buckets are incremented with F() expressions, so concurrent
+    taggings don't overwrite each other's counts.
+
+    :param counts: Counts by tag ids and bucket starts.
+    :param hours: Length of buckets.
+    """
+    # Sorted, so that concurrent transactions lock buckets in the same order.
+    for (tag_id, start), count in sorted(counts.items()):
+        buckets = TagActivityBucket.objects.filter(
+            tag_id=tag_id,
+            hours=hours,
+            start=start,
+        )
+        if buckets.update(count=F("count") + count):
+            continue
+        try:
+            with transaction.atomic():
+                TagActivityBucket.objects.create(
+                    tag_id=tag_id,
+                    hours=hours,
+                    start=start,
+                    count=count,
+                )
+        except IntegrityError:
+            # Created by concurrent transaction meanwhile.
+            buckets.update(count=F("count") + count)
+
+
+def record_tag_activity(taggings: Iterable[tuple[int, datetime]]) -> None:
+    """Counts questions tagged at given times in hourly buckets.
+
+    Taggings older than the longest trending window are skipped.
+
+    :param taggings: Tag ids and times of tagging.
+    """
+    since = timezone.now() - get_retention()
+    add_tag_activity(
+        Counter(
+            (tag_id, get_bucket_start(at)) for tag_id, at in taggings if at >= since
+        ),
+    )
+
+
+def get_trending_tags(hours: int, limit: int) -> list[dict[str, Any]]:
+    """Returns tags of most questions tagged during last hours.
+
+    Only buckets are read. The current hour is counted in full, daily buckets
+    only if they start inside the window, so windows longer than hourly
+    retention are precise to a day.
+
+    :param hours: Length of window.
+    :param limit: Max number of tags.
+    :return: Dicts with id, title and total of tags, most tagged first.
+    """
+    since = get_bucket_start(timezone.now()) - timedelta(hours=hours - 1)
+    return list(
+        TagActivityBucket.objects.filter(start__gte=since)
+        .values("tag_id", "tag__title")
+        .annotate(total=Sum("count"))
+        .order_by("-total", "tag_id")[:limit],
+    )
+
+
+def compact_tag_activity() -> tuple[int, int]:
+    """Merges old hourly buckets into daily ones and deletes expired buckets.
+
+    Only whole days are merged, so daily buckets never overlap hourly ones.
+
+    :return: Numbers of merged and expired buckets.
+    """
+    now = timezone.now()
+    hourly_retention = timedelta(hours=settings.TRENDING_TAGS["HOURLY_RETENTION_HOURS"])
+    merge_before = get_bucket_start(now - hourly_retention, hours=24)
+    expire_before = get_bucket_start(now) - get_retention()
+    with transaction.atomic():
+        buckets = list(
+            TagActivityBucket.objects.filter(hours=1, start__lt=merge_before)
+            .select_for_update()
+            .values_list("pk", "tag_id", "start", "count"),
+        )
+        counts: Counter[tuple[int, datetime]] = Counter()
+        for _, tag_id, start, count in buckets:
+            day = get_bucket_start(start, hours=24)
+            if day >= expire_before:
+                counts[tag_id, day] += count
+        add_tag_activity(counts, hours=24)
+        pks = [pk for pk, *_ in buckets]
+        for offset in range(0, len(pks), DELETE_BATCH_SIZE):
+            batch = pks[offset : offset + DELETE_BATCH_SIZE]
+            TagActivityBucket.objects.filter(pk__in=batch).delete()
+        expired, _ = TagActivityBucket.objects.filter(
+            start__lt=expire_before,
+        ).delete()
+    return len(buckets), expired
+
+
+def rebuild_tag_activity() -> int:
+    """Recounts buckets from tags of questions created during the longest window.
+
+    Used after questions are imported in bulk, which sends no signals. Tags are
+    counted at creation time of questions.
+
+    :return: Number of counted taggings.
+    """
+    since = timezone.now() - get_retention()
+    taggings = list(
+        QuestionTag.objects.filter(question__date_created__gte=since).values_list(
+            "tag_id",
+            "question__date_created",
+        ),
+    )
+    with transaction.atomic():
+        TagActivityBucket.objects.all().delete()
+        record_tag_activity(taggings)
+    return len(taggings)
+
+
+def _on_question_tags_changed(
+    instance: Any,
+    action: str,
+    reverse: bool,
+    pk_set: set[int] | None,
+    **kwargs: Any,
+) -> None:
+    if action != "post_add" or not pk_set:
+        return
+    now = timezone.now()
+    tag_ids = [instance.pk] * len(pk_set) if reverse else pk_set
+    record_tag_activity((tag_id, now) for tag_id in tag_ids)
+
+
+def track_tag_activity() -> None:
+    """Counts tags added to questions in buckets of tag activity.
+
+    Buckets are updated in the transaction adding tags. Removed tags are not
+    subtracted, buckets count taggings. Must be called from `AppConfig.ready`.
+    """
+    signals.m2m_changed.connect(
+        _on_question_tags_changed,
+        sender=QuestionTag,
+        dispatch_uid="forum:tag_activity",
+    )
@@ -6,3 +6,10 @@ class NewsConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "news"
+
+    def ready(self) -> None:
+        """Tracks changes of articles to invalidate cached responses."""
+        from common.versions import track_model_versions
+        from news.models import Article
+
+        track_model_versions(Article)
@@ -0,0 +1,34 @@
+from typing import Iterator
+
+from common.ndjson import Record, fetch_related, iter_row_chunks
+from news.models import Article
+
+ArticleLike = Article.likes.through
+ArticleDislike = Article.dislikes.through
+
+
+def export_articles(chunk_size: int) -> Iterator[Record]:
+    """Yields records of all articles with ids of users who rated them.
+
+    Likes and dislikes are fetched with one query per chunk.
+
+    :param chunk_size: Number of rows fetched from database at once.
+    :yield: Article records.
+    """
+    rows = Article.objects.order_by("pk").values(
+        "id",
+        "title",
+        "content",
+        "date_created",
+    )
+    for chunk in iter_row_chunks(rows, chunk_size):
+        ids = [row["id"] for row in chunk]
+        likes = fetch_related(ArticleLike, "article", "user_id", ids)
+        dislikes = fetch_related(ArticleDislike, "article", "user_id", ids)
+        for row in chunk:
+            yield {
+                "type": "article",
+                **row,
+                "likes": likes.get(row["id"], []),
+                "dislikes": dislikes.get(row["id"], []),
+            }
@@ -0,0 +1,23 @@
+# Generated by Django 4.1 on 2026-10-19 12:00
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0002_alter_article_options"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="article",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True,
+                default=django.utils.timezone.now,
+            ),
+            preserve_default=False,
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.1.13 on 2026-10-19 14:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("news", "0003_article_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="article",
+            index=models.Index(
+                fields=["-date_created"], name="article_date_created_idx"
+            ),
+        ),
+    ]
@@ -7,10 +7,14 @@ class Article(models.Model):
 
     class Meta:
         ordering = ["-date_created"]
+        indexes = [
+            models.Index(fields=["-date_created"], name="article_date_created_idx"),
+        ]
 
     title = models.CharField(max_length=256)
     content = models.TextField()
     date_created = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
     likes = models.ManyToManyField(
         "authentication.User",
         blank=True,